@@ -1,23 +1,44 @@
+import asyncio
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from pathlib import Path
 from src.ast.ast_generator import process_repo_ast
+from src.utils.single_flight import SingleFlight
 from src.configs.config import REPO_DIR
 
 router = APIRouter()
 
+# 같은 레포를 같은 방식(full 여부)으로 인덱싱 중이면 그 작업의 결과를 함께 받는다. workers는 속도만 바꾸므로 키에 넣지 않는다.
+# 스레드에서 도는 인덱싱은 취소할 수 없으므로 요청이 모두 끊겨도 끝날 때까지 작업을 유지한다
+_flights = SingleFlight(cancel_abandoned=False)
+
+# 방식이 다른 요청(증분 중에 온 full 재생성 등)은 합치지 않고, 인덱스를 동시에 쓰지 않도록 레포별로 차례대로 실행한다
+_repo_locks: dict[str, asyncio.Lock] = {}
+
+async def _run_process_repo_ast(repo_path: Path, workers: int | None, full: bool) -> dict:
+    lock = _repo_locks.setdefault(repo_path.name, asyncio.Lock())
+    async with lock:
+        return await asyncio.to_thread(process_repo_ast, repo_path, workers=workers, full=full)
+
 class ASTRequest(BaseModel):
     repo_name: str
+    workers: int | None = None
+    full: bool = False
 
 @router.post("/generate-ast")
-def generate_ast(req: ASTRequest):
+async def generate_ast(req: ASTRequest):
     repo_path = REPO_DIR / req.repo_name
 
     if not repo_path.exists():
         raise HTTPException(status_code=404, detail="Repository not found.")
 
-    process_repo_ast(repo_path)
+    # 파일 수집/인덱스 쓰기는 스레드에서, 파싱은 그 안에서 프로세스 풀로 보낸다
+    stats = await _flights.run(
+        ("generate-ast", req.repo_name, req.full),
+        lambda: _run_process_repo_ast(repo_path, req.workers, req.full)
+    )
     return {
         "status": "success",
-        "message": f"ASTs generated for repository '{req.repo_name}'"
+        "message": f"ASTs generated for repository '{req.repo_name}'",
+        "stats": stats
     }
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from pathlib import Path
-from src.repo.cloner import clone_repo
+from src.repo.cloner import clone_repo_async
 from src.configs.config import REPO_DIR
 
 router = APIRouter()
@@ -11,8 +11,11 @@ class CloneRequest(BaseModel):
     branch: str | None = None
 
 @router.post("/clone")
-def clone_repository(req: CloneRequest):
-    repo_name = clone_repo(req.repo_url, REPO_DIR, req.branch)
+async def clone_repository(req: CloneRequest):
+    try:
+        repo_name = await clone_repo_async(req.repo_url, REPO_DIR, req.branch)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
     
     if repo_name is None:
         raise HTTPException(status_code=500, detail="Failed to clone repository.")
@@ -1,28 +1,51 @@
+import asyncio
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from pathlib import Path
-
-from src.ast.function_locator import get_function_and_context
-from src.ast.function_explainer import analyze_function
-from src.commit.commit_analyzer import get_commit_summary
-from src.risk_analysis.risk_score_calculator import generate_risk_report
+import json
+
+from src.ast.function_locator import get_function_and_context, get_function_structure
+from src.ast.function_explainer import analyze_function_async
+from src.commit.commit_analyzer import get_commit_summary_async, find_function_definition
+from src.risk_analysis.risk_score_calculator import generate_risk_report_async
+from src.overview.function_overview import prepare_function_overview, iter_function_overview, build_function_overview
+from src.overview.batch_analysis import iter_batch_results, explain_task, risk_task
+from src.repo.repo_state import get_repo_ref
+from src.utils.single_flight import SingleFlight
 from src.configs.config import REPO_DIR
 
 router = APIRouter()
 
+# 같은 요청(레포/ref/파일/함수)이 처리 중이면 다시 계산하지 않고 그 결과를 함께 받는다
+_flights = SingleFlight()
+
+def _flight_key(endpoint: str, repo_name: str, file_path: str | None, function_name: str) -> tuple:
+    file_path = (file_path or "").replace("\\", "/").strip("/")
+    return (endpoint, repo_name, get_repo_ref(REPO_DIR / repo_name), file_path, function_name)
+
 # ====== /function/explain ======
 class ExplainRequest(BaseModel):
+    repo_name: str
     function_name: str
+    file_path: str | None = None
 
 @router.post("/function/explain")
-def explain_function(req: ExplainRequest):
-    context = get_function_and_context(req.function_name)
-    if not context or context.get("target") is None:
-        raise HTTPException(status_code=404, detail="Function not found.")
+async def explain_function(req: ExplainRequest):
+    if not (REPO_DIR / req.repo_name).exists():
+        raise HTTPException(status_code=404, detail="Repository not found.")
+
+    async def explain() -> dict:
+        context = await asyncio.to_thread(get_function_and_context, req.function_name, req.repo_name, req.file_path)
+        if not context or context.get("target") is None:
+            raise HTTPException(status_code=404, detail="Function not found.")
+
+        result = await analyze_function_async(context)
+        if result is None:
+            raise HTTPException(status_code=500, detail="LLM 분석 실패")
+        return result
 
-    result = analyze_function(context)
-    if result is None:
-        raise HTTPException(status_code=500, detail="LLM 분석 실패")
+    result = await _flights.run(_flight_key("explain", req.repo_name, req.file_path, req.function_name), explain)
 
     return {
         "status": "success",
@@ -38,15 +61,20 @@ class CommitRequest(BaseModel):
     function_name: str
 
 @router.post("/function/commits")
-def get_function_commit_summary(req: CommitRequest):
+async def get_function_commit_summary(req: CommitRequest):
     repo_path = REPO_DIR / req.repo_name
     full_file_path = repo_path / req.file_path
 
     if not full_file_path.exists():
         raise HTTPException(status_code=404, detail="File not found.")
 
+    definition = await asyncio.to_thread(find_function_definition, full_file_path, req.function_name, repo_path)
+    if definition is None:
+        raise HTTPException(status_code=404, detail="Function not found.")
+
     try:
-        summary = get_commit_summary(full_file_path, req.function_name, repo_path)
+        # 같은 함수의 커밋 분석은 get_commit_summary_async 안에서 한 번만 수행된다
+        summary = await get_commit_summary_async(full_file_path, req.function_name, repo_path, definition)
         return {
             "status": "success",
             "summary": summary
@@ -62,15 +90,25 @@ class RiskRequest(BaseModel):
     function_name: str
 
 @router.post("/function/risk")
-def assess_function_risk(req: RiskRequest):
+async def assess_function_risk(req: RiskRequest):
     repo_path = REPO_DIR / req.repo_name
     full_file_path = repo_path / req.file_path
 
     if not full_file_path.exists():
         raise HTTPException(status_code=404, detail="File not found.")
 
+    # 요청한 파일의 정의만 사용한다 (다른 파일의 같은 이름 함수로 점수를 매기지 않도록)
+    structure = await asyncio.to_thread(
+        get_function_structure, req.function_name, req.repo_name, req.file_path
+    )
+    if structure is None:
+        raise HTTPException(status_code=404, detail="Function not found.")
+
     try:
-        report = generate_risk_report(full_file_path, req.function_name, repo_path)
+        report = await _flights.run(
+            _flight_key("risk", req.repo_name, req.file_path, req.function_name),
+            lambda: generate_risk_report_async(full_file_path, req.function_name, repo_path, structure=structure)
+        )
         return {
             "status": "success",
             "function": req.function_name,
@@ -78,3 +116,81 @@ def assess_function_risk(req: RiskRequest):
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Risk analysis failed: {e}")
+
+
+# ====== /function/overview ======
+class OverviewRequest(BaseModel):
+    repo_name: str
+    function_name: str
+    file_path: str | None = None
+    stream: bool = False
+
+@router.post("/function/overview")
+async def get_function_overview(req: OverviewRequest):
+    """
+    explain / commits / risk를 한 번에 반환합니다. 컨텍스트와 커밋 이력은 한 번만 계산하고,
+    두 LLM 설명은 동시에 요청합니다. stream=true면 섹션이 끝나는 대로 NDJSON 한 줄씩 보냅니다.
+    스트림은 요청마다 따로 보내지만, 커밋 분석은 같은 함수를 분석 중인 다른 요청과 공유합니다.
+    """
+    if not (REPO_DIR / req.repo_name).exists():
+        raise HTTPException(status_code=404, detail="Repository not found.")
+
+    prepared = await asyncio.to_thread(prepare_function_overview, req.repo_name, req.function_name, req.file_path)
+    if prepared is None:
+        raise HTTPException(status_code=404, detail="Function not found.")
+
+    if not req.stream:
+        overview = await _flights.run(
+            _flight_key("overview", req.repo_name, req.file_path, req.function_name),
+            lambda: build_function_overview(prepared)
+        )
+        return {
+            "status": "success",
+            **overview
+        }
+
+    async def stream_sections():
+        yield json.dumps({"section": "function", "data": {"function": prepared["function"], "file": prepared["file"]}}, ensure_ascii=False) + "\n"
+        async for section, result, error in iter_function_overview(prepared):
+            line = {"section": section, "data": result}
+            if error is not None:
+                line["error"] = error
+            yield json.dumps(line, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(stream_sections(), media_type="application/x-ndjson")
+
+
+# ====== /function/explain/batch, /function/risk/batch ======
+class BatchItem(BaseModel):
+    file_path: str
+    function_name: str | None = None    # 생략하면 파일의 모든 함수
+
+class BatchRequest(BaseModel):
+    repo_name: str
+    items: list[BatchItem] = Field(..., min_length=1)
+    concurrency: int | None = Field(None, ge=1, le=32)
+
+@router.post("/function/explain/batch")
+async def explain_functions_batch(req: BatchRequest):
+    """
+    여러 함수의 설명을 동시에 생성해 끝나는 순서대로 NDJSON으로 보냅니다.
+    """
+    return _stream_batch(req, explain_task, "analysis")
+
+@router.post("/function/risk/batch")
+async def assess_functions_risk_batch(req: BatchRequest):
+    """
+    여러 함수의 리스크 보고서를 생성해 끝나는 순서대로 NDJSON으로 보냅니다.
+    파일별 git 이력은 한 번만 읽어 함수 범위별로 나눠 씁니다.
+    """
+    return _stream_batch(req, risk_task, "risk_report")
+
+def _stream_batch(req: BatchRequest, task, result_key: str) -> StreamingResponse:
+    if not (REPO_DIR / req.repo_name).exists():
+        raise HTTPException(status_code=404, detail="Repository not found.")
+
+    items = [item.model_dump() for item in req.items]
+    return StreamingResponse(
+        iter_batch_results(req.repo_name, items, task, result_key, req.concurrency),
+        media_type="application/x-ndjson"
+    )
@@ -0,0 +1,12 @@
+import asyncio
+from fastapi import APIRouter
+from src.utils.llm_client import get_llm_stats
+
+router = APIRouter()
+
+@router.get("/llm/stats")
+async def llm_stats():
+    """
+    LLM 요청 수/오류/지연 시간(목적별)과 응답 캐시의 적중률, 크기, 제거 횟수를 반환합니다.
+    """
+    return await asyncio.to_thread(get_llm_stats)
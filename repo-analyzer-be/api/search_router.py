@@ -0,0 +1,50 @@
+import asyncio
+import re
+from fastapi import APIRouter, HTTPException, Query
+from src.configs.config import REPO_DIR
+from src.ast.symbol_search import search_symbols
+from src.ast.code_search import search_code, MAX_QUERY_LENGTH
+
+router = APIRouter()
+
+@router.get("/repo/symbols")
+async def search_repo_symbols(
+    repo_name: str = Query(..., description="클론된 레포 디렉토리 이름"),
+    q: str = Query(..., min_length=1, description="찾을 함수/클래스 이름 또는 qualname (일부, 오타 허용)"),
+    limit: int = Query(20, ge=1, le=200),
+    kind: list[str] | None = Query(None, description="정의 종류로 거르기 (function, method, async_function, async_method, class)")
+):
+    if not (REPO_DIR / repo_name).exists():
+        raise HTTPException(status_code=404, detail="Repository not found.")
+
+    try:
+        return await asyncio.to_thread(search_symbols, repo_name, q, limit, tuple(kind) if kind else None)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to search symbols: {e}")
+
+@router.get("/repo/search")
+async def search_repo_code(
+    repo_name: str = Query(..., description="클론된 레포 디렉토리 이름"),
+    q: str = Query(..., min_length=1, max_length=MAX_QUERY_LENGTH, description="찾을 문자열 또는 정규식"),
+    regex: bool = Query(False, description="q를 정규식으로 해석"),
+    ignore_case: bool = Query(False),
+    path: str = Query("", description="이 디렉토리(또는 파일) 아래의 파일만 검색 (경로 단위로 비교)"),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """
+    인덱싱된 Python 파일에서 문자열/정규식을 검색합니다.
+    검색 대상은 /generate-ast로 인덱싱된 파일뿐이므로 tests/ 같은 제외 디렉토리, __init__.py, setup.py와
+    아주 작은 파일은 결과에 나오지 않습니다.
+    검사 시간이 SEARCH_TIME_BUDGET을 넘으면 그때까지의 결과를 timed_out=true로 반환합니다.
+    """
+    if not (REPO_DIR / repo_name).exists():
+        raise HTTPException(status_code=404, detail="Repository not found.")
+
+    try:
+        return await asyncio.to_thread(search_code, repo_name, q, regex, ignore_case, path, limit)
+    except re.error as e:
+        raise HTTPException(status_code=400, detail=f"Invalid regular expression: {e}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to search code: {e}")
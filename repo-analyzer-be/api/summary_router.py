@@ -1,33 +1,44 @@
+import asyncio
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from pathlib import Path
-from src.summarizer.file_summarizer import summarize_files, load_summary
+from src.summarizer.file_summarizer import summarize_files_async, load_summary
+from src.utils.single_flight import SingleFlight
 from src.configs.config import REPO_DIR, SUMMARY_DIR
 
 router = APIRouter()
 
+# 같은 레포의 요약이 이미 진행 중이면 같은 파일을 다시 요약하지 않고 그 작업이 끝나기를 기다린다.
+# concurrency는 속도만 바꾸고 결과(요약 파일)는 같으므로 키에 넣지 않는다
+_flights = SingleFlight()
+
 class SummaryRequest(BaseModel):
     repo_name: str
+    concurrency: int | None = Field(None, ge=1, le=64)   # 동시에 요약할 파일 수 (기본: SUMMARY_CONCURRENCY)
 
 @router.post("/summarize")
-def summarize_repository(req: SummaryRequest):
+async def summarize_repository(req: SummaryRequest):
     repo_path = REPO_DIR / req.repo_name
     print(repo_path)
 
     if not repo_path.exists():
         raise HTTPException(status_code=404, detail="Repository not found.")
 
-    summarize_files(repo_path)
+    stats = await _flights.run(
+        ("summarize", req.repo_name),
+        lambda: summarize_files_async(repo_path, req.concurrency)
+    )
     return {
         "status": "success",
-        "message": f"Summary files generated for repository '{req.repo_name}'"
+        "message": f"Summary files generated for repository '{req.repo_name}'",
+        "stats": stats
     }
 
 
 @router.get("/file/summary")
-def get_file_summary(repo_name: str, file_path: str):
+async def get_file_summary(repo_name: str, file_path: str):
     try:
-        summary = load_summary(Path(file_path))
+        summary = await asyncio.to_thread(load_summary, repo_name, Path(file_path))
         return summary
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Summary file not found.")
@@ -1,38 +1,113 @@
-from fastapi import APIRouter, HTTPException, Query
+import asyncio
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 from pathlib import Path
-from src.configs.config import REPO_DIR, AST_DIR
-from src.ast.tree_maker import build_tree, extract_function_names_from_ast
+from typing import Literal
+from src.configs.config import REPO_DIR
+from src.ast.tree_maker import (
+    get_cached_tree, get_tree_etag, get_tree_index, make_tree_etag, render_tree, encode_compact_tree
+)
+from src.ast.symbol_index import get_file_definitions, FUNCTION_KINDS
+import json
 import os
 
 router = APIRouter()
 
 @router.get("/repo/tree")
-def get_repo_tree(repo_name: str = Query(..., description="클론된 레포 디렉토리 이름")):
+async def get_repo_tree(
+    request: Request,
+    repo_name: str = Query(..., description="클론된 레포 디렉토리 이름"),
+    path: str = Query("", description="펼칠 디렉토리의 레포 기준 상대 경로 (기본: 루트)"),
+    depth: int | None = Query(None, ge=0, description="펼칠 단계 수 (생략 시 끝까지)"),
+    offset: int = Query(0, ge=0, description="path 디렉토리 자식 목록의 시작 위치"),
+    limit: int | None = Query(None, ge=1, description="디렉토리마다 돌려줄 최대 자식 수"),
+    format: Literal["nested", "compact"] = Query("nested", description="compact: 부모 번호와 이름 테이블로 된 평탄한 배열")
+):
     repo_path = REPO_DIR / repo_name
     if not repo_path.exists():
         raise HTTPException(status_code=404, detail="Repository not found.")
 
-    tree = build_tree(repo_path)
-    return tree
+    compact = format == "compact"
+    if compact and (offset > 0 or limit is not None):
+        raise HTTPException(status_code=400, detail="Pagination is not supported for the compact format.")
+
+    # path/depth/페이지 파라미터가 없으면 캐시된 전체 트리를 그대로 보낸다
+    partial = bool(path) or depth is not None or offset > 0 or limit is not None
+    variant = f"{format}|{path}|{depth}|{offset}|{limit}" if partial else ("compact" if compact else "")
+
+    # 브라우저가 가진 트리가 최신이면 순회/직렬화 없이 304 반환
+    etag = await asyncio.to_thread(get_tree_etag, repo_path, variant)
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+    # 디렉토리 순회와 직렬화는 이벤트 루프를 막지 않도록 스레드에서 한다.
+    # 위의 ETag를 계산한 뒤 인덱스나 HEAD가 바뀌었을 수 있으므로 본문을 만든 인덱스의 ETag를 보낸다
+    if not partial:
+        etag, body = await asyncio.to_thread(get_cached_tree, repo_path, compact)
+    else:
+        etag, body = await asyncio.to_thread(
+            _render_partial_tree, repo_path, path, depth, offset, limit, compact, variant
+        )
+        if body is None:
+            raise HTTPException(status_code=404, detail="Directory not found in tree.")
+
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": "no-cache"}
+    )
+
+def _render_partial_tree(
+    repo_path: Path, path: str, depth: int | None, offset: int, limit: int | None, compact: bool, variant: str
+) -> tuple[str, bytes | None]:
+    """
+    부분 트리를 직렬화해 (ETag, 본문)을 반환합니다. ETag는 본문을 만든 인덱스의 캐시 키로 계산합니다.
+    """
+    key, index = get_tree_index(repo_path)
+    etag = make_tree_etag(key, variant)
+    if compact:
+        tree = encode_compact_tree(index, path, depth)
+    else:
+        tree = render_tree(index, path, depth, offset, limit)
+    if tree is None:
+        return etag, None
+    separators = (",", ":") if compact else None
+    return etag, json.dumps(tree, ensure_ascii=False, separators=separators).encode("utf-8")
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
 
 @router.get("/file/functions")
-def list_functions(
+async def list_functions(
     repo_name: str = Query(...),
     file_path: str = Query(...)
 ):
-    ast_filename = file_path.replace("/", "@@@").replace("\\", "@@@") + ".ast"
-    ast_file_path = AST_DIR / ast_filename
+    try:
+        definitions = await asyncio.to_thread(get_file_definitions, repo_name, file_path)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to read symbol index: {e}")
 
-    if not ast_file_path.exists():
+    if definitions is None:
         raise HTTPException(status_code=404, detail="AST not found for this file.")
 
-    try:
-        functions = extract_function_names_from_ast(ast_file_path)
-        return {
-            "file": file_path,
-            "functions": functions
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to parse AST: {e}")
-    
+    # 클래스 안의 정의는 바로 위 클래스를, 그 밖의 중첩 정의는 감싸는 함수를 parent로 가진다
+    kinds = {d["qualname"]: d["kind"] for d in definitions}
+    return {
+        "file": file_path,
+        "functions": [d["name"] for d in definitions if d["kind"] in FUNCTION_KINDS],
+        "definitions": [
+            {
+                "name": d["name"],
+                "qualname": d["qualname"],
+                "kind": d["kind"],
+                "lineno": d["lineno"],
+                "end_lineno": d["end_lineno"],
+                "parent": d["parent"],
+                "parent_class": d["parent"] if kinds.get(d["parent"]) == "class" else None
+            }
+            for d in definitions
+        ]
+    }
@@ -5,6 +5,8 @@ from api.ast_router import router as ast_router
 from api.summary_router import router as summary_router
 from api.function_analysis_router import router as function_router
 from api.tree_router import router as tree_router
+from api.search_router import router as search_router
+from api.llm_router import router as llm_router
 
 app = FastAPI(
     title="Repo Analyzer API",
@@ -26,10 +28,12 @@ app.include_router(ast_router)
 app.include_router(summary_router)
 app.include_router(function_router)
 app.include_router(tree_router)
+app.include_router(search_router)
+app.include_router(llm_router)
 
 # 루트 경로 확인용
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Repo Analyzer API is running"}
 
 
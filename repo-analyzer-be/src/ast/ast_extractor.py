@@ -0,0 +1,143 @@
+import ast
+
+# 순환 복잡도(cyclomatic complexity)에 분기 하나로 세는 노드
+BRANCH_NODES = (
+    ast.If, ast.IfExp, ast.For, ast.AsyncFor, ast.While,
+    ast.ExceptHandler, ast.Assert, ast.match_case, ast.comprehension
+)
+
+
+class FactsExtractor(ast.NodeVisitor):
+    """
+    파일 하나의 AST를 한 번만 순회하면서 분석에 필요한 정보를 모두 수집합니다.
+
+    - definitions: 클래스/함수/async 함수/메서드 정의 (qualname, 부모 정의, 범위, 지표, 호출 이름)
+    - imports: import한 모듈 이름
+
+    호출은 가장 안쪽의 함수 정의에만 귀속되므로, 중첩 함수의 호출이 바깥 함수에 중복 집계되지 않습니다.
+    클래스 본문의 호출은 바깥 함수에 귀속됩니다.
+    """
+
+    def __init__(self, source: bytes | None = None):
+        self.definitions = []
+        self.imports = set()
+        self._line_offsets = _line_offsets(source) if source is not None else None
+        self._scope = []        # 현재 위치를 감싸는 정의들 (바깥 → 안쪽)
+        self._function = None   # 호출/분기를 귀속시킬 가장 안쪽의 함수 정의
+
+    def extract(self, tree: ast.AST) -> dict:
+        self.visit(tree)
+        for entry in self.definitions:
+            entry["calls"] = sorted(entry["calls"])
+        return {
+            "definitions": self.definitions,
+            "imports": sorted(self.imports)
+        }
+
+    # === 정의 ===
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self._visit_definition(node, "class")
+
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        self._visit_definition(node, "function")
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
+        self._visit_definition(node, "async_function")
+
+    def _visit_definition(self, node: ast.AST, kind: str):
+        parent = self._scope[-1] if self._scope else None
+        if kind != "class" and parent and parent["kind"] == "class":
+            kind = "method" if kind == "function" else "async_method"
+
+        qualname = f"{parent['qualname']}.{node.name}" if parent else node.name
+        end_lineno = getattr(node, "end_lineno", None) or node.lineno
+        entry = {
+            "name": node.name,
+            "qualname": qualname,
+            "kind": kind,
+            "parent": parent["qualname"] if parent else None,
+            "lineno": node.lineno,
+            "end_lineno": end_lineno,
+            "start_byte": None,
+            "end_byte": None,
+            "line_count": end_lineno - node.lineno + 1,
+            "complexity": None if kind == "class" else 1,
+            "calls": set()
+        }
+        if self._line_offsets is not None:
+            entry["start_byte"] = self._line_offsets[node.lineno - 1]
+            entry["end_byte"] = self._line_offsets[min(end_lineno, len(self._line_offsets) - 1)]
+        self.definitions.append(entry)
+
+        outer_function = self._function
+        self._scope.append(entry)
+        if kind != "class":
+            self._function = entry
+        self.generic_visit(node)
+        self._function = outer_function
+        self._scope.pop()
+
+    # === 호출 / 분기 ===
+    def visit_Call(self, node: ast.Call):
+        if self._function is not None:
+            callee = _call_name(node)
+            if callee:
+                self._function["calls"].add(callee)
+        self.generic_visit(node)
+
+    def visit_BoolOp(self, node: ast.BoolOp):
+        # a and b and c → 분기 2개
+        self._add_complexity(len(node.values) - 1)
+        self.generic_visit(node)
+
+    def generic_visit(self, node: ast.AST):
+        if isinstance(node, BRANCH_NODES):
+            # 컴프리헨션은 반복 1 + if 조건 수
+            self._add_complexity(1 + len(node.ifs) if isinstance(node, ast.comprehension) else 1)
+        super().generic_visit(node)
+
+    def _add_complexity(self, amount: int):
+        if self._function is not None:
+            self._function["complexity"] += amount
+
+    # === import ===
+    def visit_Import(self, node: ast.Import):
+        self.imports.update(alias.name for alias in node.names)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        # 상대 import는 앞에 '.'을 붙인다
+        self.imports.add("." * node.level + (node.module or ""))
+
+
+def extract_file_facts(tree: ast.AST, source: bytes | None = None) -> dict:
+    """
+    AST에서 정의/호출/import/지표를 한 번의 순회로 추출합니다.
+    source가 주어지면 정의가 걸친 줄 전체의 바이트 범위(start_byte, end_byte)도 기록합니다.
+
+    Returns:
+        dict: {
+            "definitions": [{"name", "qualname", "kind", "parent", "lineno", "end_lineno",
+                             "start_byte", "end_byte", "line_count", "complexity", "calls"}],
+            "imports": [str]
+        }
+    """
+    return FactsExtractor(source).extract(tree)
+
+
+def _line_offsets(source: bytes) -> list[int]:
+    """
+    각 줄이 시작하는 바이트 위치. 마지막 원소는 파일 끝이다.
+    """
+    offsets = [0]
+    for line in source.splitlines(keepends=True):
+        offsets.append(offsets[-1] + len(line))
+    return offsets
+
+
+def _call_name(node: ast.Call) -> str | None:
+    if isinstance(node.func, ast.Name):
+        return node.func.id
+    if isinstance(node.func, ast.Attribute):
+        # 예: module.func() → func
+        return node.func.attr
+    return None
@@ -0,0 +1,81 @@
+import json
+from pathlib import Path
+
+from src.configs.config import AST_DIR, get_repo_data_dir
+
+# 추출 로직이나 저장 형식이 바뀌면 버전을 올린다. 버전이 다른 파일은 무시하고 다시 파싱한다.
+FACTS_VERSION = 3
+
+# definitions는 dict 대신 아래 필드 순서의 배열로 저장해 키 이름 반복을 줄인다.
+DEFINITION_FIELDS = (
+    "name", "qualname", "kind", "parent", "lineno", "end_lineno",
+    "start_byte", "end_byte", "line_count", "complexity", "calls"
+)
+
+
+def get_facts_path(repo_name: str, rel_path: str) -> Path:
+    # 파일 경로를 안전한 이름으로 변경
+    return get_repo_data_dir(AST_DIR, repo_name) / _facts_filename(rel_path)
+
+
+def _facts_filename(rel_path: str) -> str:
+    return rel_path.replace("/", "@@@").replace("\\", "@@@") + ".facts.json"
+
+
+def remove_stale_facts(repo_name: str, keep: set[str]) -> int:
+    """
+    레포의 facts 디렉토리에서 keep(상대 경로)에 없는 facts 파일을 지우고, AST_DIR 바로 아래에 남은
+    예전 레이아웃의 파일(레포 구분 없는 .ast 피클과 .facts.json)도 지웁니다. 지운 파일 수를 반환합니다.
+    manifest에 없던 파일(전체 재생성 전에 사라졌거나 제외된 파일)의 facts도 여기서 정리된다.
+    """
+    keep_names = {_facts_filename(rel_path) for rel_path in keep}
+    stale = [
+        path for path in get_repo_data_dir(AST_DIR, repo_name).iterdir()
+        if path.name.endswith(".facts.json") and path.name not in keep_names
+    ]
+    stale += [
+        path for path in AST_DIR.iterdir()
+        if path.is_file() and path.name.endswith((".ast", ".facts.json"))
+    ]
+    for path in stale:
+        path.unlink(missing_ok=True)
+    return len(stale)
+
+
+def build_facts(rel_path: str, sha: str, file_facts: dict) -> dict:
+    """
+    extract_file_facts 결과를 저장 형식으로 변환합니다.
+    """
+    return {
+        "version": FACTS_VERSION,
+        "file": rel_path,
+        "sha": sha,
+        "fields": list(DEFINITION_FIELDS),
+        "definitions": [[d[field] for field in DEFINITION_FIELDS] for d in file_facts["definitions"]],
+        "imports": file_facts["imports"]
+    }
+
+
+def save_facts(repo_name: str, facts: dict):
+    with open(get_facts_path(repo_name, facts["file"]), "w", encoding="utf-8") as f:
+        json.dump(facts, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def load_facts(repo_name: str, rel_path: str) -> dict | None:
+    """
+    저장된 facts를 읽어 definitions를 dict 목록으로 풀어서 반환합니다.
+    파일이 없거나 버전이 다르면 None을 반환합니다.
+    """
+    facts_path = get_facts_path(repo_name, rel_path)
+    try:
+        with open(facts_path, "r", encoding="utf-8") as f:
+            facts = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    if facts.get("version") != FACTS_VERSION:
+        return None
+
+    fields = facts["fields"]
+    facts["definitions"] = [dict(zip(fields, row)) for row in facts["definitions"]]
+    return facts
@@ -1,43 +1,175 @@
 import ast
-import os
-import pickle
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-from src.configs.config import REPO_DIR, AST_DIR
-from src.configs.filter_config import EXCLUDED_DIRS, EXCLUDED_FILES
-
-def should_process(filepath: Path) -> bool:
-    if not filepath.suffix == ".py":
-        return False
-    if filepath.name in EXCLUDED_FILES:
-        return False
-    if any(part in EXCLUDED_DIRS for part in filepath.parts):
-        return False
-    if filepath.stat().st_size < 30:
-        return False
-    return True
-
-def save_ast(filepath: Path, base_dir: Path):
+from src.configs.config import AST_WORKERS
+from src.configs.filter_config import EXCLUDED_DIRS, EXCLUDED_FILES, MIN_FILE_SIZE
+from src.repo.file_walker import iter_repo_files
+from src.ast.ast_extractor import extract_file_facts
+from src.ast.trigram_filter import build_trigram_filter
+from src.ast.symbol_index import (
+    compute_blob_sha,
+    get_manifest,
+    apply_index_changes,
+    clear_repo_index
+)
+from src.ast.ast_facts import (
+    remove_stale_facts,
+    build_facts,
+    save_facts,
+    load_facts
+)
+
+# 변경된 파일이 이보다 적으면 작업을 프로세스로 보내는 비용이 더 크므로 순차 처리
+PARALLEL_MIN_FILES = 32
+
+# AST_WORKERS 크기의 공유 파싱 프로세스 풀. 요청마다 새로 띄우지 않고 서버가 떠 있는 동안 재사용한다
+_parse_pool: ProcessPoolExecutor | None = None
+_parse_pool_lock = threading.Lock()
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """
+    CPU를 쓰는 파싱 작업을 보낼 공유 프로세스 풀을 반환합니다 (처음 호출할 때 만든다).
+    """
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(max_workers=AST_WORKERS)
+        return _parse_pool
+
+def save_ast_facts(filepath: Path, base_dir: Path, data: bytes, sha: str) -> list[dict]:
+    """
+    파일을 파싱해 분석에 필요한 정보(정의, 범위, 호출 이름, import)만 facts 파일로 저장하고,
+    인덱스에 넣을 정의 목록을 반환합니다. 파싱/저장 실패 시 예외를 그대로 전달합니다.
+    """
+    tree = ast.parse(data.decode("utf-8"))
+    file_facts = extract_file_facts(tree, data)
+
+    rel_path = filepath.relative_to(base_dir).as_posix()
+    save_facts(base_dir.name, build_facts(rel_path, sha, file_facts))
+    return file_facts["definitions"]
+
+def _process_file(filepath: Path, base_dir: Path, known_sha: str | None, reuse_facts: bool = True) -> tuple:
+    """
+    워커 프로세스에서 실행되는 단위 작업.
+    내용 해시가 manifest와 같으면 파싱을 건너뛰고, 같은 내용의 facts 파일이 남아 있으면
+    파싱 대신 그 정의 목록을 재사용합니다. 내용이 바뀐 파일은 코드 검색용 trigram 필터도 만듭니다.
+
+    Returns:
+        (상대 경로, sha, 정의 목록 또는 None, trigram 필터 또는 None, 오류 메시지 또는 None)
+    """
+    rel_path = filepath.relative_to(base_dir).as_posix()
     try:
-        code = filepath.read_text(encoding="utf-8")
-        tree = ast.parse(code)
+        data = filepath.read_bytes()
+        sha = compute_blob_sha(data)
+        if sha == known_sha:
+            return rel_path, sha, None, None, None
 
-        # 파일 경로를 안전한 이름으로 변경
-        rel_path = filepath.relative_to(base_dir)
-        ast_filename = str(rel_path).replace("/", "@@@").replace("\\", "@@@") + ".ast"
-        ast_path = AST_DIR / ast_filename
+        trigram_filter = build_trigram_filter(data)
+        if reuse_facts:
+            facts = load_facts(base_dir.name, rel_path)
+            if facts and facts["sha"] == sha:
+                return rel_path, sha, facts["definitions"], trigram_filter, None
 
-        with open(ast_path, "wb") as f:
-            pickle.dump(tree, f)
-        print(f"[+] Saved AST: {ast_path.name}")
+        return rel_path, sha, save_ast_facts(filepath, base_dir, data, sha), trigram_filter, None
     except Exception as e:
-        print(f"[!] Failed to parse {filepath}: {e}")
+        return rel_path, None, None, None, str(e)
+
+def process_repo_ast(repo_path: Path, workers: int | None = None, full: bool = False) -> dict:
+    """
+    레포의 Python 파일들을 파싱해 AST facts 파일과 심볼 인덱스(코드 검색용 trigram 필터 포함)를 생성합니다.
+    이전에 인덱싱한 파일은 manifest(내용 해시)와 비교해 바뀐 파일만 다시 파싱하고,
+    레포에서 사라진 파일은 AST와 인덱스에서 제거합니다.
+    workers가 2 이상이면 프로세스 풀에서 파일 단위로 병렬 처리합니다. 기본 워커 수(AST_WORKERS)면
+    공유 풀(get_parse_pool)을 쓰고, 다른 워커 수를 지정하면 이번 호출만을 위한 풀을 띄웁니다.
+    파일 목록 수집과 인덱스 쓰기는 블로킹 작업이므로 비동기 코드에서는 스레드에서 호출합니다.
+
+    Args:
+        full (bool): True면 manifest와 기존 facts 파일을 무시하고 전체를 다시 파싱
+
+    Returns:
+        dict: {"files", "indexed", "unchanged", "removed", "definitions", "failed": [{"file", "error"}], "elapsed"}
+    """
+    repo_name = repo_path.name
+    workers = AST_WORKERS if workers is None else workers
+    print(f"[*] Generating ASTs from repo: {repo_path} (workers={workers})")
+    started = time.perf_counter()
+
+    # 사라진 파일은 전체 재생성이어도 이전 manifest로 계산해야 하므로 인덱스를 지우기 전에 읽는다
+    old_manifest = get_manifest(repo_name)
+    if full:
+        clear_repo_index(repo_name)
+    manifest = {} if full else old_manifest
+
+    current = {
+        f.rel_path: (f.path, f.stat)
+        for f in iter_repo_files(
+            repo_path,
+            excluded_dirs=EXCLUDED_DIRS,
+            excluded_files=EXCLUDED_FILES,
+            min_size=MIN_FILE_SIZE
+        )
+    }
+
+    # stat 정보가 manifest와 같은 파일은 읽지 않고 건너뜀
+    candidates = []
+    for rel_path, (path, st) in current.items():
+        known = manifest.get(rel_path)
+        if known and known["mtime_ns"] == st.st_mtime_ns and known["size"] == st.st_size:
+            continue
+        candidates.append((path, known["sha"] if known else None))
+
+    if workers > 1 and len(candidates) >= PARALLEL_MIN_FILES:
+        paths = [path for path, _ in candidates]
+        chunksize = max(1, len(paths) // (workers * 4))
+        args = (paths, [repo_path] * len(paths), [sha for _, sha in candidates], [not full] * len(paths))
+        if workers == AST_WORKERS:
+            results = list(get_parse_pool().map(_process_file, *args, chunksize=chunksize))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_process_file, *args, chunksize=chunksize))
+    else:
+        results = [_process_file(path, repo_path, sha, not full) for path, sha in candidates]
+
+    updated = {}
+    failed = []
+    for rel_path, sha, definitions, trigram_filter, error in results:
+        if error is not None:
+            failed.append({"file": rel_path, "error": error})
+            continue
+        st = current[rel_path][1]
+        updated[rel_path] = {
+            "sha": sha,
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "definitions": definitions,
+            "trigram_filter": trigram_filter
+        }
+
+    # 사라진 파일과 파싱에 실패한 파일은 이전 정의가 남지 않도록 인덱스와 facts 파일에서 제거
+    failed_files = {item["file"] for item in failed}
+    removed = [rel_path for rel_path in old_manifest if rel_path not in current or rel_path in failed_files]
+    remove_stale_facts(repo_name, set(current) - failed_files)
 
-def process_repo_ast(repo_path: Path):
-    print(f"[*] Generating ASTs from repo: {repo_path}")
-    for root, _, files in os.walk(repo_path):
-        for file in files:
-            path = Path(root) / file
-            if should_process(path):
-                save_ast(path, repo_path)
+    apply_index_changes(repo_name, updated, removed)
 
+    reparsed = {rel_path: entry for rel_path, entry in updated.items() if entry["definitions"] is not None}
+    stats = {
+        "files": len(current),
+        "indexed": len(reparsed),
+        "unchanged": len(current) - len(reparsed) - len(failed),
+        "removed": len(removed),
+        "definitions": sum(len(entry["definitions"]) for entry in reparsed.values()),
+        "failed": failed,
+        "elapsed": round(time.perf_counter() - started, 3)
+    }
+    print(
+        f"[*] Indexed {stats['indexed']} changed files of {stats['files']} "
+        f"({stats['unchanged']} unchanged, {stats['removed']} removed, "
+        f"{len(failed)} failed) in {stats['elapsed']}s"
+    )
+    for item in failed:
+        print(f"[!] Failed to parse {item['file']}: {item['error']}")
+    return stats
@@ -0,0 +1,196 @@
+import re
+import threading
+import time
+from bisect import bisect_right
+
+from src.configs.config import REPO_DIR
+from src.ast.source_cache import read_source_bytes
+from src.ast.symbol_index import get_index_generation, get_manifest, get_trigram_filters, get_file_definitions
+from src.ast.trigram_filter import required_trigrams, query_mask
+
+# 결과 줄 텍스트의 최대 길이
+MAX_LINE_LENGTH = 300
+
+# 사용자 정규식은 시간 제한 없이 실행되므로 질의 길이를 제한하고, 후보 파일 검사에 쓸 시간(초)도 제한한다.
+# 시간을 넘기면 그때까지의 결과만 truncated/timed_out으로 반환한다 (파일 하나를 검사하는 도중에는 멈추지 못한다)
+MAX_QUERY_LENGTH = 1000
+SEARCH_TIME_BUDGET = 5.0
+
+
+class CodeSearchIndex:
+    """
+    레포 하나의 파일별 trigram 블룸 필터를 메모리에 들고 있는 구조.
+    필터는 process_repo_ast가 인덱싱하면서 저장하고, 여기서는 인덱스 세대가 바뀌면
+    sha가 바뀐 파일의 필터만 다시 읽습니다.
+    """
+
+    def __init__(self, repo_name: str):
+        self.repo_name = repo_name
+        self.generation = None
+        self.file_shas: dict[str, str] = {}
+        self.filters: dict[str, tuple[int, int]] = {}   # 상대 경로 → (비트 수, 필터 정수)
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        generation = get_index_generation(self.repo_name)
+        if generation == self.generation:
+            return
+        with self._lock:
+            if generation == self.generation:
+                return
+
+            manifest = get_manifest(self.repo_name)
+            changed = [f for f, info in manifest.items() if self.file_shas.get(f) != info["sha"]]
+            filters = get_trigram_filters(self.repo_name, None if not self.filters else changed)
+
+            self.filters = {f: v for f, v in self.filters.items() if f in manifest}
+            for f in changed:
+                self.filters.pop(f, None)
+            for f, (bits, bloom) in filters.items():
+                self.filters[f] = (bits, int.from_bytes(bloom, "little"))
+            self.file_shas = {f: info["sha"] for f, info in manifest.items()}
+            self.generation = generation
+
+    def candidates(self, trigrams: set[bytes], path_prefix: str = "") -> list[str]:
+        """
+        질의 trigram을 모두 포함할 수 있는 파일 목록 (블룸 필터이므로 오탐은 있어도 누락은 없음).
+        path_prefix는 경로 단위로 비교하므로 "src"는 src/ 아래만 고르고 srcfoo/는 고르지 않는다.
+        """
+        with self._lock:
+            filters = list(self.filters.items())
+
+        masks = {}
+        result = []
+        for file, (bits, bloom) in filters:
+            if path_prefix and not (file == path_prefix or file.startswith(path_prefix + "/")):
+                continue
+            if trigrams:
+                mask = masks.get(bits)
+                if mask is None:
+                    mask = masks[bits] = query_mask(trigrams, bits)
+                if bloom & mask != mask:
+                    continue
+            result.append(file)
+        return sorted(result)
+
+
+# 레포 이름 → 코드 검색 인덱스
+_search_indexes: dict[str, CodeSearchIndex] = {}
+_search_indexes_lock = threading.Lock()
+
+
+def search_code(
+    repo_name: str,
+    query: str,
+    regex: bool = False,
+    ignore_case: bool = False,
+    path_prefix: str = "",
+    limit: int = 100
+) -> dict:
+    """
+    인덱싱된 Python 파일에서 문자열/정규식을 검색합니다. 인덱서가 건너뛰는 파일
+    (filter_config의 EXCLUDED_DIRS/EXCLUDED_FILES — tests/, __init__.py 등 — 와 MIN_FILE_SIZE보다 작은 파일)은
+    검색 대상이 아닙니다.
+    trigram 필터로 후보 파일을 먼저 좁힌 뒤 후보만 읽어서 검사하고,
+    일치한 줄에는 그 줄을 감싸는 가장 안쪽 정의(함수/클래스)를 붙입니다.
+
+    Returns:
+        dict: {"query", "results": [{"file", "line", "text", "definition"}], "truncated", "timed_out",
+               "files": 인덱싱된 파일 수, "candidates": 후보 파일 수, "elapsed_ms"}
+
+    Raises:
+        re.error: 정규식이 올바르지 않은 경우
+        ValueError: 질의가 MAX_QUERY_LENGTH보다 긴 경우
+    """
+    if len(query) > MAX_QUERY_LENGTH:
+        raise ValueError(f"Query is too long (max {MAX_QUERY_LENGTH} characters).")
+    started = time.perf_counter()
+    pattern = re.compile(query if regex else re.escape(query), re.MULTILINE | (re.IGNORECASE if ignore_case else 0))
+
+    with _search_indexes_lock:
+        index = _search_indexes.get(repo_name)
+        if index is None:
+            index = _search_indexes[repo_name] = CodeSearchIndex(repo_name)
+    index.refresh()
+
+    candidates = index.candidates(required_trigrams(query, regex, ignore_case), path_prefix.strip("/"))
+    repo_path = REPO_DIR / repo_name
+
+    results = []
+    truncated = False
+    timed_out = False
+    deadline = started + SEARCH_TIME_BUDGET
+    for file in candidates:
+        if time.perf_counter() > deadline:
+            truncated = timed_out = True
+            break
+        try:
+            text = read_source_bytes(repo_path / file).decode("utf-8", errors="replace")
+        except OSError:
+            continue
+
+        file_results = _search_text(pattern, text, limit - len(results))
+        if not file_results:
+            continue
+        definitions = get_file_definitions(repo_name, file) or []
+        for line, line_text in file_results:
+            results.append({
+                "file": file,
+                "line": line,
+                "text": line_text[:MAX_LINE_LENGTH],
+                "definition": _enclosing_definition(definitions, line)
+            })
+        if len(results) >= limit:
+            truncated = True
+            break
+
+    return {
+        "query": query,
+        "results": results,
+        "truncated": truncated,
+        "timed_out": timed_out,
+        "files": len(index.filters),
+        "candidates": len(candidates),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+    }
+
+
+def _search_text(pattern: re.Pattern, text: str, limit: int) -> list[tuple[int, str]]:
+    """
+    파일 전체에 정규식을 한 번 돌리고, 일치한 줄만 (줄 번호, 줄 내용)으로 반환합니다. 한 줄은 한 번만 담는다.
+    """
+    matches = []
+    line_starts = None
+    last_line = 0
+    for match in pattern.finditer(text):
+        if line_starts is None:
+            # 일치가 있는 파일에서만 줄 시작 위치를 계산한다
+            line_starts = [0] + [m.end() for m in re.finditer("\n", text)]
+        line = bisect_right(line_starts, match.start())
+        if line == last_line:
+            continue
+        last_line = line
+        start = line_starts[line - 1]
+        end = line_starts[line] - 1 if line < len(line_starts) else len(text)
+        matches.append((line, text[start:end].rstrip("\r")))
+        if len(matches) >= limit:
+            break
+    return matches
+
+
+def _enclosing_definition(definitions: list[dict], line: int) -> dict | None:
+    # 줄을 감싸는 정의 중 가장 늦게 시작하는 것이 가장 안쪽 정의
+    enclosing = None
+    for d in definitions:
+        if d["lineno"] <= line <= (d["end_lineno"] or d["lineno"]):
+            if enclosing is None or d["lineno"] >= enclosing["lineno"]:
+                enclosing = d
+    if enclosing is None:
+        return None
+    return {
+        "name": enclosing["name"],
+        "qualname": enclosing["qualname"],
+        "kind": enclosing["kind"],
+        "lineno": enclosing["lineno"],
+        "end_lineno": enclosing["end_lineno"]
+    }
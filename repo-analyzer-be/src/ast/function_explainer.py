@@ -1,13 +1,5 @@
 import json
-import requests
-from openai import OpenAI
-from src.utils.secrets_loader import load_llm_config
-
-provider, LLM_API_KEY, LLM_API_URL, LLM_MODEL = load_llm_config()
-USE_OPENAI = provider.lower() == "openai"
-
-if USE_OPENAI:
-    client = OpenAI(api_key=LLM_API_KEY)
+from src.utils.llm_client import chat_completion, async_chat_completion
 
 SYSTEM_PROMPT = """
 당신은 Python 프로젝트 분석 전문가입니다. 함수와 관련된 코드 구조를 기반으로 함수의 역할을 정확히 파악하고, 관련 함수들을 추천할 수 있습니다.
@@ -44,44 +36,37 @@ USER_PROMPT_TEMPLATE = """
 ```
 """
 
+def build_explain_prompt(context: dict) -> str:
+    context_str = json.dumps(context, indent=2, ensure_ascii=False)
+    return USER_PROMPT_TEMPLATE.replace("{context_data}", context_str)
+
+def parse_explain_response(content: str) -> dict:
+    # 코드 블럭 감지 제거
+    if content.startswith("```json"):
+        content = content.lstrip("`json\n").rstrip("`").strip()
+    elif content.startswith("```"):
+        content = content.lstrip("`").strip()
+
+    return json.loads(content)
+
 def analyze_function(context: dict) -> dict | None:
     try:
-        context_str = json.dumps(context, indent=2, ensure_ascii=False)
-        prompt = USER_PROMPT_TEMPLATE.replace("{context_data}", context_str)
+        prompt = build_explain_prompt(context)
+
+        return chat_completion(SYSTEM_PROMPT, prompt, 0.3, "explain", parse_explain_response)
 
-        if USE_OPENAI:
-            response = client.chat.completions.create(
-                model=LLM_MODEL or "gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3
-            )
-            content = response.choices[0].message.content.strip()
-        else:
-            headers = {
-                "Authorization": f"Bearer {LLM_API_KEY}",
-                "Content-Type": "application/json"
-            }
-            payload = {
-                "messages": [
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.3
-            }
-            response = requests.post(LLM_API_URL, headers=headers, json=payload)
-            response.raise_for_status()
-            content = response.json()["choices"][0]["message"]["content"].strip()
-            
-        # 코드 블럭 감지 제거
-        if content.startswith("```json"):
-            content = content.lstrip("`json\n").rstrip("`").strip()
-        elif content.startswith("```"):
-            content = content.lstrip("`").strip()
-        
-        return json.loads(content)
+    except Exception as e:
+        print(f"[!] 분석 실패: {e}")
+        return None
+
+async def analyze_function_async(context: dict) -> dict | None:
+    """
+    analyze_function의 비동기 버전. LLM 응답을 기다리는 동안 이벤트 루프를 막지 않습니다.
+    """
+    try:
+        return await async_chat_completion(
+            SYSTEM_PROMPT, build_explain_prompt(context), 0.3, "explain", parse_explain_response
+        )
 
     except Exception as e:
         print(f"[!] 분석 실패: {e}")
@@ -1,16 +1,13 @@
-import os
-import pickle
-import ast
 from pathlib import Path
-from typing import Set
-import pickle
 
-from src.configs.config import AST_DIR, REPO_DIR
+from src.configs.config import REPO_DIR
+from src.ast.symbol_index import find_definitions, find_callee_definitions, find_callers, resolve_source_path
+from src.ast.source_cache import read_source_slice, read_source_lines
 
 
-def get_function_and_context(func_name: str) -> dict:
+def get_function_and_context(func_name: str, repo_name: str, file_path: str | None = None) -> dict:
     """
-    주어진 함수 이름에 대해:
+    레포 안에서 주어진 함수 이름에 대해:
     - 본인 코드 (target)
     - 본문 내부에서 호출한 함수들의 정의 (internal)
     - 본인을 호출하는 상위 함수들의 정의 (caller)
@@ -28,137 +25,128 @@ def get_function_and_context(func_name: str) -> dict:
         "internal": [ {function, file, code}, ... ],
         "caller":   [ {function, file, code}, ... ]
     }
+
+    file_path가 주어지면 그 파일의 정의를 우선 사용합니다.
     """
-    seen_internal = set()
-    internal_funcs = []
-    caller_funcs = []
+    structure = get_function_structure(func_name, repo_name, file_path)
+    if structure is None:
+        return {"target": None, "internal": [], "caller": []}
+    return build_function_context(structure)
+
+
+def build_function_context(structure: dict) -> dict:
+    """
+    get_function_structure 결과로 get_function_and_context와 같은 구조의 컨텍스트를 만듭니다.
+    구조를 이미 조회한 호출 측(리스크 계산과 함께 쓰는 경우 등)이 인덱스 조회를 반복하지 않도록 분리했습니다.
+    """
+    func_name = structure["definition"]["name"]
 
     # 1. 본인 코드 추출 (target)
-    target_defs = extract_function_code(func_name)
-    if not target_defs:
+    target_def = read_definition_code(structure["definition"])
+    if target_def is None:
         return {"target": None, "internal": [], "caller": []}
 
-    target_def = target_defs[0]  # 복수일 수 있으나, 가장 먼저 찾은 정의만 사용
-    target_code = target_def["code"]
-
     # 2. 내부 호출 함수들 추출
-    called_func_names = get_called_functions(target_code)
-    for name in called_func_names:
-        if name == func_name or name in seen_internal:
-            continue
-        sub_defs = extract_function_code(name)
-        if sub_defs:  # 정의가 실제로 존재할 때만 추가
-            for sub_item in sub_defs:
-                internal_funcs.append(sub_item)
-            seen_internal.add(name)
-    called_count = len(seen_internal)
+    internal_funcs = []
+    for loc in structure["internal"]:
+        sub_item = read_definition_code(loc)
+        if sub_item:
+            internal_funcs.append(sub_item)
 
     # 3. 상위 호출자 함수들 추출
-    calling_locs = get_calling_functions(func_name)
-    called_by_count = len(calling_locs)
-
-    for loc in calling_locs:
-        source_path = find_file_by_relative_path(REPO_DIR, loc["file"])
-        if not source_path:
-            continue
-        try:
-            with open(source_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-            start = loc["lineno"] - 1
-            end = loc["end_lineno"] if loc["end_lineno"] else start + 1
-            code = "".join(lines[start:end])
-
-            caller_funcs.append({
-                "function": f"(caller of {func_name})",
-                "file": loc["file"],
-                "code": code.strip()
-            })
-        except Exception:
+    caller_funcs = []
+    for loc in structure["called_by"]:
+        code = _read_definition_source(loc)
+        if code is None:
             continue
+        caller_funcs.append({
+            "function": f"(caller of {func_name})",
+            "file": loc["file"],
+            "code": code
+        })
 
     return {
         "target": {
             **target_def,
-            "called_count": called_count,
-            "called_by_count": called_by_count
+            "called_count": len(structure["called"]),
+            "called_by_count": len(structure["called_by"])
         },
         "internal": internal_funcs,
         "caller": caller_funcs
     }
 
 
-def get_calling_functions(func_name: str) -> list[dict]:
+def get_function_structure(func_name: str, repo_name: str, file_path: str | None = None) -> dict | None:
     """
-    레포 전체 AST를 통해 특정 함수가 호출되는 상위 함수들을 찾아 반환합니다.
-
-    Args:
-        func_name (str): 추적할 대상 함수 이름
+    소스 파일을 읽지 않고 심볼 인덱스만으로 함수의 호출 구조를 조회합니다.
+    file_path(레포 기준 상대 경로)가 주어지면 그 파일의 정의만 찾고, 없으면 가장 먼저 찾은 정의를 사용합니다.
+    다른 파일의 같은 이름 함수로 대신하지 않으므로, 그 파일에 정의가 없으면 None입니다.
 
     Returns:
-        List[dict]: {"file": str, "lineno": int, "end_lineno": int}
+        dict | None: {
+            "definition": 대상 함수의 정의 위치,
+            "called": 내부에서 호출하는 (정의가 존재하는) 함수 이름 목록,
+            "internal": 호출하는 함수들의 정의 위치 목록,
+            "called_by": 대상 함수를 호출하는 함수들의 정의 위치 목록
+        }
     """
-    results = []
+    definitions = find_definitions(func_name, repo_name)
+    if not definitions:
+        return None
 
-    for ast_file in AST_DIR.glob("*.ast"):
-        try:
-            with open(ast_file, "rb") as f:
-                tree = pickle.load(f)
-
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    for inner in ast.walk(node):
-                        if isinstance(inner, ast.Call):
-                            # 함수 호출 이름이 func_name과 일치하면
-                            if (
-                                isinstance(inner.func, ast.Name) and inner.func.id == func_name
-                            ) or (
-                                isinstance(inner.func, ast.Attribute) and inner.func.attr == func_name
-                            ):
-                                location = {
-                                    "file": _restore_source_path(ast_file),
-                                    "lineno": node.lineno,
-                                    "end_lineno": getattr(node, "end_lineno", None)
-                                }
-                                #print(f"[✓] 호출 위치 발견: {location}")
-                                results.append(location)
-                                break
-
-        except Exception as e:
-            print(f"[!] Error analyzing {ast_file.name}: {e}")
-    return results
+    if file_path is not None:
+        file_path = file_path.replace("\\", "/")
+        definitions = [d for d in definitions if d["file"] == file_path.strip("/")]
+        if not definitions:
+            return None
+    return get_definition_structure(definitions[0])
+
+
+def get_definition_structure(definition: dict) -> dict:
+    """
+    인덱스의 정의 하나(find_definitions / get_file_definitions의 행)에 대한 호출 구조를 조회합니다.
+    반환 형식은 get_function_structure와 같습니다.
+    """
+    internal = [
+        d for d in find_callee_definitions(definition["repo"], definition["file"], definition["qualname"])
+        if d["name"] != definition["name"]
+    ]
+    return {
+        "definition": definition,
+        "called": sorted({d["name"] for d in internal}),
+        "internal": internal,
+        "called_by": find_callers(definition["name"], definition["repo"])
+    }
 
 
-def get_called_functions(func_code: str) -> Set[str]:
+def get_calling_functions(func_name: str, repo_name: str) -> list[dict]:
     """
-    함수 코드 내부에서 호출된 함수 이름들을 반환합니다.
+    심볼 인덱스의 호출 관계(reverse adjacency)로 특정 함수를 호출하는 상위 함수들을 찾아 반환합니다.
 
     Args:
-        func_code (str): 함수 정의 코드 문자열
+        func_name (str): 추적할 대상 함수 이름
+        repo_name (str): 레포 이름
 
     Returns:
-        Set[str]: 호출된 함수 이름들의 집합
+        List[dict]: {"file": str, "lineno": int, "end_lineno": int}
     """
-    called = set()
-    try:
-        tree = ast.parse(func_code)
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name):
-                    called.add(node.func.id)
-                elif isinstance(node.func, ast.Attribute):
-                    # 예: module.func() → func
-                    called.add(node.func.attr)
-    except Exception as e:
-        print(f"[!] Failed to parse function code: {e}")
-    return called
+    return [
+        {
+            "file": c["file"],
+            "lineno": c["lineno"],
+            "end_lineno": c["end_lineno"]
+        }
+        for c in find_callers(func_name, repo_name)
+    ]
 
 
-def extract_function_code(func_name: str) -> list[dict]:
+def extract_function_code(func_name: str, repo_name: str) -> list[dict]:
     """
     저장된 AST와 REPO 디렉토리를 기반으로 함수 정의 전체 코드를 추출합니다.
 
     Args:
         func_name (str): 추출할 함수 이름
+        repo_name (str): 레포 이름
 
     Returns:
         List[dict]: [
@@ -169,95 +157,87 @@ def extract_function_code(func_name: str) -> list[dict]:
             }
         ]
     """
-    locations = find_function_location(func_name)
     results = []
+    for loc in find_definitions(func_name, repo_name):
+        item = read_definition_code(loc)
+        if item:
+            results.append(item)
+    return results
 
-    for loc in locations:
-        source_path = find_file_by_relative_path(REPO_DIR, loc["file"])
-        if not source_path:
-            print(f"[!] 파일 경로를 찾을 수 없습니다: {loc['file']}")
-            continue
 
-        try:
-            with open(source_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
+def read_definition_code(loc: dict) -> dict | None:
+    """
+    인덱스의 정의 위치 하나에 해당하는 코드를 {"function", "file", "code"} 형태로 반환합니다.
+    """
+    source_path = find_file_by_relative_path(REPO_DIR, loc["file"], loc["repo"])
+    if not source_path:
+        print(f"[!] 파일 경로를 찾을 수 없습니다: {loc['file']}")
+        return None
 
-            start = loc["lineno"] - 1
-            end = loc["end_lineno"] if loc["end_lineno"] else start + 1
-            code_block = "".join(lines[start:end])
+    code_block = _read_definition_source(loc, source_path)
+    if code_block is None:
+        return None
 
-            results.append({
-                "function": func_name,
-                "file": str(source_path.relative_to(REPO_DIR)).replace("\\", "/"),
-                "code": code_block.strip()
-            })
+    return {
+        "function": loc["name"],
+        "file": str(source_path.relative_to(REPO_DIR)).replace("\\", "/"),
+        "code": code_block
+    }
 
-        except Exception as e:
-            print(f"[!] Error extracting {func_name} from {source_path}: {e}")
 
-    return results
+def _read_definition_source(loc: dict, source_path: Path | None = None) -> str | None:
+    if source_path is None:
+        source_path = find_file_by_relative_path(REPO_DIR, loc["file"], loc["repo"])
+        if not source_path:
+            return None
 
+    try:
+        if loc.get("start_byte") is not None and loc.get("end_byte") is not None:
+            code = read_source_slice(source_path, loc["start_byte"], loc["end_byte"])
+        else:
+            code = read_source_lines(source_path, loc["lineno"], loc["end_lineno"])
+        return code.strip()
 
-def find_file_by_relative_path(base_dir: Path, relative_path: str) -> Path | None:
+    except Exception as e:
+        print(f"[!] Error extracting lines {loc['lineno']}-{loc['end_lineno']} from {source_path}: {e}")
+        return None
+
+
+def find_file_by_relative_path(base_dir: Path, relative_path: str, repo_name: str) -> Path | None:
     """
-    base_dir 아래를 순회하면서 relative_path와 끝이 일치하는 파일을 찾는다.
+    인덱싱 시 만든 경로 맵(path_suffixes)에서 레포 안의 relative_path와 끝이 일치하는 파일을 찾는다.
     예: relative_path = "src/utils/helpers.py"
 
     Returns:
         전체 경로 Path 또는 None
     """
-    relative_path = relative_path.replace("\\", "/")  # 윈도우 호환
+    file = resolve_source_path(relative_path, repo_name)
+    if not file:
+        return None
 
-    for root, _, files in os.walk(base_dir):
-        for file in files:
-            full_path = Path(root) / file
-            try:
-                rel = full_path.relative_to(base_dir).as_posix()
-                if rel.endswith(relative_path):
-                    return full_path
-            except Exception:
-                continue
-    return None
+    full_path = base_dir / repo_name / file
+    return full_path if full_path.exists() else None
 
 
-def find_function_location(func_name: str) -> list[dict]:
+def find_function_location(func_name: str, repo_name: str) -> list[dict]:
     """
-    저장된 .ast 파일들에서 주어진 함수 이름을 정의한 위치를 반환합니다.
+    심볼 인덱스에서 레포 안의 주어진 함수 이름을 정의한 위치를 반환합니다.
 
     Args:
         func_name (str): 찾을 함수 이름
+        repo_name (str): 레포 이름
 
     Returns:
         List[dict]: [{"file": str, "lineno": int, "end_lineno": int}]
     """
-    results = []
-
-    for ast_file in AST_DIR.glob("*.ast"):
-        try:
-            with open(ast_file, "rb") as f:
-                tree = pickle.load(f)
-
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef) and node.name == func_name:
-                    result = {
-                        "file": _restore_source_path(ast_file),
-                        "lineno": node.lineno,
-                        "end_lineno": getattr(node, "end_lineno", None)
-                    }
-                    results.append(result)
-
-        except Exception as e:
-            print(f"[!] Error reading AST file {ast_file.name}: {e}")
-
-    return results
-
-
-def _restore_source_path(ast_file: Path) -> str:
-    """
-    src__utils__helpers.py.ast → src/utils/helpers.py
-    """
-    name = ast_file.stem  # remove .ast
-    return name.replace("@@@", "/")
+    return [
+        {
+            "file": d["file"],
+            "lineno": d["lineno"],
+            "end_lineno": d["end_lineno"]
+        }
+        for d in find_definitions(func_name, repo_name)
+    ]
 
 
 # if __name__ == "__main__":
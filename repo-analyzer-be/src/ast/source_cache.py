@@ -0,0 +1,55 @@
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+# 메모리에 들고 있을 소스 파일 버퍼의 최대 크기 (바이트)
+SOURCE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+_buffers: OrderedDict[Path, tuple[int, int, bytes]] = OrderedDict()
+_cached_bytes = 0
+_lock = threading.Lock()
+
+
+def read_source_bytes(path: Path) -> bytes:
+    """
+    소스 파일 내용을 LRU 버퍼에서 반환합니다.
+    파일의 mtime/size가 바뀌었으면 다시 읽습니다.
+    """
+    global _cached_bytes
+
+    st = path.stat()
+    with _lock:
+        cached = _buffers.get(path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            _buffers.move_to_end(path)
+            return cached[2]
+
+    data = path.read_bytes()
+
+    with _lock:
+        old = _buffers.pop(path, None)
+        if old:
+            _cached_bytes -= len(old[2])
+        _buffers[path] = (st.st_mtime_ns, st.st_size, data)
+        _cached_bytes += len(data)
+        while _cached_bytes > SOURCE_CACHE_MAX_BYTES and len(_buffers) > 1:
+            _, (_, _, evicted) = _buffers.popitem(last=False)
+            _cached_bytes -= len(evicted)
+    return data
+
+
+def read_source_slice(path: Path, start_byte: int, end_byte: int) -> str:
+    """
+    인덱싱 시 기록한 바이트 범위로 소스 일부(함수 본문 등)를 잘라 반환합니다.
+    """
+    return read_source_bytes(path)[start_byte:end_byte].decode("utf-8", errors="replace")
+
+
+def read_source_lines(path: Path, lineno: int, end_lineno: int | None) -> str:
+    """
+    바이트 범위가 없는 경우를 위한 줄 번호 기반 추출 (1부터 시작, end_lineno 포함).
+    """
+    lines = read_source_bytes(path).splitlines(keepends=True)
+    start = lineno - 1
+    end = end_lineno if end_lineno else start + 1
+    return b"".join(lines[start:end]).decode("utf-8", errors="replace")
@@ -0,0 +1,460 @@
+import hashlib
+import sqlite3
+from pathlib import Path
+
+from src.configs.config import INDEX_DB_PATH
+
+# 스키마가 바뀌면 버전을 올린다. 인덱스는 AST에서 다시 만들 수 있는 파생 데이터이므로
+# 버전이 다르면 테이블을 지우고 새로 만든다.
+SCHEMA_VERSION = 9
+
+SCHEMA = """
+-- 레포별 인덱스 세대. 인덱스 내용이 바뀔 때마다 1씩 올라가며, 트리/검색 캐시의 무효화 키로 쓴다.
+CREATE TABLE IF NOT EXISTS repos (
+    repo TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL
+);
+
+-- 인덱싱된 파일 목록 (manifest). sha는 git blob id와 같은 방식으로 계산한 내용 해시이고,
+-- mtime_ns/size가 그대로면 파일을 다시 읽지 않는다.
+CREATE TABLE IF NOT EXISTS files (
+    repo TEXT NOT NULL,
+    file TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (repo, file)
+);
+
+CREATE TABLE IF NOT EXISTS definitions (
+    repo TEXT NOT NULL,
+    file TEXT NOT NULL,
+    name TEXT NOT NULL,
+    qualname TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    parent TEXT,
+    lineno INTEGER NOT NULL,
+    end_lineno INTEGER,
+    start_byte INTEGER,
+    end_byte INTEGER,
+    line_count INTEGER,
+    complexity INTEGER
+);
+
+-- caller → callee 호출 관계. 호출은 가장 안쪽의 함수 정의에 귀속된다.
+CREATE TABLE IF NOT EXISTS calls (
+    repo TEXT NOT NULL,
+    file TEXT NOT NULL,
+    caller_qualname TEXT NOT NULL,
+    caller_lineno INTEGER NOT NULL,
+    caller_end_lineno INTEGER,
+    caller_start_byte INTEGER,
+    caller_end_byte INTEGER,
+    callee TEXT NOT NULL
+);
+
+-- 경로 접미사 → 실제 파일 매핑. "src/utils/helpers.py"라면 "src/utils/helpers.py", "utils/helpers.py",
+-- "helpers.py"와 레포 이름을 붙인 "repo/src/utils/helpers.py"가 모두 키로 들어간다.
+CREATE TABLE IF NOT EXISTS path_suffixes (
+    repo TEXT NOT NULL,
+    file TEXT NOT NULL,
+    suffix TEXT NOT NULL
+);
+
+-- 코드 검색용 파일별 trigram 블룸 필터 (src/ast/trigram_filter.py). bits는 필터 크기(비트)
+CREATE TABLE IF NOT EXISTS trigram_filters (
+    repo TEXT NOT NULL,
+    file TEXT NOT NULL,
+    bits INTEGER NOT NULL,
+    bloom BLOB NOT NULL,
+    PRIMARY KEY (repo, file)
+);
+
+CREATE INDEX IF NOT EXISTS idx_definitions_name ON definitions (repo, name);
+CREATE INDEX IF NOT EXISTS idx_definitions_file ON definitions (repo, file);
+CREATE INDEX IF NOT EXISTS idx_calls_callee ON calls (repo, callee);
+CREATE INDEX IF NOT EXISTS idx_calls_caller ON calls (repo, file, caller_qualname);
+CREATE INDEX IF NOT EXISTS idx_path_suffixes_suffix ON path_suffixes (repo, suffix);
+CREATE INDEX IF NOT EXISTS idx_path_suffixes_file ON path_suffixes (repo, file);
+"""
+
+FUNCTION_KINDS = ("function", "method", "async_function", "async_method")
+
+DEFINITION_COLUMNS = (
+    "repo", "file", "name", "qualname", "kind", "parent",
+    "lineno", "end_lineno", "start_byte", "end_byte", "line_count", "complexity"
+)
+
+_schema_ready = False
+
+
+def get_connection(db_path: Path = INDEX_DB_PATH) -> sqlite3.Connection:
+    """
+    심볼 인덱스 DB 연결을 반환합니다. 최초 연결 시 스키마를 준비합니다.
+    """
+    global _schema_ready
+
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    if not _schema_ready:
+        _ensure_schema(conn)
+        _schema_ready = True
+    return conn
+
+
+def _ensure_schema(conn: sqlite3.Connection):
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version != SCHEMA_VERSION:
+        tables = [row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        )]
+        for table in tables:
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.executescript(SCHEMA)
+    conn.commit()
+
+
+def compute_blob_sha(data: bytes) -> str:
+    """
+    git hash-object와 같은 방식으로 blob id를 계산합니다.
+    """
+    header = f"blob {len(data)}\0".encode()
+    return hashlib.sha1(header + data).hexdigest()
+
+
+def get_manifest(repo_name: str) -> dict[str, dict]:
+    """
+    레포의 인덱싱된 파일 목록을 반환합니다.
+
+    Returns:
+        dict: {상대 경로: {"sha", "mtime_ns", "size"}}
+    """
+    conn = get_connection()
+    try:
+        rows = conn.execute(
+            "SELECT file, sha, mtime_ns, size FROM files WHERE repo = ?", (repo_name,)
+        ).fetchall()
+    finally:
+        conn.close()
+    return {
+        row["file"]: {"sha": row["sha"], "mtime_ns": row["mtime_ns"], "size": row["size"]}
+        for row in rows
+    }
+
+
+def apply_index_changes(repo_name: str, updated: dict[str, dict], removed: list[str]):
+    """
+    변경된 파일만 인덱스에 반영합니다. 파일 단위로 정의와 호출 관계를 지우고 다시 넣습니다.
+
+    Args:
+        repo_name (str): 레포 이름 (REPO_DIR 아래 디렉토리 이름)
+        updated (dict): {상대 경로: {"sha", "mtime_ns", "size", "definitions", "trigram_filter"}}
+            definitions가 None이면 내용이 같으므로 manifest의 stat 정보만 갱신합니다.
+            trigram_filter는 (비트 수, 필터 바이트)이며 None이면 기존 필터를 유지합니다.
+        removed (list): 인덱스에서 제거할 상대 경로 목록
+    """
+    changed = [file for file, entry in updated.items() if entry["definitions"] is not None]
+
+    conn = get_connection()
+    try:
+        with conn:
+            existing = {
+                row["file"] for row in conn.execute("SELECT file FROM files WHERE repo = ?", (repo_name,))
+            }
+            added = [file for file in updated if file not in existing]
+
+            for file in [*removed, *changed]:
+                conn.execute("DELETE FROM definitions WHERE repo = ? AND file = ?", (repo_name, file))
+                conn.execute("DELETE FROM calls WHERE repo = ? AND file = ?", (repo_name, file))
+            for file in removed:
+                conn.execute("DELETE FROM path_suffixes WHERE repo = ? AND file = ?", (repo_name, file))
+                conn.execute("DELETE FROM trigram_filters WHERE repo = ? AND file = ?", (repo_name, file))
+            conn.executemany(
+                "DELETE FROM files WHERE repo = ? AND file = ?",
+                [(repo_name, file) for file in removed]
+            )
+            conn.executemany(
+                "INSERT INTO path_suffixes (repo, file, suffix) VALUES (?, ?, ?)",
+                [
+                    (repo_name, file, suffix)
+                    for file in added
+                    for suffix in _path_suffixes(repo_name, file)
+                ]
+            )
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO files (repo, file, sha, mtime_ns, size)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [
+                    (repo_name, file, entry["sha"], entry["mtime_ns"], entry["size"])
+                    for file, entry in updated.items()
+                ]
+            )
+            conn.executemany(
+                f"""
+                INSERT INTO definitions ({", ".join(DEFINITION_COLUMNS)})
+                VALUES ({", ".join("?" for _ in DEFINITION_COLUMNS)})
+                """,
+                [
+                    (repo_name, file, *(d[column] for column in DEFINITION_COLUMNS[2:]))
+                    for file in changed
+                    for d in updated[file]["definitions"]
+                ]
+            )
+            conn.executemany(
+                """
+                INSERT INTO calls (
+                    repo, file, caller_qualname, caller_lineno, caller_end_lineno,
+                    caller_start_byte, caller_end_byte, callee
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        repo_name, file, d["qualname"], d["lineno"], d["end_lineno"],
+                        d["start_byte"], d["end_byte"], callee
+                    )
+                    for file in changed
+                    for d in updated[file]["definitions"]
+                    for callee in d["calls"]
+                ]
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO trigram_filters (repo, file, bits, bloom) VALUES (?, ?, ?, ?)",
+                [
+                    (repo_name, file, *entry["trigram_filter"])
+                    for file, entry in updated.items()
+                    if entry.get("trigram_filter") is not None
+                ]
+            )
+            if changed or removed:
+                _bump_generation(conn, repo_name)
+    finally:
+        conn.close()
+
+
+def clear_repo_index(repo_name: str):
+    """
+    레포의 인덱스를 모두 삭제합니다.
+    """
+    conn = get_connection()
+    try:
+        with conn:
+            for table in ("files", "definitions", "calls", "path_suffixes", "trigram_filters"):
+                conn.execute(f"DELETE FROM {table} WHERE repo = ?", (repo_name,))
+            _bump_generation(conn, repo_name)
+    finally:
+        conn.close()
+
+
+def _bump_generation(conn: sqlite3.Connection, repo_name: str):
+    conn.execute(
+        """
+        INSERT INTO repos (repo, generation) VALUES (?, 1)
+        ON CONFLICT (repo) DO UPDATE SET generation = generation + 1
+        """,
+        (repo_name,)
+    )
+
+
+def get_index_generation(repo_name: str) -> int:
+    """
+    레포 인덱스의 세대 번호. 한 번도 인덱싱하지 않았으면 0.
+    """
+    conn = get_connection()
+    try:
+        row = conn.execute("SELECT generation FROM repos WHERE repo = ?", (repo_name,)).fetchone()
+    finally:
+        conn.close()
+    return row["generation"] if row else 0
+
+
+def _path_suffixes(repo_name: str, file_path: str) -> list[str]:
+    parts = file_path.split("/")
+    return [f"{repo_name}/{file_path}"] + ["/".join(parts[i:]) for i in range(len(parts))]
+
+
+def resolve_source_path(relative_path: str, repo_name: str) -> str | None:
+    """
+    경로 접미사로 레포 안의 인덱싱된 파일을 찾아 레포 기준 상대 경로를 반환합니다.
+    레포 기준 경로와 REPO_DIR 기준 경로("repo/...") 모두 받을 수 있습니다.
+
+    여러 파일이 일치하면 경로가 가장 짧은 파일, 그다음 사전순으로 고릅니다.
+    """
+    suffix = relative_path.replace("\\", "/").strip("/")
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            """
+            SELECT file FROM path_suffixes
+            WHERE repo = ? AND suffix = ?
+            ORDER BY length(file), file
+            LIMIT 1
+            """,
+            (repo_name, suffix)
+        ).fetchone()
+    finally:
+        conn.close()
+    return row["file"] if row else None
+
+
+def find_definitions(name: str, repo_name: str, kinds: tuple[str, ...] = FUNCTION_KINDS) -> list[dict]:
+    """
+    레포 안에서 이름으로 정의 위치를 조회합니다.
+
+    Returns:
+        List[dict]: DEFINITION_COLUMNS를 키로 하는 dict 목록
+    """
+    placeholders = ", ".join("?" for _ in kinds)
+    conn = get_connection()
+    try:
+        rows = conn.execute(
+            f"""
+            SELECT {", ".join(DEFINITION_COLUMNS)}
+            FROM definitions
+            WHERE repo = ? AND name = ? AND kind IN ({placeholders})
+            ORDER BY file, lineno
+            """,
+            (repo_name, name, *kinds)
+        ).fetchall()
+    finally:
+        conn.close()
+    return [dict(row) for row in rows]
+
+
+def get_file_definitions(repo_name: str, file_path: str) -> list[dict] | None:
+    """
+    파일 하나에 포함된 정의 목록을 줄 번호 순으로 조회합니다. 인덱싱되지 않은 파일이면 None을 반환합니다.
+    files와 LEFT JOIN하므로 정의가 없는 파일(빈 목록)과 인덱싱되지 않은 파일을 한 번의 조회로 구분합니다.
+    """
+    file_path = file_path.replace("\\", "/")
+    columns = ", ".join(f"d.{column}" for column in DEFINITION_COLUMNS)
+    conn = get_connection()
+    try:
+        rows = conn.execute(
+            f"""
+            SELECT {columns}
+            FROM files f
+            LEFT JOIN definitions d ON d.repo = f.repo AND d.file = f.file
+            WHERE f.repo = ? AND f.file = ?
+            ORDER BY d.lineno
+            """,
+            (repo_name, file_path)
+        ).fetchall()
+    finally:
+        conn.close()
+    if not rows:
+        return None
+    return [dict(row) for row in rows if row["name"] is not None]
+
+
+def get_repo_definitions(repo_name: str, files: list[str] | None = None) -> list[dict]:
+    """
+    레포 전체(또는 files에 속한 파일들)의 정의 목록을 검색용 컬럼만으로 조회합니다.
+    """
+    columns = "file, name, qualname, kind, parent, lineno, end_lineno"
+    conn = get_connection()
+    try:
+        if files is None:
+            rows = conn.execute(
+                f"SELECT {columns} FROM definitions WHERE repo = ?", (repo_name,)
+            ).fetchall()
+        else:
+            rows = []
+            # SQLite 바인딩 변수 개수 제한을 넘지 않도록 나눠서 조회
+            for i in range(0, len(files), 500):
+                chunk = files[i:i + 500]
+                rows.extend(conn.execute(
+                    f"""
+                    SELECT {columns} FROM definitions
+                    WHERE repo = ? AND file IN ({", ".join("?" * len(chunk))})
+                    """,
+                    (repo_name, *chunk)
+                ).fetchall())
+    finally:
+        conn.close()
+    return [dict(row) for row in rows]
+
+
+def get_trigram_filters(repo_name: str, files: list[str] | None = None) -> dict[str, tuple[int, bytes]]:
+    """
+    레포 전체(또는 files에 속한 파일들)의 trigram 블룸 필터를 조회합니다.
+
+    Returns:
+        dict: {상대 경로: (비트 수, 필터 바이트)}
+    """
+    conn = get_connection()
+    try:
+        if files is None:
+            rows = conn.execute(
+                "SELECT file, bits, bloom FROM trigram_filters WHERE repo = ?", (repo_name,)
+            ).fetchall()
+        else:
+            rows = []
+            # SQLite 바인딩 변수 개수 제한을 넘지 않도록 나눠서 조회
+            for i in range(0, len(files), 500):
+                chunk = files[i:i + 500]
+                rows.extend(conn.execute(
+                    f"""
+                    SELECT file, bits, bloom FROM trigram_filters
+                    WHERE repo = ? AND file IN ({", ".join("?" * len(chunk))})
+                    """,
+                    (repo_name, *chunk)
+                ).fetchall())
+    finally:
+        conn.close()
+    return {row["file"]: (row["bits"], row["bloom"]) for row in rows}
+
+
+def find_callee_definitions(repo_name: str, file_path: str, qualname: str) -> list[dict]:
+    """
+    정의 하나가 호출하는 함수들의 정의 위치 (forward adjacency).
+    호출 이름과 정의 이름을 인덱스에서 바로 조인하므로 한 번의 조회로 끝납니다.
+
+    Returns:
+        List[dict]: DEFINITION_COLUMNS를 키로 하는 dict 목록
+    """
+    placeholders = ", ".join("?" for _ in FUNCTION_KINDS)
+    conn = get_connection()
+    try:
+        rows = conn.execute(
+            f"""
+            SELECT DISTINCT {", ".join("d." + column for column in DEFINITION_COLUMNS)}
+            FROM calls c
+            JOIN definitions d ON d.repo = c.repo AND d.name = c.callee
+            WHERE c.repo = ? AND c.file = ? AND c.caller_qualname = ?
+              AND d.kind IN ({placeholders})
+            ORDER BY d.name, d.repo, d.file, d.lineno
+            """,
+            (repo_name, file_path, qualname, *FUNCTION_KINDS)
+        ).fetchall()
+    finally:
+        conn.close()
+    return [dict(row) for row in rows]
+
+
+def find_callers(name: str, repo_name: str) -> list[dict]:
+    """
+    레포 안에서 주어진 이름을 호출하는 함수 정의 목록 (reverse adjacency).
+
+    Returns:
+        List[dict]: [{"repo", "file", "qualname", "lineno", "end_lineno", "start_byte", "end_byte"}]
+    """
+    conn = get_connection()
+    try:
+        rows = conn.execute(
+            """
+            SELECT DISTINCT repo, file, caller_qualname AS qualname,
+                   caller_lineno AS lineno, caller_end_lineno AS end_lineno,
+                   caller_start_byte AS start_byte, caller_end_byte AS end_byte
+            FROM calls
+            WHERE repo = ? AND callee = ?
+            ORDER BY file, lineno
+            """,
+            (repo_name, name)
+        ).fetchall()
+    finally:
+        conn.close()
+    return [dict(row) for row in rows]
@@ -0,0 +1,243 @@
+import heapq
+import math
+import threading
+import time
+from bisect import bisect_left, insort
+from itertools import islice
+
+from src.ast.symbol_index import get_index_generation, get_manifest, get_repo_definitions
+
+# 접두사 검색에서 훑어볼 최대 키 수 (짧은 질의가 너무 많은 항목에 걸리는 것을 막음)
+PREFIX_SCAN_LIMIT = 2000
+# 이 비율보다 많은 항목이 바뀌면 정렬된 키 목록을 통째로 다시 만든다
+REBUILD_RATIO = 0.2
+# 퍼지 매칭으로 인정할 최소 trigram 유사도 (Jaccard)
+FUZZY_THRESHOLD = 0.3
+# 퍼지 매칭에서 유사도를 직접 계산할 최대 후보 수 (흔한 trigram만 공유하는 질의의 비용 상한)
+FUZZY_CANDIDATE_LIMIT = 5000
+
+
+def _trigrams(text: str) -> set[str]:
+    # 앞뒤 경계 문자를 붙여 짧은 이름이나 접두사도 trigram을 갖도록 한다
+    padded = f"^{text}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SymbolSearchIndex:
+    """
+    레포 하나의 정의 이름/qualname에 대한 메모리 검색 구조.
+
+    - prefix_keys: (소문자 키, 항목 번호)의 정렬된 목록. 이름과 qualname을 모두 담아 bisect로 접두사 검색
+    - trigrams: 이름 trigram → 항목 번호 집합. 부분 문자열/오타 검색의 후보를 좁힌다
+
+    심볼 인덱스의 세대 번호가 바뀌면 파일별 sha를 비교해 바뀐 파일의 정의만 다시 읽습니다.
+    """
+
+    def __init__(self, repo_name: str):
+        self.repo_name = repo_name
+        self.generation = None
+        self.file_shas: dict[str, str] = {}
+        self.file_entries: dict[str, list[int]] = {}
+        self.entries: dict[int, dict] = {}
+        self.prefix_keys: list[tuple[str, int]] = []
+        self.trigrams: dict[str, set[int]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        generation = get_index_generation(self.repo_name)
+        if generation == self.generation:
+            return
+        with self._lock:
+            if generation == self.generation:
+                return
+
+            manifest = get_manifest(self.repo_name)
+            removed = [f for f in self.file_shas if f not in manifest]
+            changed = [f for f, info in manifest.items() if self.file_shas.get(f) != info["sha"]]
+
+            old_ids = [i for f in removed + changed for i in self.file_entries.get(f, [])]
+            rebuild = (len(old_ids) + len(changed)) > REBUILD_RATIO * max(len(self.entries), 1)
+
+            for entry_id in old_ids:
+                self._remove_entry(entry_id, update_keys=not rebuild)
+            for f in removed:
+                self.file_shas.pop(f, None)
+                self.file_entries.pop(f, None)
+
+            definitions = get_repo_definitions(self.repo_name, None if rebuild and not self.entries else changed)
+            for f in changed:
+                self.file_shas[f] = manifest[f]["sha"]
+                self.file_entries[f] = []
+            for definition in definitions:
+                self._add_entry(definition, update_keys=not rebuild)
+
+            if rebuild:
+                self.prefix_keys = sorted(
+                    key for entry_id, entry in self.entries.items() for key in self._entry_keys(entry_id, entry)
+                )
+
+            self.generation = generation
+            print(
+                f"[*] Symbol search index for {self.repo_name}: {len(self.entries)} definitions "
+                f"({len(changed)} changed, {len(removed)} removed files{', rebuilt' if rebuild else ''})"
+            )
+
+    @staticmethod
+    def _entry_keys(entry_id: int, entry: dict) -> list[tuple[str, int]]:
+        keys = [(entry["name_lower"], entry_id)]
+        if entry["qualname_lower"] != entry["name_lower"]:
+            keys.append((entry["qualname_lower"], entry_id))
+        return keys
+
+    def _add_entry(self, definition: dict, update_keys: bool):
+        entry_id = self._next_id
+        self._next_id += 1
+
+        entry = dict(definition)
+        entry["name_lower"] = definition["name"].lower()
+        entry["qualname_lower"] = definition["qualname"].lower()
+        entry["trigrams"] = _trigrams(entry["name_lower"])
+        self.entries[entry_id] = entry
+        self.file_entries.setdefault(definition["file"], []).append(entry_id)
+
+        for trigram in entry["trigrams"]:
+            self.trigrams.setdefault(trigram, set()).add(entry_id)
+        if update_keys:
+            for key in self._entry_keys(entry_id, entry):
+                insort(self.prefix_keys, key)
+
+    def _remove_entry(self, entry_id: int, update_keys: bool):
+        entry = self.entries.pop(entry_id)
+        for trigram in entry["trigrams"]:
+            ids = self.trigrams.get(trigram)
+            if ids is not None:
+                ids.discard(entry_id)
+                if not ids:
+                    del self.trigrams[trigram]
+        if update_keys:
+            for key in self._entry_keys(entry_id, entry):
+                pos = bisect_left(self.prefix_keys, key)
+                if pos < len(self.prefix_keys) and self.prefix_keys[pos] == key:
+                    del self.prefix_keys[pos]
+
+    def _match_trigrams(self, q: str, consider, scores: dict):
+        """
+        부분 문자열 / 퍼지 매칭. trigram 집합 연산으로 후보를 좁힌 뒤에만 항목을 확인합니다.
+        """
+        query_trigrams = _trigrams(q)
+        sets = sorted((self.trigrams.get(t, set()) for t in query_trigrams), key=len)
+
+        # 부분 문자열: 경계 문자가 없는 trigram을 모두 가진 항목만 후보 (작은 집합부터 교집합)
+        inner = sorted((self.trigrams.get(q[i:i + 3], set()) for i in range(len(q) - 2)), key=len)
+        if inner and inner[0]:
+            candidates = set(inner[0])
+            for ids in inner[1:]:
+                candidates &= ids
+                if not candidates:
+                    break
+            for entry_id in candidates:
+                if entry_id not in scores and q in self.entries[entry_id]["name_lower"]:
+                    consider(entry_id, 60, "substring")
+
+        # 퍼지: 유사도가 FUZZY_THRESHOLD 이상이면 query trigram 중 최소 required개를 공유하므로,
+        # 가장 드문 (n - required + 1)개 집합 중 하나에는 반드시 들어 있다
+        required = max(1, math.ceil(FUZZY_THRESHOLD * len(query_trigrams)))
+        candidates = set()
+        for ids in sets[:len(sets) - required + 1]:
+            if len(candidates) + len(ids) > FUZZY_CANDIDATE_LIMIT:
+                candidates.update(islice(ids, FUZZY_CANDIDATE_LIMIT - len(candidates)))
+                break
+            candidates |= ids
+        for entry_id in candidates:
+            if entry_id in scores:
+                continue
+            entry = self.entries[entry_id]
+            shared = len(query_trigrams & entry["trigrams"])
+            similarity = shared / (len(query_trigrams) + len(entry["trigrams"]) - shared)
+            if similarity >= FUZZY_THRESHOLD:
+                consider(entry_id, round(50 * similarity, 2), "fuzzy")
+
+    def search(self, query: str, limit: int = 20, kinds: tuple[str, ...] | None = None) -> list[dict]:
+        """
+        이름/qualname으로 정의를 찾아 점수순으로 반환합니다.
+
+        점수: 이름 일치 100, qualname 일치 95, 이름 접두사 80, qualname 접두사 70,
+              이름 부분 문자열 60, trigram 유사도 기반 퍼지 매칭 최대 50
+        """
+        q = query.strip().lower()
+        if not q:
+            return []
+        with self._lock:
+            return self._search(q, limit, kinds)
+
+    def _search(self, q: str, limit: int, kinds: tuple[str, ...] | None) -> list[dict]:
+        scores: dict[int, tuple[float, str]] = {}
+
+        def consider(entry_id: int, score: float, match: str):
+            if entry_id not in scores or scores[entry_id][0] < score:
+                scores[entry_id] = (score, match)
+
+        # 1) 접두사: 정렬된 키에서 q로 시작하는 구간만 훑는다
+        pos = bisect_left(self.prefix_keys, (q,))
+        for key, entry_id in self.prefix_keys[pos:pos + PREFIX_SCAN_LIMIT]:
+            if not key.startswith(q):
+                break
+            entry = self.entries[entry_id]
+            if key == entry["name_lower"]:
+                consider(entry_id, 100 if key == q else 80, "exact" if key == q else "prefix")
+            else:
+                consider(entry_id, 95 if key == q else 70, "exact" if key == q else "prefix")
+
+        # 접두사 결과만으로 limit을 채우면 더 낮은 점수의 단계는 볼 필요가 없다
+        if sum(1 for entry_id in scores if kinds is None or self.entries[entry_id]["kind"] in kinds) < limit:
+            self._match_trigrams(q, consider, scores)
+
+        ranked = heapq.nsmallest(
+            limit,
+            (
+                (score, match, self.entries[entry_id])
+                for entry_id, (score, match) in scores.items()
+                if kinds is None or self.entries[entry_id]["kind"] in kinds
+            ),
+            key=lambda item: (-item[0], len(item[2]["name"]), item[2]["qualname"], item[2]["file"], item[2]["lineno"])
+        )
+        return [
+            {
+                "name": entry["name"],
+                "qualname": entry["qualname"],
+                "kind": entry["kind"],
+                "parent": entry["parent"],
+                "file": entry["file"],
+                "lineno": entry["lineno"],
+                "end_lineno": entry["end_lineno"],
+                "score": score,
+                "match": match
+            }
+            for score, match, entry in ranked
+        ]
+
+
+# 레포 이름 → 검색 인덱스
+_search_indexes: dict[str, SymbolSearchIndex] = {}
+_search_indexes_lock = threading.Lock()
+
+
+def search_symbols(repo_name: str, query: str, limit: int = 20, kinds: tuple[str, ...] | None = None) -> dict:
+    """
+    레포 전체에서 함수/클래스 정의를 이름으로 검색합니다.
+    검색 구조는 레포별로 메모리에 유지되며, 재인덱싱 후 첫 검색에서 바뀐 파일만 반영됩니다.
+    """
+    with _search_indexes_lock:
+        index = _search_indexes.get(repo_name)
+        if index is None:
+            index = _search_indexes[repo_name] = SymbolSearchIndex(repo_name)
+
+    start = time.perf_counter()
+    index.refresh()
+    results = index.search(query, limit, kinds)
+    return {
+        "query": query,
+        "results": results,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+    }
@@ -1,34 +1,238 @@
-import ast
-import pickle
+import hashlib
+import json
+import threading
 from pathlib import Path
+from typing import NamedTuple
 
-def build_tree(dir_path: Path, root_path: Path = None) -> dict:
-    if root_path is None:
-        root_path = dir_path  # 초기 진입점에서 root_path를 설정
+from src.repo.file_walker import iter_repo_files
+from src.repo.repo_state import get_repo_ref, get_head_commit
+from src.ast.symbol_index import get_index_generation
 
-    tree = {
-        "name": dir_path.name,
+# 트리에서 숨길 디렉토리 ("."으로 시작하는 항목은 별도로 모두 숨김)
+TREE_EXCLUDED_DIRS = {"__pycache__"}
+
+class TreeIndex(NamedTuple):
+    name: str                           # 레포(루트 디렉토리) 이름
+    directories: dict[str, dict]        # 디렉토리 경로("" = 루트) → {"children": [(이름, 디렉토리 여부)], "file_count": 하위 .py 파일 수}
+
+def build_tree_index(dir_path: Path) -> TreeIndex:
+    """
+    레포를 한 번 순회해 디렉토리별 자식 목록과 하위 .py 파일 수를 만듭니다.
+    파일 나열은 인덱서/요약기와 같은 iter_repo_files를 사용하므로 .gitignore에 걸린
+    디렉토리는 내려가지 않고, .py 파일이 없는 디렉토리는 나타나지 않습니다.
+    """
+    directories = {"": {"children": [], "file_count": 0}}
+
+    # iter_repo_files는 이름순 깊이 우선으로 나열하므로 children도 이름순으로 쌓인다
+    for repo_file in iter_repo_files(dir_path, excluded_dirs=TREE_EXCLUDED_DIRS, skip_hidden=True):
+        parts = repo_file.rel_path.split("/")
+        parent = directories[""]
+        parent["file_count"] += 1
+        for i in range(len(parts) - 1):
+            dir_key = "/".join(parts[:i + 1])
+            entry = directories.get(dir_key)
+            if entry is None:
+                entry = {"children": [], "file_count": 0}
+                parent["children"].append((parts[i], True))
+                directories[dir_key] = entry
+            entry["file_count"] += 1
+            parent = entry
+
+        parent["children"].append((parts[-1], False))
+
+    return TreeIndex(dir_path.name, directories)
+
+def render_tree(
+    index: TreeIndex,
+    path: str = "",
+    depth: int | None = None,
+    offset: int = 0,
+    limit: int | None = None
+) -> dict | None:
+    """
+    트리 인덱스에서 path 디렉토리 아래를 중첩 dict로 만듭니다. path가 인덱스에 없으면 None.
+
+    Args:
+        depth: 펼칠 단계 수 (None이면 끝까지, 0이면 path 디렉토리 자신만).
+               더 펼치지 않은 디렉토리에는 children 대신 "has_children"과 "file_count"만 담긴다.
+        offset, limit: path 디렉토리의 자식 페이지. limit은 함께 펼쳐지는 하위 디렉토리에도
+                       적용되며, 잘린 디렉토리에는 "total_children"과 "next_offset"이 붙는다.
+    """
+    path = path.replace("\\", "/").strip("/")
+    if path not in index.directories:
+        return None
+    name = path.rsplit("/", 1)[-1] if path else index.name
+    return _render_directory(index, path, name, depth, offset, limit)
+
+def _render_directory(index: TreeIndex, path: str, name: str, depth, offset: int, limit) -> dict:
+    entry = index.directories[path]
+    node = {
+        "name": name,
         "type": "directory",
-        "children": []
+        "path": path,
+        "file_count": entry["file_count"]
     }
+    children = entry["children"]
+    if depth is not None and depth <= 0:
+        node["has_children"] = bool(children)
+        return node
+
+    end = len(children) if limit is None else min(offset + limit, len(children))
+    child_depth = None if depth is None else depth - 1
+    node["children"] = []
+    for child_name, is_dir in children[offset:end]:
+        child_path = f"{path}/{child_name}" if path else child_name
+        if is_dir:
+            node["children"].append(_render_directory(index, child_path, child_name, child_depth, 0, limit))
+        else:
+            node["children"].append({
+                "name": child_name,
+                "type": "file",
+                "path": child_path  # 전체 상대 경로
+            })
+
+    if offset or end < len(children):
+        node["total_children"] = len(children)
+        if end < len(children):
+            node["next_offset"] = end
+    return node
+
+def encode_compact_tree(index: TreeIndex, path: str = "", depth: int | None = None) -> dict | None:
+    """
+    path 디렉토리 아래를 노드별 dict 없이 평탄한 배열로 인코딩합니다. path가 인덱스에 없으면 None.
+
+    노드 i는 parent[i](상위 노드 번호, path 디렉토리 바로 아래면 -1), names[name_id[i]](이름),
+    is_dir[i]로 표현됩니다. 상위 노드가 항상 먼저 나오므로 클라이언트는 앞에서부터
+    path[i] = path[parent[i]] + "/" + names[name_id[i]] 로 전체 경로를 복원할 수 있습니다.
+    이름은 names에 한 번씩만 담깁니다 (__init__.py 등 반복되는 이름 공유).
+    file_counts[i]는 디렉토리 노드의 하위 .py 파일 수(파일 노드는 0), has_children[i]는 디렉토리에
+    자식이 있는지로 render_tree의 file_count/has_children과 같습니다. depth 때문에 펼치지 않은 디렉토리는
+    has_children[i]가 1이어도 parent가 i인 노드가 없습니다.
+    """
+    path = path.replace("\\", "/").strip("/")
+    directories = index.directories
+    if path not in directories:
+        return None
 
-    for entry in sorted(dir_path.iterdir()):
-        if entry.name.startswith(".") or entry.name in {"__pycache__"}:
+    names = []
+    name_ids = {}
+    parent = []
+    name_id = []
+    is_dir = []
+    file_counts = []
+    has_children = []
+
+    # (디렉토리 경로, 노드 번호, 남은 단계) 스택으로 디렉토리 단위 깊이 우선 순회 (형제 노드는 연속으로 나온다)
+    stack = [(path, -1, depth)]
+    while stack:
+        dir_key, node_id, remaining = stack.pop()
+        if remaining is not None and remaining <= 0:
             continue
+        child_depth = None if remaining is None else remaining - 1
+        subdirs = []
+        for child_name, child_is_dir in directories[dir_key]["children"]:
+            nid = name_ids.get(child_name)
+            if nid is None:
+                nid = name_ids[child_name] = len(names)
+                names.append(child_name)
+            if child_is_dir:
+                child_key = f"{dir_key}/{child_name}" if dir_key else child_name
+                subdirs.append((child_key, len(parent), child_depth))
+                child = directories[child_key]
+                file_counts.append(child["file_count"])
+                has_children.append(1 if child["children"] else 0)
+            else:
+                file_counts.append(0)
+                has_children.append(0)
+            parent.append(node_id)
+            name_id.append(nid)
+            is_dir.append(1 if child_is_dir else 0)
+        # 이름순으로 꺼내도록 역순으로 쌓는다
+        stack.extend(reversed(subdirs))
 
-        if entry.is_dir():
-            subtree = build_tree(entry, root_path)
-            if subtree:
-                tree["children"].append(subtree)
+    return {
+        "format": "compact",
+        "name": path.rsplit("/", 1)[-1] if path else index.name,
+        "path": path,
+        "file_count": directories[path]["file_count"],
+        "names": names,
+        "parent": parent,
+        "name_id": name_id,
+        "is_dir": is_dir,
+        "file_counts": file_counts,
+        "has_children": has_children
+    }
 
-        elif entry.suffix == ".py":
-            tree["children"].append({
-                "name": entry.name,
-                "type": "file",
-                "path": str(entry.relative_to(root_path))  # 전체 상대 경로
-            })
+def build_tree(dir_path: Path) -> dict:
+    """
+    레포의 .py 파일을 디렉토리 구조의 중첩 dict로 반환합니다.
+    """
+    return render_tree(build_tree_index(dir_path))
+
+# 레포 이름 → (캐시 키, 트리 인덱스, 형식별 직렬화된 전체 트리)
+_tree_cache: dict[str, tuple[str, TreeIndex, dict[str, bytes]]] = {}
+_tree_cache_lock = threading.Lock()
+
+def get_tree_cache_key(repo_path: Path) -> str:
+    """
+    트리 캐시 키. 체크아웃된 ref/HEAD 커밋이 바뀌거나 레포를 다시 인덱싱하면 달라집니다.
+    파일 시스템을 순회하지 않으므로 매 요청마다 계산해도 가볍습니다.
+    """
+    return "|".join([
+        repo_path.name,
+        get_repo_ref(repo_path),
+        get_head_commit(repo_path) or "",
+        str(get_index_generation(repo_path.name))
+    ])
+
+def get_tree_etag(repo_path: Path, variant: str = "") -> str:
+    """
+    variant에는 같은 트리의 다른 표현(부분 트리 요청의 파라미터 등)을 넣는다.
+    """
+    return make_tree_etag(get_tree_cache_key(repo_path), variant)
 
-    return tree
+def make_tree_etag(key: str, variant: str = "") -> str:
+    # key는 get_tree_cache_key 값. 본문을 만든 인덱스의 키로 계산해야 ETag와 본문이 어긋나지 않는다
+    return '"' + hashlib.sha1(f"{key}|{variant}".encode()).hexdigest() + '"'
+
+def get_tree_index(repo_path: Path) -> tuple[str, TreeIndex]:
+    """
+    캐시된 트리 인덱스와 그 캐시 키를 반환합니다. 키가 바뀐 경우에만 다시 순회합니다.
+    """
+    key = get_tree_cache_key(repo_path)
+    with _tree_cache_lock:
+        cached = _tree_cache.get(repo_path.name)
+    if cached and cached[0] == key:
+        return key, cached[1]
+
+    index = build_tree_index(repo_path)
+    with _tree_cache_lock:
+        _tree_cache[repo_path.name] = (key, index, {})
+    return key, index
+
+def get_cached_tree(repo_path: Path, compact: bool = False) -> tuple[str, bytes]:
+    """
+    전체 트리를 JSON으로 직렬화해 캐시하고 (ETag, 본문)을 반환합니다.
+    compact=True면 encode_compact_tree 형식으로 직렬화합니다.
+    """
+    key, index = get_tree_index(repo_path)
+    tree_format = "compact" if compact else ""
+    etag = make_tree_etag(key, tree_format)
+
+    with _tree_cache_lock:
+        cached = _tree_cache.get(repo_path.name)
+    if cached and cached[0] == key and tree_format in cached[2]:
+        return etag, cached[2][tree_format]
+
+    if compact:
+        body = json.dumps(encode_compact_tree(index), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    else:
+        body = json.dumps(render_tree(index), ensure_ascii=False).encode("utf-8")
+    with _tree_cache_lock:
+        cached = _tree_cache.get(repo_path.name)
+        if cached and cached[0] == key:
+            cached[2][tree_format] = body
+    return etag, body
 
 # def build_tree(dir_path: Path) -> dict:
 #     if not dir_path.is_dir():
@@ -56,13 +260,3 @@ def build_tree(dir_path: Path, root_path: Path = None) -> dict:
 
 #     return tree
 
-
-def extract_function_names_from_ast(ast_path: Path) -> list[dict]:
-    with open(ast_path, "rb") as f:
-        tree = pickle.load(f)
-
-    functions = []
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef):
-            functions.append(node.name)
-    return functions
\ No newline at end of file
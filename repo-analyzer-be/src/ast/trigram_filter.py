@@ -0,0 +1,125 @@
+import re
+import zlib
+
+try:
+    import re._parser as _sre_parse
+except ImportError:  # Python 3.10 이하
+    import sre_parse as _sre_parse
+
+# 파일 하나의 trigram 집합을 담는 블룸 필터 설정.
+# trigram 하나당 약 12비트, 해시 2개(crc32와 그 회전값)면 trigram 하나의 오탐률은 2% 내외이고
+# 질의 trigram이 여러 개면 오탐 확률은 그 곱으로 줄어든다. 비트 수는 항상 2의 거듭제곱이다.
+FILTER_BITS_PER_TRIGRAM = 12
+FILTER_MIN_BITS = 1024
+
+# 필터는 bytes.lower()(ASCII만 소문자로 바꿈)로 만든다. re.IGNORECASE는 비ASCII 문자끼리, 그리고 아래 ASCII 문자와
+# 비ASCII 문자(i ↔ İ ı, k ↔ K 켈빈 기호, s ↔ ſ)도 같게 보므로 대소문자 무시 검색에서는 이런 trigram으로 후보를 좁히지 않는다
+UNICODE_FOLDING_ASCII = frozenset(b"iks")
+
+# 정규식 안의 인라인 플래그 그룹 ((?i), (?i:...), (?im-s:...) 등)
+INLINE_FLAGS = re.compile(r"\(\?([aiLmsux]*)(?:-[imsx]*)?[:)]")
+
+
+def _bit_positions(trigram: bytes, mask: int) -> tuple[int, int]:
+    h = zlib.crc32(trigram)
+    return h & mask, ((h >> 16) | (h << 16)) & mask
+
+
+def extract_trigrams(data: bytes) -> set[bytes]:
+    """
+    소문자로 바꾼 내용의 줄 단위 trigram 집합 (줄바꿈을 걸치는 trigram은 넣지 않음).
+    대소문자 구분 검색도 같은 필터로 후보를 좁힌 뒤 실제 검색으로 확인한다.
+    """
+    trigrams = set()
+    # 같은 줄이 반복되는 경우가 많으므로 중복 줄은 한 번만 본다
+    for line in set(data.lower().split(b"\n")):
+        trigrams.update(line[i:i + 3] for i in range(len(line) - 2))
+    return trigrams
+
+
+def build_trigram_filter(data: bytes) -> tuple[int, bytes]:
+    """
+    파일 내용으로 trigram 블룸 필터를 만듭니다.
+
+    Returns:
+        (비트 수, 필터 바이트). 비트 p는 p // 8번째 바이트의 p % 8번째 비트에 있다.
+    """
+    trigrams = extract_trigrams(data)
+    bits = FILTER_MIN_BITS
+    while bits < len(trigrams) * FILTER_BITS_PER_TRIGRAM:
+        bits *= 2
+
+    mask = bits - 1
+    bloom = bytearray(bits // 8)
+    for trigram in trigrams:
+        pos1, pos2 = _bit_positions(trigram, mask)
+        bloom[pos1 >> 3] |= 1 << (pos1 & 7)
+        bloom[pos2 >> 3] |= 1 << (pos2 & 7)
+    return bits, bytes(bloom)
+
+
+def query_mask(trigrams: set[bytes], bits: int) -> int:
+    """
+    질의 trigram들이 켜야 하는 비트를 정수 마스크로 반환합니다.
+    int.from_bytes(필터, "little") & 마스크 == 마스크 이면 후보 파일입니다.
+    """
+    mask = 0
+    for trigram in trigrams:
+        for pos in _bit_positions(trigram, bits - 1):
+            mask |= 1 << pos
+    return mask
+
+
+def required_trigrams(query: str, regex: bool = False, ignore_case: bool = False) -> set[bytes]:
+    """
+    query와 일치하는 줄이 반드시 포함하는 trigram 집합 (소문자).
+    정규식은 최상위에서 항상 나타나야 하는 리터럴 구간만 사용하며, 확신할 수 없으면 빈 집합
+    (= 후보를 좁히지 않고 전체를 검사)을 반환합니다.
+    필터에는 줄 안의 trigram만 들어 있으므로 줄바꿈을 포함한 질의도 줄 단위로 나눠서 뽑는다.
+    대소문자를 무시하면(ignore_case 또는 정규식의 (?i)) 비ASCII 대소문자 변환과 겹치는 trigram은 뺀다.
+    """
+    if not regex:
+        trigrams = extract_trigrams(query.encode("utf-8"))
+    else:
+        try:
+            parsed = _sre_parse.parse(query)
+        except Exception:
+            return set()
+
+        trigrams = set()
+        for run in _literal_runs(parsed):
+            trigrams |= extract_trigrams(run.encode("utf-8"))
+        ignore_case = ignore_case or any("i" in flags for flags in INLINE_FLAGS.findall(query))
+
+    if ignore_case:
+        trigrams = {t for t in trigrams if _ascii_case_safe(t)}
+    return trigrams
+
+
+def _ascii_case_safe(trigram: bytes) -> bool:
+    # bytes.lower()로 접은 값이 re.IGNORECASE의 대소문자 비교와 같은 trigram인지
+    return all(b < 0x80 and b not in UNICODE_FOLDING_ASCII for b in trigram)
+
+
+def _literal_runs(parsed) -> list[str]:
+    """
+    파싱된 정규식의 연속된 필수 리터럴 구간들. 그룹과 1회 이상 반복은 안쪽으로 들어가고,
+    분기/선택적 반복/문자 클래스 등은 구간을 끊는다.
+    """
+    runs = []
+    current = []
+    for op, arg in parsed:
+        if op is _sre_parse.LITERAL:
+            current.append(chr(arg))
+            continue
+
+        if current:
+            runs.append("".join(current))
+            current = []
+        if op is _sre_parse.SUBPATTERN:
+            runs.extend(_literal_runs(arg[-1]))
+        elif op in (_sre_parse.MAX_REPEAT, _sre_parse.MIN_REPEAT) and arg[0] >= 1:
+            runs.extend(_literal_runs(arg[2]))
+    if current:
+        runs.append("".join(current))
+    return runs
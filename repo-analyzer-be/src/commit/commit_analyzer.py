@@ -1,25 +1,22 @@
+import asyncio
 import subprocess
 import json
 import re
+from functools import partial
 from pathlib import Path
 from collections import Counter
 from datetime import datetime
 from typing import List, Dict, Optional
 
-import requests
-from openai import OpenAI
-from src.utils.secrets_loader import load_llm_config
-from src.configs.config import BASE_DATA_DIR
-
-# === 저장 경로 설정 ===
-COMMIT_ANALYSIS_DIR = BASE_DATA_DIR / "commit_analysis"
-COMMIT_ANALYSIS_DIR.mkdir(parents=True, exist_ok=True)
-
-# === LLM 설정 ===
-provider, LLM_API_KEY, LLM_API_URL, LLM_MODEL = load_llm_config()
-USE_OPENAI = provider.lower() == "openai"
-if USE_OPENAI:
-    client = OpenAI(api_key=LLM_API_KEY)
+from src.utils.llm_client import chat_completion, async_chat_completion
+from src.configs.config import (
+    COMMIT_ANALYSIS_DIR, COMMIT_BATCH_MAX_SIZE, COMMIT_BATCH_TOKEN_BUDGET, COMMIT_RULE_MIN_CONFIDENCE, get_repo_data_dir
+)
+from src.commit.commit_rules import pre_classify_commit
+from src.ast.symbol_index import get_file_definitions, FUNCTION_KINDS
+from src.repo.repo_state import get_repo_ref
+from src.repo.git_process import run_git_async
+from src.utils.single_flight import SingleFlight
 
 # === 커밋 유형 분류 프롬프트 ===
 COMMIT_TYPE_PROMPT = """
@@ -47,56 +44,271 @@ COMMIT_TYPE_PROMPT = """
 {diff}
 """
 
+# === 여러 커밋을 한 번에 분류하는 프롬프트 ===
+COMMIT_BATCH_PROMPT = """
+당신은 Git 커밋의 실제 변경 내용을 바탕으로 커밋의 목적을 분류하는 전문가입니다.
+
+아래는 Python 함수 `{function_name}`의 변경 이력 중 여러 커밋의 메시지와 diff입니다. 각 커밋은 `### Commit <id>`로 시작합니다.
+
+각 커밋에는 `{function_name}` 함수만 관련된 변경이 포함되어 있으며, 커밋 메시지는 부정확할 수 있으므로 가능한 한 diff 내용을 중심으로 판단하세요.
+
+각 커밋의 목적을 다음 중 하나로 분류하세요:
+
+- Bug&Error
+- Feature
+- Refactor
+- Documentation
+- Code Style
+- Other
+
+**반드시 커밋 id를 키로, 위 목록 중 하나를 값으로 하는 JSON 객체 하나만 출력하세요. 설명은 하지 마세요.**
+예: {{"1a2b3c4d5e6f": "Feature", "6f5e4d3c2b1a": "Refactor"}}
+
+{commits}
+"""
+
+COMMIT_BLOCK_TEMPLATE = """### Commit {commit_id}
+Message:
+{message}
+
+Diff:
+{diff}
+"""
+
+# 묶음 프롬프트에서는 커밋마다 diff/메시지를 이 길이까지만 넣는다
+BATCH_DIFF_CHARS = 2000
+BATCH_MESSAGE_CHARS = 500
+
+COMMIT_TYPE_SYSTEM_PROMPT = "당신은 Git 커밋 이력을 분석하여 커밋의 목적을 분류하는 전문가입니다."
+
+VALID_COMMIT_TYPES = {
+    "Bug&Error", "Feature", "Refactor", "Documentation",
+    "Testing", "Code Style", "Chore", "Other"
+}
+
+def build_commit_type_prompt(diff: str, message: str, function_name: str) -> str:
+    return COMMIT_TYPE_PROMPT.format(diff=diff[:3000], message=message[:1000], function_name=function_name)
+
+def parse_commit_type(result: str) -> str:
+    result = result.strip("`").strip()
+    return result if result in VALID_COMMIT_TYPES else "Other"
+
+def estimate_tokens(text: str) -> int:
+    # 코드/영문은 약 4자, 한글은 1~2자가 토큰 하나이므로 넉넉하게 3자를 토큰 하나로 본다
+    return len(text) // 3 + 1
+
+def _commit_id(commit: Dict) -> str:
+    return commit["hash"][:12]
+
+def _commit_block(commit: Dict) -> str:
+    return COMMIT_BLOCK_TEMPLATE.format(
+        commit_id=_commit_id(commit),
+        message=commit.get("message", "")[:BATCH_MESSAGE_CHARS],
+        diff=commit.get("diff", "")[:BATCH_DIFF_CHARS]
+    )
+
+def plan_commit_batches(
+    commits: List[Dict],
+    token_budget: int = COMMIT_BATCH_TOKEN_BUDGET,
+    max_size: int = COMMIT_BATCH_MAX_SIZE
+) -> List[List[Dict]]:
+    """
+    커밋 목록을 순서대로 묶습니다. 한 묶음의 프롬프트 예상 토큰 수가 token_budget을 넘지 않고,
+    커밋 수가 max_size를 넘지 않도록 채웁니다. 커밋 하나가 예산을 넘으면 그 커밋만 따로 묶습니다.
+    """
+    base = estimate_tokens(COMMIT_BATCH_PROMPT)
+    batches = []
+    current = []
+    used = base
+    for commit in commits:
+        cost = estimate_tokens(_commit_block(commit))
+        if current and (used + cost > token_budget or len(current) >= max_size):
+            batches.append(current)
+            current = []
+            used = base
+        current.append(commit)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+def build_commit_batch_prompt(commits: List[Dict], function_name: str) -> str:
+    return COMMIT_BATCH_PROMPT.format(
+        function_name=function_name,
+        commits="\n".join(_commit_block(c) for c in commits)
+    )
+
+def parse_commit_batch_response(content: str, commit_ids: List[str]) -> Dict[str, str]:
+    """
+    {커밋 id: 분류} JSON 응답을 해석합니다. 목록에 없는 분류는 Other로 바꾸고, 묶음에 없는 id는 버립니다.
+
+    Raises:
+        ValueError: JSON 객체가 아니거나 묶음의 커밋을 하나도 분류하지 못한 경우
+    """
+    start, end = content.find("{"), content.rfind("}")
+    if start < 0 or end < start:
+        raise ValueError("JSON object not found in response")
+    data = json.loads(content[start:end + 1])
+    if not isinstance(data, dict):
+        raise ValueError("Response is not a JSON object")
+
+    ids = set(commit_ids)
+    labels = {
+        commit_id: label if label in VALID_COMMIT_TYPES else "Other"
+        for commit_id, label in data.items()
+        if commit_id in ids and isinstance(label, str)
+    }
+    if not labels:
+        raise ValueError("No commit in the batch was classified")
+    return labels
+
+# 같은 함수의 커밋 분석이 여러 요청(commits/risk/overview)에서 동시에 시작되면 한 번만 수행한다
+_commit_flights = SingleFlight()
+
 def classify_commit_type(diff: str, message: str, function_name: str) -> str:
-    prompt = COMMIT_TYPE_PROMPT.format(diff=diff[:3000], message=message[:1000], function_name=function_name)
-    system_prompt = "당신은 Git 커밋 이력을 분석하여 커밋의 목적을 분류하는 전문가입니다."
+    prompt = build_commit_type_prompt(diff, message, function_name)
 
     try:
-        if USE_OPENAI:
-            response = client.chat.completions.create(
-                model=LLM_MODEL or "gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.0
-            )
-            result = response.choices[0].message.content.strip()
+        return chat_completion(COMMIT_TYPE_SYSTEM_PROMPT, prompt, 0.0, "commit_type", parse_commit_type)
 
-        else:
-            headers = {
-                "Authorization": f"Bearer {LLM_API_KEY}",
-                "Content-Type": "application/json",
-            }
-            payload = {
-                "model": LLM_MODEL or "gpt-3.5-turbo",
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.0
-            }
-            response = requests.post(LLM_API_URL, headers=headers, json=payload)
-            response.raise_for_status()
-            result = response.json()["choices"][0]["message"]["content"].strip()
-
-        result = result.strip("`").strip()
-        valid_labels = {
-            "Bug&Error", "Feature", "Refactor", "Documentation",
-            "Testing", "Code Style", "Chore", "Other"
-        }
-        return result if result in valid_labels else "Other"
+    except Exception as e:
+        print(f"[!] classify_commit_type error: {e}")
+        return "Other"
 
+async def classify_commit_type_async(diff: str, message: str, function_name: str) -> str:
+    """
+    classify_commit_type의 비동기 버전.
+    """
+    prompt = build_commit_type_prompt(diff, message, function_name)
+    try:
+        return await async_chat_completion(COMMIT_TYPE_SYSTEM_PROMPT, prompt, 0.0, "commit_type", parse_commit_type)
     except Exception as e:
         print(f"[!] classify_commit_type error: {e}")
         return "Other"
 
-def run_git_log_L(function_name: str, file_path: Path, repo_root: Path) -> str:
-    rel_path = file_path.relative_to(repo_root)
-    pattern = f"/^def {function_name}/"
-    cmd = [
-        "git", "log", "-L", f"{pattern}:{rel_path}", "--patch"
-    ]
+def classify_commit_batch(commits: List[Dict], function_name: str) -> Dict[str, str]:
+    """
+    여러 커밋을 요청 하나로 분류해 {커밋 id: 분류}를 반환합니다. 실패하면 빈 dict를 반환합니다.
+    """
+    prompt = build_commit_batch_prompt(commits, function_name)
+    parse = partial(parse_commit_batch_response, commit_ids=[_commit_id(c) for c in commits])
+    try:
+        return chat_completion(COMMIT_TYPE_SYSTEM_PROMPT, prompt, 0.0, "commit_type_batch", parse)
+    except Exception as e:
+        print(f"[!] classify_commit_batch error ({len(commits)} commits): {e}")
+        return {}
+
+async def classify_commit_batch_async(commits: List[Dict], function_name: str) -> Dict[str, str]:
+    """
+    classify_commit_batch의 비동기 버전.
+    """
+    prompt = build_commit_batch_prompt(commits, function_name)
+    parse = partial(parse_commit_batch_response, commit_ids=[_commit_id(c) for c in commits])
+    try:
+        return await async_chat_completion(COMMIT_TYPE_SYSTEM_PROMPT, prompt, 0.0, "commit_type_batch", parse)
+    except Exception as e:
+        print(f"[!] classify_commit_batch error ({len(commits)} commits): {e}")
+        return {}
+
+def pre_classify_commits(commits: List[Dict]) -> tuple[List[Dict], Dict]:
+    """
+    규칙으로 확실하게 분류되는 커밋은 commit_type과 분류 근거(classified_by, confidence)를 바로 채우고,
+    LLM으로 분류해야 할 애매한 커밋 목록과 분류 통계를 반환합니다.
+    llm_calls_saved는 규칙 분류가 없었을 때의 묶음 요청 수와의 차이입니다.
+    """
+    ambiguous = []
+    for c in commits:
+        result = pre_classify_commit(c)
+        if result is None or result["confidence"] < COMMIT_RULE_MIN_CONFIDENCE:
+            ambiguous.append(c)
+            continue
+        c["commit_type"] = result["commit_type"]
+        c["classified_by"] = f"rule:{result['rule']}"
+        c["confidence"] = result["confidence"]
+
+    for c in ambiguous:
+        c["classified_by"] = "llm"
+    stats = {
+        "commits": len(commits),
+        "rule_classified": len(commits) - len(ambiguous),
+        "llm_calls": 0,
+        "batches": 0,
+        "llm_calls_saved": len(plan_commit_batches(commits)) - len(plan_commit_batches(ambiguous))
+    }
+    if stats["rule_classified"]:
+        print(
+            f"[+] Rule-classified {stats['rule_classified']}/{len(commits)} commits "
+            f"({stats['llm_calls_saved']} LLM calls saved)"
+        )
+    return ambiguous, stats
+
+def classify_commits(commits: List[Dict], function_name: str) -> Dict:
+    """
+    커밋마다 commit_type을 채웁니다. 규칙으로 확실한 커밋을 먼저 분류하고, 남은 커밋은 토큰 예산에 맞춰 묶어
+    요청 하나로 분류하며, 묶음 응답을 해석하지 못했거나 빠진 커밋만 한 개씩 다시 분류합니다.
+
+    Returns:
+        dict: {"commits": 커밋 수, "rule_classified": 규칙으로 분류한 커밋 수, "llm_calls": 보낸 LLM 요청 수,
+               "batches": 묶음 요청 수, "llm_calls_saved": 규칙 분류로 줄인 LLM 요청 수}
+    """
+    commits, stats = pre_classify_commits(commits)
+    for batch in plan_commit_batches(commits):
+        labels = {}
+        if len(batch) > 1:
+            labels = classify_commit_batch(batch, function_name)
+            stats["llm_calls"] += 1
+            stats["batches"] += 1
+        for c in batch:
+            label = labels.get(_commit_id(c))
+            if label is None:
+                label = classify_commit_type(c.get("diff", ""), c.get("message", ""), function_name)
+                stats["llm_calls"] += 1
+            c["commit_type"] = label
+    return stats
+
+async def classify_commits_async(commits: List[Dict], function_name: str) -> Dict:
+    """
+    classify_commits의 비동기 버전. 묶음 요청들은 동시에 보냅니다.
+    """
+    commits, stats = pre_classify_commits(commits)
+
+    async def classify(batch: List[Dict]):
+        labels = {}
+        if len(batch) > 1:
+            labels = await classify_commit_batch_async(batch, function_name)
+            stats["llm_calls"] += 1
+            stats["batches"] += 1
+        missing = [c for c in batch if _commit_id(c) not in labels]
+        retried = await asyncio.gather(*(
+            classify_commit_type_async(c.get("diff", ""), c.get("message", ""), function_name) for c in missing
+        ))
+        stats["llm_calls"] += len(missing)
+        labels.update({_commit_id(c): label for c, label in zip(missing, retried)})
+        for c in batch:
+            c["commit_type"] = labels[_commit_id(c)]
+
+    await asyncio.gather(*(classify(batch) for batch in plan_commit_batches(commits)))
+    return stats
+
+def find_function_definition(file_path: Path, function_name: str, repo_root: Path) -> Optional[Dict]:
+    """
+    심볼 인덱스에서 file_path에 있는 함수/메서드 정의를 이름 또는 qualname(예: "Parser.run")으로 찾습니다.
+    인덱싱되지 않은 파일이거나 정의가 없으면 None을 반환합니다.
+    """
+    definitions = get_file_definitions(repo_root.name, file_path.relative_to(repo_root).as_posix()) or []
+    for d in definitions:
+        if d["kind"] in FUNCTION_KINDS and function_name in (d["name"], d["qualname"]):
+            return d
+    return None
+
+def _git_log_L_args(definition: Dict) -> list[str]:
+    # 정규식(^def name)으로 찾으면 async 함수나 들여쓴 메서드를 놓치므로 인덱스의 줄 범위를 그대로 쓴다
+    start = definition["lineno"]
+    end = definition["end_lineno"] or start
+    return ["log", "-L", f"{start},{end}:{definition['file']}", "--patch"]
+
+def run_git_log_L(definition: Dict, repo_root: Path) -> str:
+    cmd = ["git"] + _git_log_L_args(definition)
     try:
         result = subprocess.run(
             cmd,
@@ -111,6 +323,17 @@ def run_git_log_L(function_name: str, file_path: Path, repo_root: Path) -> str:
         print(f"[!] git log -L failed: {e}")
         return ""
 
+async def run_git_log_L_async(definition: Dict, repo_root: Path) -> str:
+    """
+    run_git_log_L의 비동기 버전. git 프로세스를 기다리는 동안 이벤트 루프를 막지 않습니다.
+    """
+    try:
+        _, stdout, _ = await run_git_async(_git_log_L_args(definition), repo_root)
+        return stdout
+    except OSError as e:
+        print(f"[!] git log -L failed: {e}")
+        return ""
+
 def parse_git_log(log_output: str) -> List[Dict]:
     commits = []
     lines = log_output.splitlines()
@@ -160,11 +383,44 @@ def parse_git_log(log_output: str) -> List[Dict]:
 
     return commits
 
-def analyze_function_commits(file_path: Path, function_name: str, repo_root: Path) -> Optional[Dict]:
+def analyze_function_commits(
+    file_path: Path, function_name: str, repo_root: Path, definition: Optional[Dict] = None
+) -> Optional[Dict]:
+    """
+    함수의 인덱스 정의(definition, 없으면 file_path에서 찾음)의 줄 범위로 git log -L을 실행해 커밋을 분석합니다.
+    """
+    if not (repo_root / ".git").exists():
+        raise ValueError(f"{repo_root} is not a valid Git repository")
+
+    definition = definition or find_function_definition(file_path, function_name, repo_root)
+    if definition is None:
+        raise ValueError(f"[X] 함수 '{function_name}' 정의를 찾을 수 없습니다.")
+
+    log_output = run_git_log_L(definition, repo_root)
+    if not log_output:
+        return None
+
+    commits_raw = parse_git_log(log_output)
+    if not commits_raw:
+        return None
+
+    return build_commit_analysis(commits_raw, function_name, file_path)
+
+async def analyze_function_commits_async(
+    file_path: Path, function_name: str, repo_root: Path, definition: Optional[Dict] = None
+) -> Optional[Dict]:
+    """
+    analyze_function_commits의 비동기 버전 (git은 asyncio 서브프로세스, 분류는 비동기 LLM 요청).
+    """
     if not (repo_root / ".git").exists():
         raise ValueError(f"{repo_root} is not a valid Git repository")
 
-    log_output = run_git_log_L(function_name, file_path, repo_root)
+    if definition is None:
+        definition = await asyncio.to_thread(find_function_definition, file_path, function_name, repo_root)
+    if definition is None:
+        raise ValueError(f"[X] 함수 '{function_name}' 정의를 찾을 수 없습니다.")
+
+    log_output = await run_git_log_L_async(definition, repo_root)
     if not log_output:
         return None
 
@@ -172,12 +428,29 @@ def analyze_function_commits(file_path: Path, function_name: str, repo_root: Pat
     if not commits_raw:
         return None
 
+    return await build_commit_analysis_async(commits_raw, function_name, file_path)
+
+def build_commit_analysis(commits_raw: List[Dict], function_name: str, file_path: Path) -> Dict:
+    """
+    함수에 해당하는 커밋 목록(최신순)을 분류하고 요약을 붙여 저장 형식으로 만듭니다.
+    """
+    classification = classify_commits(commits_raw, function_name)
+    return _summarize_commit_analysis(commits_raw, function_name, file_path, classification)
+
+async def build_commit_analysis_async(commits_raw: List[Dict], function_name: str, file_path: Path) -> Dict:
+    """
+    build_commit_analysis의 비동기 버전.
+    """
+    classification = await classify_commits_async(commits_raw, function_name)
+    return _summarize_commit_analysis(commits_raw, function_name, file_path, classification)
+
+def _summarize_commit_analysis(
+    commits_raw: List[Dict], function_name: str, file_path: Path, classification: Dict
+) -> Dict:
     type_counter = Counter()
     author_counter = Counter()
     for c in commits_raw:
-        commit_type = classify_commit_type(c.get("diff", ""), c.get("message", ""), function_name)
-        c["commit_type"] = commit_type
-        type_counter[commit_type] += 1
+        type_counter[c["commit_type"]] += 1
         author_counter[c.get("author", "")] += 1
 
     summary = {
@@ -192,29 +465,109 @@ def analyze_function_commits(file_path: Path, function_name: str, repo_root: Pat
         "function": function_name,
         "file": str(file_path),
         "commit_history": commits_raw,
-        "summary": summary
+        "summary": summary,
+        "classification": classification
     }
 
-def save_commit_analysis(data: Dict, file_path: Path, function_name: str):
-    save_path = COMMIT_ANALYSIS_DIR / f"{function_name}.json"
+def get_commit_analysis_path(file_path: Path, definition: Dict, repo_root: Path, traced: bool = False) -> Path:
+    """
+    커밋 분석 결과 저장 경로. 레포와 체크아웃된 ref별로 나누고, 파일 경로와 정의의 qualname, 시작 줄을
+    이름에 넣어 다른 파일이나 다른 클래스의 같은 이름 함수(__init__, run 등)와 겹치지 않게 합니다.
+    traced=True는 파일 이력에서 줄 범위를 추적한 결과(trace_function_commits)로, git log -L 결과와
+    diff 형식이 다르므로 따로 저장합니다.
+    예: commit_analysis/whereami/master/whereami@@@predict.py@@@Model.crossval@@@L42.json
+    """
+    rel_path = file_path.relative_to(repo_root).as_posix().replace("/", "@@@")
+    save_dir = get_repo_data_dir(COMMIT_ANALYSIS_DIR, repo_root.name, get_repo_ref(repo_root))
+    suffix = "@@@traced" if traced else ""
+    return save_dir / f"{rel_path}@@@{definition['qualname']}@@@L{definition['lineno']}{suffix}.json"
+
+def save_commit_analysis(data: Dict, file_path: Path, definition: Dict, repo_root: Path, traced: bool = False):
+    save_path = get_commit_analysis_path(file_path, definition, repo_root, traced)
     with open(save_path, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
-        
-def get_commit_summary(file_path: Path, function_name: str, repo_root: Path) -> dict:
+
+def read_commit_analysis(
+    file_path: Path, definition: Dict, repo_root: Path, traced: bool = False
+) -> Optional[Dict]:
     """
-    특정 함수의 커밋 분석 요약(summary)만 반환합니다.
-    - 이미 분석 결과가 존재하면 해당 JSON 파일에서 summary 반환
-    - 없다면 analyze → 저장 후 summary 반환
+    저장된 커밋 분석 결과가 있으면 읽어서 반환하고, 없으면 None을 반환합니다.
     """
-    commit_data_path = COMMIT_ANALYSIS_DIR / f"{function_name}.json"
+    commit_data_path = get_commit_analysis_path(file_path, definition, repo_root, traced)
+    if not commit_data_path.exists():
+        return None
+    with open(commit_data_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def load_commit_analysis(
+    file_path: Path, function_name: str, repo_root: Path, definition: Optional[Dict] = None
+) -> Dict:
+    """
+    특정 함수의 커밋 분석 결과 전체를 반환합니다.
+    - 이미 분석 결과가 존재하면 해당 JSON 파일을 읽어서 반환
+    - 없다면 analyze → 저장 후 반환
+    호출 구조 등으로 인덱스 정의를 이미 알고 있으면 definition으로 넘겨 같은 함수를 분석하게 합니다.
 
-    if commit_data_path.exists():
-        with open(commit_data_path, "r", encoding="utf-8") as f:
-            commit_data = json.load(f)
-    else:
-        commit_data = analyze_function_commits(file_path, function_name, repo_root)
+    Raises:
+        ValueError: 커밋 분석 실패 (함수 정의가 없거나 Git 레포가 아니거나 이력이 없는 경우)
+    """
+    definition = definition or find_function_definition(file_path, function_name, repo_root)
+    if definition is None:
+        raise ValueError(f"[X] 함수 '{function_name}' 정의를 찾을 수 없습니다.")
+
+    commit_data = read_commit_analysis(file_path, definition, repo_root)
+    if commit_data is not None:
+        return commit_data
+
+    commit_data = analyze_function_commits(file_path, function_name, repo_root, definition)
+    if not commit_data:
+        raise ValueError("[X] 커밋 분석 실패")
+    save_commit_analysis(commit_data, file_path, definition, repo_root)
+    return commit_data
+
+async def load_commit_analysis_async(
+    file_path: Path, function_name: str, repo_root: Path, definition: Optional[Dict] = None
+) -> Dict:
+    """
+    load_commit_analysis의 비동기 버전. 저장된 결과가 없을 때의 git log와 LLM 분류를
+    이벤트 루프를 막지 않고 수행하며, 같은 함수(레포/ref/파일/정의 = 저장 경로)의 분석이
+    이미 진행 중이면 새로 분석하지 않고 그 결과를 함께 기다립니다.
+
+    Raises:
+        ValueError: 커밋 분석 실패 (함수 정의가 없거나 Git 레포가 아니거나 이력이 없는 경우)
+    """
+    if definition is None:
+        definition = await asyncio.to_thread(find_function_definition, file_path, function_name, repo_root)
+    if definition is None:
+        raise ValueError(f"[X] 함수 '{function_name}' 정의를 찾을 수 없습니다.")
+
+    # 저장 경로를 만들 때 ref 조회와 mkdir을 하므로 캐시 파일 I/O는 모두 스레드에서 한다
+    commit_data = await asyncio.to_thread(read_commit_analysis, file_path, definition, repo_root)
+    if commit_data is not None:
+        return commit_data
+
+    async def analyze() -> Dict:
+        commit_data = await analyze_function_commits_async(file_path, function_name, repo_root, definition)
         if not commit_data:
             raise ValueError("[X] 커밋 분석 실패")
-        save_commit_analysis(commit_data, file_path, function_name)
+        await asyncio.to_thread(save_commit_analysis, commit_data, file_path, definition, repo_root)
+        return commit_data
 
-    return commit_data.get("summary", {})
+    key = str(await asyncio.to_thread(get_commit_analysis_path, file_path, definition, repo_root))
+    return await _commit_flights.run(key, analyze)
+
+def get_commit_summary(
+    file_path: Path, function_name: str, repo_root: Path, definition: Optional[Dict] = None
+) -> dict:
+    """
+    특정 함수의 커밋 분석 요약(summary)만 반환합니다.
+    """
+    return load_commit_analysis(file_path, function_name, repo_root, definition).get("summary", {})
+
+async def get_commit_summary_async(
+    file_path: Path, function_name: str, repo_root: Path, definition: Optional[Dict] = None
+) -> dict:
+    """
+    get_commit_summary의 비동기 버전.
+    """
+    return (await load_commit_analysis_async(file_path, function_name, repo_root, definition)).get("summary", {})
@@ -0,0 +1,280 @@
+import ast
+import re
+import textwrap
+from typing import Dict, List, Optional
+
+# Conventional Commits 접두사 → 커밋 유형 (예: "fix(parser): ...", "refactor!: ...")
+CONVENTIONAL_PREFIX = re.compile(r"^(\w+)(?:\([^)]*\))?!?:\s")
+CONVENTIONAL_TYPES = {
+    "fix": "Bug&Error",
+    "bugfix": "Bug&Error",
+    "hotfix": "Bug&Error",
+    "feat": "Feature",
+    "feature": "Feature",
+    "docs": "Documentation",
+    "doc": "Documentation",
+    "refactor": "Refactor",
+    "style": "Code Style",
+}
+
+# 규칙별 신뢰도. 메시지는 부정확할 수 있으므로 diff 내용으로 판단한 규칙을 더 믿는다
+RULE_CONFIDENCE = {
+    "whitespace": 0.95,
+    "file_rename": 0.95,
+    "comment_docstring": 0.9,
+    "identifier_rename": 0.85,
+    "conventional_prefix": 0.8,
+}
+
+TRIPLE_QUOTES = ('"""', "'''")
+
+# docstring 판별: hunk 시작 줄 번호, docstring이 올 수 있는 블록, 줄 끝 주석
+HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,\d+)? \+(\d+)")
+BLOCK_HEADER = ("def ", "async def ", "class ")
+TRAILING_COMMENT = re.compile(r"\s+#[^'\"]*$")
+
+# 문자열 리터럴은 토큰 하나로 본다 (리터럴 안의 공백은 값이므로 공백 규칙에서 무시하지 않는다)
+STRING_LITERAL = r"""[rRbBuUfF]{0,2}(?:'(?:\\.|[^'\\])*'|"(?:\\.|[^"\\])*")"""
+TOKEN = re.compile(STRING_LITERAL + r"|\w+|\S")
+
+
+def pre_classify_commit(commit: Dict) -> Optional[Dict]:
+    """
+    LLM 없이 확실하게 분류할 수 있는 커밋을 parse_git_log의 diff와 메시지로 분류합니다.
+    diff 규칙(줄 안 공백/주석·docstring/지역 이름 변경)을 먼저 보고, 해당하지 않으면 Conventional Commits 접두사를 봅니다.
+
+    Returns:
+        dict: {"commit_type", "rule", "confidence"}. 애매한 커밋이면 None
+    """
+    diff = commit.get("diff", "")
+    removed, added = _changed_lines(diff)
+
+    if not removed and not added:
+        if "\nrename from " in f"\n{diff}":
+            return _rule_result("Refactor", "file_rename")
+    elif _normalize_spacing(removed) == _normalize_spacing(added):
+        return _rule_result("Code Style", "whitespace")
+    elif _is_comment_docstring_only(diff):
+        return _rule_result("Documentation", "comment_docstring")
+    elif _is_local_rename(diff):
+        return _rule_result("Refactor", "identifier_rename")
+
+    match = CONVENTIONAL_PREFIX.match(commit.get("message", ""))
+    if match and match.group(1).lower() in CONVENTIONAL_TYPES:
+        return _rule_result(CONVENTIONAL_TYPES[match.group(1).lower()], "conventional_prefix")
+    return None
+
+
+def _rule_result(commit_type: str, rule: str) -> Dict:
+    return {"commit_type": commit_type, "rule": rule, "confidence": RULE_CONFIDENCE[rule]}
+
+
+def _changed_lines(diff: str) -> tuple[List[str], List[str]]:
+    removed, added = [], []
+    for line in diff.splitlines():
+        if line.startswith(("---", "+++")):
+            continue
+        if line.startswith("-"):
+            removed.append(line[1:])
+        elif line.startswith("+"):
+            added.append(line[1:])
+    return removed, added
+
+
+def _normalize_spacing(lines: List[str]) -> List[tuple[str, List[str]]]:
+    """
+    줄마다 (앞쪽 들여쓰기, 토큰 목록). 토큰 사이 공백, 줄 끝 공백, 빈 줄만 무시합니다.
+    Python에서는 들여쓰기가 블록 범위를 정하므로 그대로 비교해, 들여쓰기가 바뀐 커밋은 LLM에 맡긴다.
+    """
+    return [
+        (line[:len(line) - len(line.lstrip())], TOKEN.findall(line))
+        for line in lines
+        if line.strip()
+    ]
+
+
+
+def _is_comment_docstring_only(diff: str) -> bool:
+    """
+    바뀐 줄이 모두 주석, docstring 안의 줄, 빈 줄인지 확인합니다.
+    삼중 따옴표 문자열은 def/class 바로 다음 문장이거나 파일 첫 문장일 때만 docstring으로 보고
+    (SQL 같은 문자열 인자나 대입은 코드), 닫는 따옴표 뒤에 주석 말고 다른 코드가 있으면 코드로 봅니다.
+    hunk 안의 문맥 줄까지 따라가며 판단하므로, 문맥 없이 docstring 중간만 바뀐 hunk는 False가 됩니다 (애매하면 LLM에 맡긴다).
+    """
+    old = new = None
+    changed = False
+    for line in diff.splitlines():
+        header = HUNK_HEADER.match(line)
+        if header:
+            old, new = _doc_state(header.group(1) == "1"), _doc_state(header.group(2) == "1")
+            continue
+        if old is None or line.startswith(("---", "+++", "\\")):
+            continue
+        mark, text = line[:1], line[1:]
+        if mark == "-":
+            doc = _doc_line(text, old)
+        elif mark == "+":
+            doc = _doc_line(text, new)
+        elif mark == " ":
+            _doc_line(text, old)
+            _doc_line(text, new)
+            continue
+        else:
+            continue
+        if not doc:
+            return False
+        changed = True
+    return changed
+
+
+def _doc_state(module_start: bool) -> Dict:
+    # string: 열려 있는 삼중 따옴표 문자열 (따옴표, docstring 여부)
+    # doc_slot: 다음 문장이 def/class/모듈의 첫 문장인지, header: 여러 줄에 걸친 def/class 줄 안인지
+    return {"string": None, "doc_slot": module_start, "header": False}
+
+
+def _doc_line(text: str, state: Dict) -> bool:
+    """
+    이 줄이 주석/docstring/빈 줄인지 반환하고, 다음 줄을 위해 state를 갱신합니다.
+    """
+    stripped = text.strip()
+    if state["string"] is not None:
+        quote, is_doc = state["string"]
+        if stripped.count(quote) % 2 == 0:
+            return is_doc
+        state["string"] = None
+        return is_doc and _only_comment(stripped.split(quote, 1)[1])
+    if not stripped or stripped.startswith("#"):
+        return True
+
+    doc_slot = state["doc_slot"]
+    state["doc_slot"] = False
+    if doc_slot and stripped.startswith(TRIPLE_QUOTES):
+        quote = stripped[:3]
+        rest = stripped[3:]
+        if quote not in rest:
+            state["string"] = (quote, True)
+            return True
+        return _only_comment(rest.split(quote, 1)[1])
+
+    for quote in TRIPLE_QUOTES:
+        if stripped.count(quote) % 2:
+            state["string"] = (quote, False)
+            return False
+    code = TRAILING_COMMENT.sub("", stripped)
+    if state["header"] or code.startswith(BLOCK_HEADER):
+        state["header"] = not code.endswith(":") and (state["header"] or code.count("(") > code.count(")"))
+        state["doc_slot"] = code.endswith(":")
+    return False
+
+
+def _only_comment(rest: str) -> bool:
+    rest = rest.strip()
+    return not rest or rest.startswith("#")
+
+
+def _is_local_rename(diff: str) -> bool:
+    """
+    함수 안에서 정의된 이름(인자, 지역 변수, 중첩 정의, 함수 자신)만 일관되게 바뀐 커밋인지 확인합니다.
+    git log -L diff는 함수 전체를 hunk 하나에 담으므로 변경 전/후 함수를 복원해 AST로 비교합니다.
+    - 이전 이름은 변경 전 함수 안에서 정의된 이름이어야 한다 (min → max 같은 전역/내장 이름 교체 제외)
+    - 새 이름은 변경 전 함수에 없던 이름이고, 이전 이름은 변경 후 함수에 남아 있지 않아야 한다
+    - 이름만 바꾼 변경 전 AST가 변경 후 AST와 같아야 한다 (속성 이름, 문자열 등 다른 변경이 섞이면 제외)
+    함수 전체가 보이지 않는 diff(-U0 hunk 등)이거나 파싱할 수 없으면 False입니다 (애매하면 LLM에 맡긴다).
+    """
+    sides = _function_sides(diff)
+    if sides is None:
+        return False
+    old_fn, new_fn = _parse_function(sides[0]), _parse_function(sides[1])
+    if old_fn is None or new_fn is None:
+        return False
+
+    renames = {}
+    for old_node, new_node in zip(ast.walk(old_fn), ast.walk(new_fn)):
+        if type(old_node) is not type(new_node):
+            return False
+        old_name, new_name = _binding_name(old_node), _binding_name(new_node)
+        if old_name != new_name and renames.setdefault(old_name, new_name) != new_name:
+            return False
+    if not renames or len(set(renames.values())) != len(renames):
+        return False
+    if not set(renames) <= _bound_names(old_fn):
+        return False
+    if _all_names(old_fn) & set(renames.values()) or _all_names(new_fn) & set(renames):
+        return False
+
+    for node in ast.walk(old_fn):
+        _set_binding_name(node, renames)
+    return ast.dump(old_fn) == ast.dump(new_fn)
+
+
+def _function_sides(diff: str) -> Optional[tuple[str, str]]:
+    # hunk가 하나일 때만 변경 전/후 코드를 복원한다 (hunk가 여럿이면 사이의 줄이 빠져 있다)
+    hunks = 0
+    old, new = [], []
+    for line in diff.splitlines():
+        if line.startswith("@@"):
+            hunks += 1
+            continue
+        if hunks == 0:
+            continue
+        mark, text = line[:1], line[1:]
+        if mark == " ":
+            old.append(text)
+            new.append(text)
+        elif mark == "-":
+            old.append(text)
+        elif mark == "+":
+            new.append(text)
+    if hunks != 1:
+        return None
+    return "\n".join(old), "\n".join(new)
+
+
+def _parse_function(code: str) -> Optional[ast.AST]:
+    try:
+        tree = ast.parse(textwrap.dedent(code))
+    except SyntaxError:
+        return None
+    if len(tree.body) == 1 and isinstance(tree.body[0], (ast.FunctionDef, ast.AsyncFunctionDef)):
+        return tree.body[0]
+    return None
+
+
+def _binding_name(node: ast.AST) -> Optional[str]:
+    # 이름 변경으로 볼 식별자 (속성 이름과 import 이름은 함수 밖에도 영향을 주므로 포함하지 않는다)
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.arg):
+        return node.arg
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.ExceptHandler)):
+        return node.name
+    return None
+
+
+def _set_binding_name(node: ast.AST, renames: Dict[str, str]):
+    name = _binding_name(node)
+    if name not in renames:
+        return
+    if isinstance(node, ast.Name):
+        node.id = renames[name]
+    elif isinstance(node, ast.arg):
+        node.arg = renames[name]
+    else:
+        node.name = renames[name]
+
+
+def _bound_names(fn: ast.AST) -> set[str]:
+    # 함수 안에서 정의되는 이름: 함수 자신, 인자, 대입/for/with 대상, 중첩 정의, except ... as
+    names = set()
+    for node in ast.walk(fn):
+        if isinstance(node, ast.Name):
+            if isinstance(node.ctx, ast.Store):
+                names.add(node.id)
+        elif _binding_name(node) is not None:
+            names.add(_binding_name(node))
+    return names
+
+
+def _all_names(fn: ast.AST) -> set[str]:
+    return {name for name in map(_binding_name, ast.walk(fn)) if name is not None}
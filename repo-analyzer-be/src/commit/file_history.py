@@ -0,0 +1,145 @@
+import asyncio
+import re
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.commit.commit_analyzer import parse_git_log
+from src.repo.git_process import run_git_async
+
+HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+def _git_log_file_args(file_path: Path, repo_root: Path) -> list[str]:
+    rel_path = file_path.relative_to(repo_root).as_posix()
+    return [
+        "log", "--first-parent", "-m", "--patch", "-U0",
+        "--no-color", "--no-ext-diff", "--", rel_path
+    ]
+
+
+def run_git_log_file(file_path: Path, repo_root: Path) -> str:
+    """
+    파일을 건드린 커밋 전체를 줄 맥락 없이(-U0) 한 번에 가져옵니다.
+    머지 커밋은 첫 번째 부모 기준 diff만 봅니다.
+    """
+    cmd = ["git"] + _git_log_file_args(file_path, repo_root)
+    try:
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            cwd=repo_root
+        )
+        return result.stdout
+    except Exception as e:
+        print(f"[!] git log failed: {e}")
+        return ""
+
+
+async def run_git_log_file_async(file_path: Path, repo_root: Path) -> str:
+    """
+    run_git_log_file의 비동기 버전.
+    """
+    try:
+        _, stdout, _ = await run_git_async(_git_log_file_args(file_path, repo_root), repo_root)
+        return stdout
+    except OSError as e:
+        print(f"[!] git log failed: {e}")
+        return ""
+
+
+def load_file_history(file_path: Path, repo_root: Path) -> List[Dict]:
+    """
+    파일의 커밋 이력(최신순)을 hunk 단위로 파싱합니다.
+    각 커밋에는 parse_git_log의 필드와 함께
+    "hunks": [(old_start, old_len, new_start, new_len, hunk 텍스트)]가 붙습니다.
+    """
+    return _parse_file_history(run_git_log_file(file_path, repo_root))
+
+
+async def load_file_history_async(file_path: Path, repo_root: Path) -> List[Dict]:
+    """
+    load_file_history의 비동기 버전. git은 asyncio 서브프로세스로 실행하고,
+    이력이 긴 파일은 파싱도 오래 걸리므로 스레드에서 파싱합니다.
+    """
+    log_output = await run_git_log_file_async(file_path, repo_root)
+    return await asyncio.to_thread(_parse_file_history, log_output)
+
+
+def _parse_file_history(log_output: str) -> List[Dict]:
+    commits = parse_git_log(log_output)
+    for commit in commits:
+        commit["hunks"] = _parse_hunks(commit.pop("diff", ""))
+    return commits
+
+
+def _parse_hunks(diff: str) -> list[tuple]:
+    hunks = []
+    current = None
+    for line in diff.splitlines():
+        match = HUNK_HEADER.match(line)
+        if match:
+            old_start, old_len, new_start, new_len = match.groups()
+            current = [
+                int(old_start), 1 if old_len is None else int(old_len),
+                int(new_start), 1 if new_len is None else int(new_len),
+                [line]
+            ]
+            hunks.append(current)
+        elif current is not None and line[:1] in ("+", "-", "\\"):
+            current[4].append(line)
+    return [(o, ol, n, nl, "\n".join(lines)) for o, ol, n, nl, lines in hunks]
+
+
+def trace_function_commits(history: List[Dict], start: int, end: int) -> List[Dict]:
+    """
+    현재 버전에서 start~end 줄에 있는 함수가 걸쳐 있던 커밋들만 골라냅니다 (git log -L과 같은 방식).
+    최신 커밋부터 거슬러 가며 hunk로 줄 범위를 이전 버전 좌표로 옮기고, 함수가 처음 추가된
+    커밋에서 멈춥니다. 결과의 diff에는 함수 범위에 걸친 hunk만 담깁니다.
+    """
+    commits = []
+    for commit in history:
+        hunks = commit["hunks"]
+        touched = [hunk for hunk in hunks if _touches(hunk, start, end)]
+        if touched:
+            commits.append({
+                **{key: value for key, value in commit.items() if key != "hunks"},
+                "diff": "\n".join(hunk[4] for hunk in touched)
+            })
+
+        start = _to_old_line(start, hunks, is_start=True)
+        end = _to_old_line(end, hunks, is_start=False)
+        if start is None or end is None or start > end:
+            # 이 커밋에서 함수가 새로 생겼다
+            break
+    return commits
+
+
+def _touches(hunk: tuple, start: int, end: int) -> bool:
+    _, _, new_start, new_len, _ = hunk
+    if new_len == 0:
+        # 삭제만 있는 hunk는 new_start 줄 뒤에서 줄이 빠진 것
+        return start <= new_start < end
+    return new_start <= end and start <= new_start + new_len - 1
+
+
+def _to_old_line(line: int, hunks: list[tuple], is_start: bool) -> Optional[int]:
+    """
+    커밋 후 버전의 줄 번호를 커밋 전 버전의 줄 번호로 옮깁니다.
+    바뀐 hunk 안에 있으면 hunk의 이전 범위 끝으로 맞추고, 새로 추가된 줄이면 바로 옆 줄로 옮깁니다.
+    """
+    shift = 0
+    for old_start, old_len, new_start, new_len, _ in hunks:
+        if new_len > 0 and new_start <= line <= new_start + new_len - 1:
+            if old_len == 0:
+                # 추가된 줄: 시작은 삽입 위치 다음 줄, 끝은 삽입 위치 줄
+                return old_start + 1 if is_start else old_start
+            return old_start if is_start else old_start + old_len - 1
+        before = new_start + new_len - 1 < line if new_len > 0 else new_start < line
+        if not before:
+            break
+        shift += old_len - new_len
+    return line + shift
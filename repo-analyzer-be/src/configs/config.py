@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DATA_DIR = Path(__file__).parent.parent.parent / "data"
@@ -5,8 +6,47 @@ REPO_DIR = BASE_DATA_DIR / "cloned_repo"
 SUMMARY_DIR = BASE_DATA_DIR / "summaries"
 AST_DIR = BASE_DATA_DIR / "asts"
 COMMIT_ANALYSIS_DIR = BASE_DATA_DIR / "commit_analysis"
+INDEX_DB_PATH = BASE_DATA_DIR / "index.db"
+LLM_CACHE_DB_PATH = BASE_DATA_DIR / "llm_cache.db"
+
+# AST 생성 시 사용할 프로세스 수 (1이면 단일 프로세스로 처리)
+AST_WORKERS = int(os.environ.get("AST_WORKERS", os.cpu_count() or 1))
+
+# 배치 분석에서 동시에 진행할 LLM 작업 수
+LLM_CONCURRENCY = int(os.environ.get("LLM_CONCURRENCY", 4))
+
+# LLM 요청 하나를 기다리는 최대 시간(초)
+LLM_TIMEOUT = float(os.environ.get("LLM_TIMEOUT", 120))
+
+# 서버 전체에서 동시에 보낼 수 있는 LLM 요청 수와 유지할 HTTP 연결 수
+LLM_MAX_IN_FLIGHT = int(os.environ.get("LLM_MAX_IN_FLIGHT", 16))
+LLM_MAX_CONNECTIONS = int(os.environ.get("LLM_MAX_CONNECTIONS", 16))
+
+# LLM 응답 캐시 크기(바이트, 0이면 캐시 사용 안 함)와 유효 기간(초, 0이면 만료 없음)
+LLM_CACHE_MAX_BYTES = int(os.environ.get("LLM_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+LLM_CACHE_TTL = int(os.environ.get("LLM_CACHE_TTL", 30 * 24 * 3600))
+
+# 커밋 분류 시 한 요청에 묶을 커밋 수 상한과 요청 하나의 대략적인 입력 토큰 예산
+COMMIT_BATCH_MAX_SIZE = int(os.environ.get("COMMIT_BATCH_MAX_SIZE", 20))
+COMMIT_BATCH_TOKEN_BUDGET = int(os.environ.get("COMMIT_BATCH_TOKEN_BUDGET", 6000))
+
+# 규칙 기반 커밋 분류를 그대로 쓸 최소 신뢰도 (이보다 낮으면 LLM으로 분류, 1보다 크면 규칙 분류 사용 안 함)
+COMMIT_RULE_MIN_CONFIDENCE = float(os.environ.get("COMMIT_RULE_MIN_CONFIDENCE", 0.8))
+
+# 레포 요약 시 동시에 요약할 파일 수
+SUMMARY_CONCURRENCY = int(os.environ.get("SUMMARY_CONCURRENCY", 8))
 
 REPO_DIR.mkdir(parents=True, exist_ok=True)
 SUMMARY_DIR.mkdir(parents=True, exist_ok=True)
 AST_DIR.mkdir(parents=True, exist_ok=True)
 COMMIT_ANALYSIS_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def get_repo_data_dir(base_dir: Path, repo_name: str, *parts: str) -> Path:
+    """
+    저장 디렉토리(AST_DIR, SUMMARY_DIR 등) 아래의 레포 전용 하위 디렉토리를 반환합니다.
+    예: get_repo_data_dir(SUMMARY_DIR, "whereami") → data/summaries/whereami
+    """
+    path = base_dir.joinpath(repo_name, *parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -6,3 +6,6 @@ EXCLUDED_DIRS = {
 }
 
 EXCLUDED_FILES = {"__init__.py", "setup.py"}
+
+# 이보다 작은 파일(바이트)은 분석할 내용이 없다고 보고 건너뜀
+MIN_FILE_SIZE = 30
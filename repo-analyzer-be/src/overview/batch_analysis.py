@@ -0,0 +1,190 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable
+
+from src.configs.config import REPO_DIR, LLM_CONCURRENCY
+from src.ast.symbol_index import get_file_definitions, FUNCTION_KINDS
+from src.ast.function_locator import get_definition_structure, build_function_context
+from src.ast.function_explainer import analyze_function_async
+from src.commit.commit_analyzer import build_commit_analysis_async, save_commit_analysis, read_commit_analysis
+from src.commit.file_history import load_file_history_async, trace_function_commits
+from src.risk_analysis.risk_score_calculator import generate_risk_report_async
+
+
+class FileHistoryCache:
+    """
+    배치 하나 안에서 파일별 git 이력을 한 번만 읽도록 공유합니다.
+    같은 파일을 여러 작업이 동시에 요청하면 처음 요청한 작업이 읽고 나머지는 같은 결과를 기다립니다.
+    """
+
+    def __init__(self, repo_path: Path):
+        self.repo_path = repo_path
+        self._histories: dict[str, asyncio.Task] = {}
+
+    async def get(self, rel_path: str) -> list[dict]:
+        task = self._histories.get(rel_path)
+        if task is None:
+            task = self._histories[rel_path] = asyncio.create_task(
+                load_file_history_async(self.repo_path / rel_path, self.repo_path)
+            )
+        # 기다리던 작업 하나가 취소되어도 같은 이력을 기다리는 다른 작업에는 영향이 없도록 한다
+        return await asyncio.shield(task)
+
+    def cancel(self):
+        for task in self._histories.values():
+            task.cancel()
+
+
+def resolve_batch_items(repo_name: str, items: list[dict]) -> tuple[list[dict], list[dict]]:
+    """
+    (file_path, function_name) 목록을 인덱스의 정의로 바꿉니다.
+    function_name이 없으면 그 파일의 모든 함수/메서드를 대상으로 하고, 같은 정의는 한 번만 담습니다.
+    인덱스를 조회하므로 비동기 코드에서는 스레드에서 호출합니다.
+
+    Returns:
+        (정의 목록, 찾지 못한 항목에 대한 오류 줄 목록)
+    """
+    definitions = []
+    errors = []
+    seen = set()
+    file_definitions = {}
+
+    for item in items:
+        file_path = item["file_path"].replace("\\", "/").strip("/")
+        if file_path not in file_definitions:
+            file_definitions[file_path] = get_file_definitions(repo_name, file_path)
+        in_file = file_definitions[file_path]
+        if in_file is None:
+            errors.append(_error_line(file_path, item.get("function_name"), "File not indexed."))
+            continue
+
+        name = item.get("function_name")
+        matched = [
+            d for d in in_file
+            if d["kind"] in FUNCTION_KINDS and (name is None or d["name"] == name or d["qualname"] == name)
+        ]
+        if name is not None:
+            matched = matched[:1]
+        if not matched:
+            errors.append(_error_line(file_path, name, "Function not found."))
+            continue
+
+        for d in matched:
+            key = (d["file"], d["qualname"], d["lineno"])
+            if key not in seen:
+                seen.add(key)
+                definitions.append(d)
+    return definitions, errors
+
+
+async def iter_batch_results(
+    repo_name: str,
+    items: list[dict],
+    task: Callable[[dict, "FileHistoryCache"], Awaitable[dict]],
+    result_key: str,
+    concurrency: int | None = None
+) -> AsyncIterator[str]:
+    """
+    배치 항목마다 task를 최대 concurrency개씩 동시에 실행하고, 끝나는 순서대로 NDJSON 줄을 내보냅니다.
+    마지막 줄은 {"status": "done", ...} 요약입니다.
+    """
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(concurrency or LLM_CONCURRENCY)
+    definitions, errors = await asyncio.to_thread(resolve_batch_items, repo_name, items)
+    for line in errors:
+        yield _dump(line)
+
+    histories = FileHistoryCache(REPO_DIR / repo_name)
+
+    async def run(definition: dict) -> dict:
+        async with semaphore:
+            return await task(definition, histories)
+
+    tasks = {asyncio.create_task(run(d)): d for d in definitions}
+    pending = set(tasks)
+    succeeded = 0
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for finished in done:
+                d = tasks[finished]
+                try:
+                    result = finished.result()
+                except Exception as e:
+                    yield _dump(_error_line(d["file"], d["qualname"], str(e)))
+                    continue
+                succeeded += 1
+                yield _dump({
+                    "status": "success",
+                    "file": d["file"],
+                    "function": d["qualname"],
+                    "lineno": d["lineno"],
+                    result_key: result
+                })
+    finally:
+        # 클라이언트가 연결을 끊으면 남은 작업(진행 중인 LLM 요청 포함)은 취소한다
+        for unfinished in pending:
+            unfinished.cancel()
+        histories.cancel()
+
+    yield _dump({
+        "status": "done",
+        "total": len(definitions) + len(errors),
+        "succeeded": succeeded,
+        "failed": len(definitions) + len(errors) - succeeded,
+        "elapsed": round(time.perf_counter() - started, 3)
+    })
+
+
+async def explain_task(definition: dict, histories: FileHistoryCache) -> dict:
+    context = await asyncio.to_thread(_build_definition_context, definition)
+    if context["target"] is None:
+        raise ValueError("Function source not found.")
+    analysis = await analyze_function_async(context)
+    if analysis is None:
+        raise ValueError("LLM 분석 실패")
+    return analysis
+
+
+async def risk_task(definition: dict, histories: FileHistoryCache) -> dict:
+    repo_path = histories.repo_path
+    file_path = repo_path / definition["file"]
+    function_name = definition["name"]
+
+    # 저장 경로는 qualname과 시작 줄로 나뉘므로 같은 파일의 같은 이름 메서드(__init__, run 등)끼리 섞이지 않는다.
+    # 단건 분석(git log -L) 결과가 있으면 그대로 쓰고, 파일 이력에서 추적한 결과는 따로 저장한다
+    # 캐시 파일 읽기/쓰기(ref 조회 포함)는 스레드에서 해 이벤트 루프를 막지 않는다
+    commit_data = (
+        await asyncio.to_thread(read_commit_analysis, file_path, definition, repo_path)
+        or await asyncio.to_thread(read_commit_analysis, file_path, definition, repo_path, True)
+    )
+    if commit_data is None:
+        # 파일 이력은 배치 안에서 한 번만 읽고, 함수 범위에 걸친 커밋만 골라낸다
+        commits = trace_function_commits(
+            await histories.get(definition["file"]),
+            definition["lineno"], definition["end_lineno"] or definition["lineno"]
+        )
+        if not commits:
+            raise ValueError("[X] 커밋 분석 실패")
+        commit_data = await build_commit_analysis_async(commits, function_name, file_path)
+        await asyncio.to_thread(save_commit_analysis, commit_data, file_path, definition, repo_path, True)
+
+    return await generate_risk_report_async(
+        file_path, function_name, repo_path,
+        structure=await asyncio.to_thread(get_definition_structure, definition),
+        commit_data=commit_data
+    )
+
+
+def _build_definition_context(definition: dict) -> dict:
+    return build_function_context(get_definition_structure(definition))
+
+
+def _error_line(file_path: str, function_name: str | None, error: str) -> dict:
+    return {"status": "error", "file": file_path, "function": function_name, "error": error}
+
+
+def _dump(line: dict) -> str:
+    return json.dumps(line, ensure_ascii=False) + "\n"
@@ -0,0 +1,101 @@
+import asyncio
+from typing import AsyncIterator
+
+from src.configs.config import REPO_DIR
+from src.ast.function_locator import get_function_structure, build_function_context
+from src.ast.function_explainer import analyze_function_async
+from src.commit.commit_analyzer import load_commit_analysis_async
+from src.risk_analysis.risk_score_calculator import generate_risk_report_async
+
+# 함수 개요의 섹션 이름 (개별 엔드포인트의 응답 키와 같다)
+OVERVIEW_SECTIONS = ("analysis", "commit_summary", "risk_report")
+
+
+def prepare_function_overview(repo_name: str, function_name: str, file_path: str | None = None) -> dict | None:
+    """
+    세 섹션이 함께 쓰는 입력(호출 구조, 컨텍스트 코드)을 한 번만 준비합니다.
+    함수를 찾을 수 없으면 None을 반환합니다. 인덱스 조회와 파일 읽기를 하므로 비동기 코드에서는 스레드에서 호출합니다.
+    """
+    structure = get_function_structure(function_name, repo_name, file_path)
+    if structure is None:
+        return None
+
+    context = build_function_context(structure)
+    if context["target"] is None:
+        return None
+
+    return {
+        "repo_name": repo_name,
+        "function": function_name,
+        "file": structure["definition"]["file"],
+        "structure": structure,
+        "context": context
+    }
+
+
+async def iter_function_overview(prepared: dict) -> AsyncIterator[tuple[str, dict | None, str | None]]:
+    """
+    설명(LLM), 커밋 이력, 리스크 보고서를 동시에 계산하며 끝나는 순서대로 (섹션, 결과, 오류)를 내보냅니다.
+
+    - analysis: 준비된 컨텍스트로 바로 LLM 설명 요청
+    - commit_summary: git log -L + 커밋 분류를 한 번만 수행
+    - risk_report: 위의 커밋 분석 결과와 호출 구조를 재사용해 점수 계산 후 LLM 설명 요청
+    """
+    repo_path = REPO_DIR / prepared["repo_name"]
+    file_path = repo_path / prepared["file"]
+    function_name = prepared["function"]
+
+    tasks = {
+        asyncio.create_task(analyze_function_async(prepared["context"])): "analysis",
+        asyncio.create_task(load_commit_analysis_async(
+            file_path, function_name, repo_path, prepared["structure"]["definition"]
+        )): "commit_summary"
+    }
+    try:
+        while tasks:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                section = tasks.pop(task)
+                try:
+                    result = task.result()
+                except Exception as e:
+                    yield section, None, str(e)
+                    if section == "commit_summary":
+                        yield "risk_report", None, f"Commit analysis failed: {e}"
+                    continue
+
+                if section == "analysis" and result is None:
+                    yield section, None, "LLM 분석 실패"
+                elif section == "commit_summary":
+                    yield section, result.get("summary", {}), None
+                    # 커밋 분석이 끝나면 그 결과로 리스크 보고서를 이어서 만든다
+                    task = asyncio.create_task(generate_risk_report_async(
+                        file_path, function_name, repo_path,
+                        structure=prepared["structure"],
+                        code=prepared["context"]["target"]["code"],
+                        commit_data=result
+                    ))
+                    tasks[task] = "risk_report"
+                else:
+                    yield section, result, None
+    finally:
+        # 스트리밍 중 클라이언트가 연결을 끊으면 남은 요청도 취소한다
+        for task in tasks:
+            task.cancel()
+
+
+async def build_function_overview(prepared: dict) -> dict:
+    """
+    iter_function_overview의 결과를 하나의 응답으로 모읍니다. 실패한 섹션은 None이고 errors에 사유가 담깁니다.
+    """
+    overview = {
+        "function": prepared["function"],
+        "file": prepared["file"],
+        **{section: None for section in OVERVIEW_SECTIONS},
+        "errors": {}
+    }
+    async for section, result, error in iter_function_overview(prepared):
+        overview[section] = result
+        if error is not None:
+            overview["errors"][section] = error
+    return overview
@@ -1,11 +1,30 @@
 from pathlib import Path
 import git 
 from src.utils.logger import setup_logger
+from src.repo.git_process import run_git_async
 
 logger = setup_logger("cloner")
 
+def validate_clone_args(repo_url: str, branch: str | None = None):
+    """
+    git clone에 넘길 사용자 입력을 검사합니다. "-"로 시작하는 값은 git 옵션(--upload-pack 등)으로
+    해석될 수 있고, ext:: 전송은 임의 명령을 실행하므로 GitPython의 clone_from처럼 막습니다.
+
+    Raises:
+        ValueError: 허용하지 않는 repo_url/branch
+    """
+    if not repo_url or repo_url.startswith("-"):
+        raise ValueError(f"Invalid repository URL: {repo_url!r}")
+    if repo_url.lower().startswith("ext::"):
+        raise ValueError("The ext:: transport is not allowed.")
+    if branch is not None and (not branch or branch.startswith("-")):
+        raise ValueError(f"Invalid branch: {branch!r}")
+
 def clone_repo(repo_url: str, dest_dir: Path, branch: str = None)->Path:
+    validate_clone_args(repo_url, branch)
     repo_name = repo_url.rstrip('/').split('/')[-1].replace('.git',"")
+    if repo_name in ("", ".", ".."):
+        raise ValueError(f"Cannot derive a repository name from {repo_url!r}")
     repo_path = dest_dir / repo_name
     
     if repo_path.exists():
@@ -21,4 +40,36 @@ def clone_repo(repo_url: str, dest_dir: Path, branch: str = None)->Path:
         return repo_name
     except Exception as e:
         print(f"Failed to clone: %s", e)
-        return None
\ No newline at end of file
+        return None
+
+async def clone_repo_async(repo_url: str, dest_dir: Path, branch: str = None) -> Path:
+    """
+    clone_repo의 비동기 버전. git clone을 asyncio 서브프로세스로 실행해
+    클론하는 동안 이벤트 루프를 막지 않습니다.
+
+    Raises:
+        ValueError: 허용하지 않는 repo_url/branch (validate_clone_args)
+    """
+    validate_clone_args(repo_url, branch)
+    repo_name = repo_url.rstrip('/').split('/')[-1].replace('.git',"")
+    if repo_name in ("", ".", ".."):
+        raise ValueError(f"Cannot derive a repository name from {repo_url!r}")
+    repo_path = dest_dir / repo_name
+
+    if repo_path.exists():
+        logger.info("Repository already exists at %s", repo_path)
+        return repo_name
+    logger.info("Cloning %s into %s ...", repo_url, repo_path)
+
+    # "--" 뒤의 값은 옵션으로 해석되지 않는다
+    args = ["-c", "protocol.ext.allow=never", "clone", *(["--branch", branch] if branch else []), "--", repo_url, str(repo_path)]
+    try:
+        returncode, _, stderr = await run_git_async(args, dest_dir)
+    except OSError as e:
+        logger.error("Failed to clone: %s", e)
+        return None
+    if returncode != 0:
+        logger.error("Failed to clone: %s", stderr.strip())
+        return None
+    logger.info("Clone complete.")
+    return repo_name
\ No newline at end of file
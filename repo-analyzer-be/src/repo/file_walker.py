@@ -0,0 +1,168 @@
+import os
+import re
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+
+class RepoFile(NamedTuple):
+    path: Path              # 절대 경로
+    rel_path: str           # 레포 기준 상대 경로 (항상 "/" 구분자)
+    stat: os.stat_result    # scandir 엔트리에서 얻은 stat
+
+
+class _IgnoreRule(NamedTuple):
+    pattern: re.Pattern
+    negated: bool
+    dir_only: bool
+    anchored: bool
+
+
+def iter_repo_files(
+    repo_path: Path,
+    suffixes: tuple[str, ...] = (".py",),
+    excluded_dirs: set[str] = frozenset(),
+    excluded_files: set[str] = frozenset(),
+    skip_hidden: bool = False,
+    min_size: int = 0,
+    use_gitignore: bool = True
+) -> Iterator[RepoFile]:
+    """
+    레포의 파일을 이름순(깊이 우선)으로 나열합니다. 인덱서, 요약기, 트리가 함께 사용합니다.
+
+    - excluded_dirs에 속하거나 .gitignore에 걸리는 디렉토리는 내려가기 전에 잘라냅니다.
+    - os.scandir 엔트리의 stat을 그대로 돌려주므로 호출 측에서 다시 stat할 필요가 없습니다.
+    - .gitignore는 자주 쓰는 문법(주석, !부정, 끝의 /, 앞의 /, **/, glob)만 지원합니다.
+
+    Args:
+        suffixes: 포함할 확장자 (빈 튜플이면 전체)
+        skip_hidden: True면 "."으로 시작하는 파일/디렉토리를 건너뜀
+        min_size: 이보다 작은 파일은 건너뜀 (바이트)
+    """
+    yield from _walk(
+        repo_path, "", [], suffixes, excluded_dirs, excluded_files, skip_hidden, min_size, use_gitignore
+    )
+
+
+def _walk(
+    dir_path: Path,
+    rel_dir: str,
+    rule_sets: list[tuple[str, list[_IgnoreRule]]],
+    suffixes, excluded_dirs, excluded_files, skip_hidden, min_size, use_gitignore
+) -> Iterator[RepoFile]:
+    if use_gitignore:
+        rules = _load_gitignore(dir_path / ".gitignore")
+        if rules:
+            rule_sets = [*rule_sets, (rel_dir, rules)]
+
+    try:
+        with os.scandir(dir_path) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError as e:
+        print(f"[!] Failed to scan {dir_path}: {e}")
+        return
+
+    for entry in entries:
+        name = entry.name
+        if skip_hidden and name.startswith("."):
+            continue
+        rel_path = f"{rel_dir}/{name}" if rel_dir else name
+
+        if entry.is_dir(follow_symlinks=False):
+            if name in excluded_dirs or name == ".git":
+                continue
+            if rule_sets and _is_ignored(rel_path, True, rule_sets):
+                continue
+            yield from _walk(
+                Path(entry.path), rel_path, rule_sets,
+                suffixes, excluded_dirs, excluded_files, skip_hidden, min_size, use_gitignore
+            )
+            continue
+
+        if suffixes and not name.endswith(suffixes):
+            continue
+        if name in excluded_files:
+            continue
+        if rule_sets and _is_ignored(rel_path, False, rule_sets):
+            continue
+        try:
+            st = entry.stat()
+        except OSError:
+            continue
+        if st.st_size < min_size:
+            continue
+        yield RepoFile(Path(entry.path), rel_path, st)
+
+
+def _load_gitignore(path: Path) -> list[_IgnoreRule]:
+    try:
+        lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
+    except OSError:
+        return []
+
+    rules = []
+    for line in lines:
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if line.startswith("**/"):
+            line = line[3:]
+        anchored = "/" in line
+        line = line.lstrip("/")
+        if line:
+            rules.append(_IgnoreRule(_compile_pattern(line), negated, dir_only, anchored))
+    return rules
+
+
+def _compile_pattern(pattern: str) -> re.Pattern:
+    """
+    gitignore glob을 정규식으로 바꿉니다. "*"와 "?"는 "/"를 넘지 않고, "**"는 넘습니다.
+    """
+    out = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[" and "]" in pattern[i + 1:]:
+            end = pattern.index("]", i + 1)
+            body = pattern[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append(f"[{body.replace(chr(92), chr(92) * 2)}]")
+            i = end
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return re.compile("".join(out))
+
+
+def _is_ignored(rel_path: str, is_dir: bool, rule_sets: list[tuple[str, list[_IgnoreRule]]]) -> bool:
+    """
+    바깥 .gitignore부터 안쪽 순서로 적용하며, 마지막으로 일치한 규칙이 결과를 결정합니다.
+    """
+    ignored = False
+    name = rel_path.rsplit("/", 1)[-1]
+    for base, rules in rule_sets:
+        rel_to_base = rel_path[len(base) + 1:] if base else rel_path
+        for rule in rules:
+            if rule.dir_only and not is_dir:
+                continue
+            target = rel_to_base if rule.anchored else name
+            if rule.pattern.fullmatch(target):
+                ignored = not rule.negated
+    return ignored
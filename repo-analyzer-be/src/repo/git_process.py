@@ -0,0 +1,31 @@
+import asyncio
+from pathlib import Path
+
+
+async def run_git_async(args: list[str], cwd: Path) -> tuple[int, str, str]:
+    """
+    git 명령을 asyncio 서브프로세스로 실행합니다. 출력을 기다리는 동안 이벤트 루프를 막지 않습니다.
+    기다리던 작업이 취소되면 git 프로세스도 종료합니다.
+
+    Returns:
+        (종료 코드, 표준 출력, 표준 오류)
+    """
+    process = await asyncio.create_subprocess_exec(
+        "git", *args,
+        cwd=cwd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await process.communicate()
+    except asyncio.CancelledError:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+
+    return (
+        process.returncode,
+        stdout.decode("utf-8", errors="replace"),
+        stderr.decode("utf-8", errors="replace")
+    )
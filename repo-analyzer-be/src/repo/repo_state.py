@@ -0,0 +1,50 @@
+from pathlib import Path
+
+
+def get_repo_ref(repo_path: Path) -> str:
+    """
+    체크아웃된 ref 이름을 반환합니다. 브랜치면 브랜치 이름, detached HEAD면 커밋 해시 앞 12자리.
+    저장 경로에 쓰이므로 "/"는 "@@@"로 바꿉니다. (예: feature/login → feature@@@login)
+    """
+    head_file = repo_path / ".git" / "HEAD"
+    try:
+        head = head_file.read_text(encoding="utf-8").strip()
+    except OSError:
+        return "HEAD"
+
+    if head.startswith("ref: refs/heads/"):
+        ref = head[len("ref: refs/heads/"):]
+    elif head.startswith("ref: "):
+        ref = head[len("ref: "):]
+    else:
+        ref = head[:12]
+    return ref.replace("/", "@@@")
+
+
+def get_head_commit(repo_path: Path) -> str | None:
+    """
+    HEAD가 가리키는 커밋 해시를 git 프로세스 없이 .git 디렉토리에서 직접 읽습니다.
+    """
+    git_dir = repo_path / ".git"
+    try:
+        head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+
+    if not head.startswith("ref: "):
+        return head
+
+    ref = head[len("ref: "):]
+    try:
+        return (git_dir / ref).read_text(encoding="utf-8").strip()
+    except OSError:
+        pass
+
+    # git gc 이후에는 ref가 packed-refs에만 남아 있을 수 있음
+    try:
+        for line in (git_dir / "packed-refs").read_text(encoding="utf-8").splitlines():
+            if line.endswith(" " + ref):
+                return line.split(" ", 1)[0]
+    except OSError:
+        pass
+    return None
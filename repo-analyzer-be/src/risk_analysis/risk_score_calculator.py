@@ -1,50 +1,35 @@
+import asyncio
 import json
 from pathlib import Path
 import re
 
-from src.ast.function_locator import get_function_and_context
-from src.commit.commit_analyzer import (
-    analyze_function_commits,
-    save_commit_analysis
-)
-from src.configs.config import COMMIT_ANALYSIS_DIR
-from src.utils.secrets_loader import load_llm_config
-
-import requests
-from openai import OpenAI
-
-# === LLM 설정 ===
-provider, LLM_API_KEY, LLM_API_URL, LLM_MODEL = load_llm_config()
-USE_OPENAI = provider.lower() == "openai"
-if USE_OPENAI:
-    client = OpenAI(api_key=LLM_API_KEY)
-
-def calculate_risk_score(file_path: Path, function_name: str, repo_root: Path) -> dict:
+from src.ast.function_locator import get_function_structure, read_definition_code
+from src.commit.commit_analyzer import load_commit_analysis, load_commit_analysis_async
+from src.utils.llm_client import chat_completion, async_chat_completion
+
+def calculate_risk_score(
+    file_path: Path,
+    function_name: str,
+    repo_root: Path,
+    structure: dict | None = None,
+    code: str | None = None,
+    commit_data: dict | None = None
+) -> dict:
     """
     함수의 구조 및 커밋 정보를 바탕으로 리스크 점수를 계산하고 관련 정보를 반환합니다.
+    structure(get_function_structure 결과), code(함수 코드), commit_data(커밋 분석 결과)를
+    이미 가지고 있으면 넘겨서 조회/분석을 건너뛸 수 있습니다.
     """
-    # === 1. AST 기반 구조 정보 수집 ===
-    context = get_function_and_context(function_name)
-    target = context.get("target")
-    if not target:
-        raise ValueError(f"[X] 함수 '{function_name}' 정의를 찾을 수 없습니다.")
-
-    internal_count = len(context.get("internal", []))
-    called_by_count = target.get("called_by_count", 0)
-    code = target.get("code", "")
+    # === 1. AST 기반 구조 정보 수집 (심볼 인덱스 조회, 호출자 코드는 읽지 않음) ===
+    structure, code = resolve_function_inputs(file_path, function_name, repo_root, structure, code)
+
+    internal_count = len(structure["internal"])
+    called_by_count = len(structure["called_by"])
     function_size = len(code.splitlines())
 
     # === 2. 커밋 정보 로드 또는 분석 ===
-    commit_data_path = COMMIT_ANALYSIS_DIR / f"{function_name}.json"
-
-    if commit_data_path.exists():
-        with open(commit_data_path, "r", encoding="utf-8") as f:
-            commit_data = json.load(f)
-    else:
-        commit_data = analyze_function_commits(file_path, function_name, repo_root)
-        if not commit_data:
-            raise ValueError("[X] 커밋 분석 실패")
-        save_commit_analysis(commit_data, file_path, function_name)
+    if commit_data is None:
+        commit_data = load_commit_analysis(file_path, function_name, repo_root, structure["definition"])
 
     commits = commit_data.get("commit_history", [])
     commit_count = len(commits)
@@ -75,11 +60,43 @@ def calculate_risk_score(file_path: Path, function_name: str, repo_root: Path) -
     }
 
 
-def explain_risk_with_llm(risk_info: dict) -> dict:
-    system_prompt = """
+def resolve_function_inputs(
+    file_path: Path,
+    function_name: str,
+    repo_root: Path,
+    structure: dict | None = None,
+    code: str | None = None
+) -> tuple[dict, str]:
+    """
+    점수 계산에 필요한 호출 구조와 함수 코드를 준비합니다. 이미 있는 값은 그대로 씁니다.
+
+    Raises:
+        ValueError: 함수 정의를 찾을 수 없는 경우
+    """
+    if structure is None:
+        structure = get_function_structure(
+            function_name, repo_root.name, file_path.relative_to(repo_root).as_posix()
+        )
+    if code is None:
+        target = read_definition_code(structure["definition"]) if structure else None
+        if not target:
+            raise ValueError(f"[X] 함수 '{function_name}' 정의를 찾을 수 없습니다.")
+        code = target.get("code", "")
+    return structure, code
+
+
+RISK_SYSTEM_PROMPT = """
 당신은 Python 함수의 구조 및 변경 이력을 분석해 수정 시 리스크 요인을 평가하는 전문가입니다.
 """
-    user_prompt = f"""
+
+# LLM 응답을 해석하지 못했을 때의 설명
+RISK_EXPLANATION_FALLBACK = {
+    "risk_reason": "LLM 분석 실패",
+    "highlight_factors": []
+}
+
+def build_risk_prompt(risk_info: dict) -> str:
+    return f"""
 다음은 함수 \"{risk_info['function']}\"의 구조 및 변경 이력을 바탕으로 한 위험도 분석 정보입니다.
 
 - 종합 리스크 점수: {risk_info['risk_score']}점 (1~10점, 높을수록 위험)
@@ -102,45 +119,32 @@ def explain_risk_with_llm(risk_info: dict) -> dict:
   "highlight_factors": ["function_size", "bug_commit_count", ...]
 }}
 """
+
+def explain_risk_with_llm(risk_info: dict) -> dict:
+    try:
+        return chat_completion(RISK_SYSTEM_PROMPT, build_risk_prompt(risk_info), 0.3, "risk", parse_risk_response)
+
+    except Exception as e:
+        print(f"[!] LLM 분석 실패: {e}")
+        return dict(RISK_EXPLANATION_FALLBACK)
+
+
+async def explain_risk_with_llm_async(risk_info: dict) -> dict:
+    """
+    explain_risk_with_llm의 비동기 버전.
+    """
     try:
-        if USE_OPENAI:
-            response = client.chat.completions.create(
-                model=LLM_MODEL or "gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.3
-            )
-            content = response.choices[0].message.content.strip()
-        else:
-            headers = {
-                "Authorization": f"Bearer {LLM_API_KEY}",
-                "Content-Type": "application/json",
-            }
-            payload = {
-                "model": LLM_MODEL or "gpt-3.5-turbo",
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                "temperature": 0.3
-            }
-            response = requests.post(LLM_API_URL, headers=headers, json=payload)
-            response.raise_for_status()
-            content = response.json()["choices"][0]["message"]["content"].strip()
-            
-        
-        
-        cleaned = clean_llm_json_response(content)
-        return json.loads(cleaned)
+        return await async_chat_completion(
+            RISK_SYSTEM_PROMPT, build_risk_prompt(risk_info), 0.3, "risk", parse_risk_response
+        )
 
     except Exception as e:
         print(f"[!] LLM 분석 실패: {e}")
-        return {
-            "risk_reason": "LLM 분석 실패",
-            "highlight_factors": []
-        }
+        return dict(RISK_EXPLANATION_FALLBACK)
+
+
+def parse_risk_response(content: str) -> dict:
+    return json.loads(clean_llm_json_response(content))
 
 
 def clean_llm_json_response(text: str) -> str:
@@ -193,11 +197,12 @@ def score_bug_commit_count(count: int) -> int:
     if count <= 6: return 15
     return 20
     
-def generate_risk_report(file_path: Path, function_name: str, repo_root: Path) -> dict:
+def generate_risk_report(file_path: Path, function_name: str, repo_root: Path, **precomputed) -> dict:
     """
     특정 함수에 대해 리스크 점수 계산과 LLM 기반 위험 설명을 모두 수행하고 통합된 결과를 반환합니다.
+    precomputed는 calculate_risk_score의 structure/code/commit_data로 그대로 전달됩니다.
     """
-    risk_info = calculate_risk_score(file_path, function_name, repo_root)
+    risk_info = calculate_risk_score(file_path, function_name, repo_root, **precomputed)
     explanation = explain_risk_with_llm(risk_info)
 
     # risk_info 딕셔너리에 LLM 결과를 추가하여 하나의 dict로 병합
@@ -205,3 +210,32 @@ def generate_risk_report(file_path: Path, function_name: str, repo_root: Path) -
         **risk_info,
         **explanation
     }
+
+async def generate_risk_report_async(
+    file_path: Path,
+    function_name: str,
+    repo_root: Path,
+    structure: dict | None = None,
+    code: str | None = None,
+    commit_data: dict | None = None
+) -> dict:
+    """
+    generate_risk_report의 비동기 버전. 인덱스 조회와 파일 읽기는 스레드에서, 커밋 분석과
+    LLM 설명은 비동기로 수행해 이벤트 루프를 막지 않습니다.
+    """
+    if structure is None or code is None:
+        structure, code = await asyncio.to_thread(
+            resolve_function_inputs, file_path, function_name, repo_root, structure, code
+        )
+    if commit_data is None:
+        commit_data = await load_commit_analysis_async(file_path, function_name, repo_root, structure["definition"])
+
+    risk_info = calculate_risk_score(
+        file_path, function_name, repo_root,
+        structure=structure, code=code, commit_data=commit_data
+    )
+    explanation = await explain_risk_with_llm_async(risk_info)
+    return {
+        **risk_info,
+        **explanation
+    }
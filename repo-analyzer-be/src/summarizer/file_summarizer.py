@@ -1,17 +1,14 @@
-import os
+import asyncio
 import json
-import requests
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from openai import OpenAI
-from src.utils.secrets_loader import load_llm_config
-from src.configs.config import SUMMARY_DIR
-from src.configs.filter_config import EXCLUDED_DIRS, EXCLUDED_FILES
-
-provider, LLM_API_KEY, LLM_API_URL, LLM_MODEL = load_llm_config()
-USE_OPENAI = provider.lower() == "openai"
-
-if USE_OPENAI:
-    client = OpenAI(api_key=LLM_API_KEY)
+from src.utils.llm_client import chat_completion, async_chat_completion
+from src.configs.config import SUMMARY_DIR, SUMMARY_CONCURRENCY, get_repo_data_dir
+from src.configs.filter_config import EXCLUDED_DIRS, EXCLUDED_FILES, MIN_FILE_SIZE
+from src.repo.file_walker import iter_repo_files, RepoFile
 
 SYSTEM_PROMPT = """
 당신은 Python 코드를 구조적으로 분석해서 요약하는 전문가입니다.
@@ -37,78 +34,141 @@ USER_PROMPT_TEMPLATE = """
 ```
 """
 
-def should_summarize(filepath: Path) -> bool:
-    if not filepath.suffix == ".py":
-        return False
-    if filepath.name in EXCLUDED_FILES:
-        return False
-    if any(part in EXCLUDED_DIRS for part in filepath.parts):
-        return False
-    if filepath.stat().st_size < 30:
-        return False
-    return True
+def build_summary_prompt(filepath: Path, code: str) -> str:
+    return USER_PROMPT_TEMPLATE.format(filename=str(filepath.name), code=code[:6000])
+
+def parse_summary_response(summary: str) -> dict:
+    if summary.startswith("```json"):
+        summary = summary.lstrip("`json\n").rstrip("`").strip()
+    elif summary.startswith("```"):
+        summary = summary.lstrip("`").strip()
+
+    return json.loads(summary)
 
 def summarize_file_with_llm(filepath: Path) -> dict:
     try:
         code = filepath.read_text(encoding="utf-8")
-        prompt = USER_PROMPT_TEMPLATE.format(filename=str(filepath.name), code=code[:6000])
-
-        if USE_OPENAI:
-            response = client.chat.completions.create(
-                model=LLM_MODEL or "gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.2
-            )
-            summary = response.choices[0].message.content.strip()
-        else:
-            headers = {
-                "Authorization": f"Bearer {LLM_API_KEY}",
-                "Content-Type": "application/json",
-            }
-            payload = {
-                "messages": [
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.2,
-            }
-            response = requests.post(LLM_API_URL, headers=headers, json=payload)
-            response.raise_for_status()
-            summary = response.json()["choices"][0]["message"]["content"].strip()
-
-        if summary.startswith("```json"):
-            summary = summary.lstrip("`json\n").rstrip("`").strip()
-        elif summary.startswith("```"):
-            summary = summary.lstrip("`").strip()
-
-        return json.loads(summary)
+        prompt = build_summary_prompt(filepath, code)
+
+        return chat_completion(SYSTEM_PROMPT, prompt, 0.2, "summary", parse_summary_response)
+
+    except Exception as e:
+        print(f"[!] Error summarizing {filepath}: {e}")
+        return None
+
+async def summarize_file_with_llm_async(filepath: Path) -> dict:
+    """
+    summarize_file_with_llm의 비동기 버전. 파일 읽기는 스레드에서, LLM 요청은 비동기로 합니다.
+    """
+    try:
+        code = await asyncio.to_thread(filepath.read_text, encoding="utf-8")
+        return await async_chat_completion(
+            SYSTEM_PROMPT, build_summary_prompt(filepath, code), 0.2, "summary", parse_summary_response
+        )
 
     except Exception as e:
         print(f"[!] Error summarizing {filepath}: {e}")
         return None
 
-def summarize_files(repo_path: Path):
+def save_summary(save_path: Path, summary: dict):
+    """
+    요약을 임시 파일에 다 쓴 뒤 이름을 바꿔 저장합니다. 도중에 중단되어도 반쯤 쓰인 JSON이
+    요약 파일로 남지 않으므로, 다시 실행하면 완성된 파일만 건너뛰고 나머지를 이어서 요약합니다.
+    """
+    tmp_path = save_path.with_name(f"{save_path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, save_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+def _prepare_summary_run(repo_path: Path) -> tuple[list, int]:
+    """
+    요약할 파일 목록을 만듭니다. 이미 요약 파일이 있는 파일은 건너뛰고,
+    이전 실행이 중단되며 남긴 임시 파일은 지웁니다.
+
+    Returns:
+        ([(RepoFile, 저장 경로)], 건너뛴 파일 수)
+    """
+    for tmp_path in get_repo_data_dir(SUMMARY_DIR, repo_path.name).glob("*.tmp"):
+        tmp_path.unlink(missing_ok=True)
+
+    pending = []
+    skipped = 0
+    for repo_file in iter_repo_files(
+        repo_path,
+        excluded_dirs=EXCLUDED_DIRS,
+        excluded_files=EXCLUDED_FILES,
+        min_size=MIN_FILE_SIZE
+    ):
+        save_path = get_summary_path(repo_path.name, Path(repo_file.rel_path))
+        if save_path.exists():
+            skipped += 1
+            continue
+        pending.append((repo_file, save_path))
+    return pending, skipped
+
+def _summary_stats(pending: list, skipped: int, results: list[bool], started: float) -> dict:
+    stats = {
+        "files": len(pending) + skipped,
+        "summarized": sum(results),
+        "skipped": skipped,
+        "failed": len(results) - sum(results),
+        "elapsed": round(time.perf_counter() - started, 3)
+    }
+    print(
+        f"[*] Summarized {stats['summarized']} of {stats['files']} files "
+        f"({stats['skipped']} already summarized, {stats['failed']} failed) in {stats['elapsed']}s"
+    )
+    return stats
+
+def summarize_files(repo_path: Path, concurrency: int | None = None) -> dict:
+    """
+    레포의 Python 파일들을 최대 concurrency개씩 동시에 요약하고, 끝나는 대로 파일별 요약 JSON을 저장합니다.
+    이미 요약된 파일은 건너뛰므로 중단된 뒤 다시 실행하면 남은 파일만 요약합니다.
+
+    Returns:
+        dict: {"files", "summarized", "skipped", "failed", "elapsed"}
+    """
+    print(f"[*] Summarizing Python files in: {repo_path}")
+    started = time.perf_counter()
+    pending, skipped = _prepare_summary_run(repo_path)
+
+    def summarize(item: tuple[RepoFile, Path]) -> bool:
+        repo_file, save_path = item
+        print(f"[+] Summarizing: {repo_file.rel_path}")
+        summary = summarize_file_with_llm(repo_file.path)
+        if not summary:
+            return False
+        save_summary(save_path, summary)
+        return True
+
+    with ThreadPoolExecutor(max_workers=concurrency or SUMMARY_CONCURRENCY) as executor:
+        results = list(executor.map(summarize, pending))
+    return _summary_stats(pending, skipped, results, started)
+
+async def summarize_files_async(repo_path: Path, concurrency: int | None = None) -> dict:
+    """
+    summarize_files의 비동기 버전. 최대 concurrency개의 LLM 요청을 동시에 기다리며,
+    파일 목록 수집과 파일 읽기/쓰기는 스레드에서 합니다.
+    """
     print(f"[*] Summarizing Python files in: {repo_path}")
-    for root, _, files in os.walk(repo_path):
-        for file in files:
-            path = Path(root) / file
-            if should_summarize(path):
-                rel_path = path.relative_to(repo_path)
-                safe_name = str(rel_path).replace("/", "__").replace("\\", "__")
-                save_path = SUMMARY_DIR / (safe_name + ".json")
-
-                if save_path.exists():
-                    print(f"[-] Skipping (already summarized): {rel_path}")
-                    continue
-
-                print(f"[+] Summarizing: {rel_path}")
-                summary = summarize_file_with_llm(path)
-                if summary:
-                    with open(save_path, "w", encoding="utf-8") as f:
-                        json.dump(summary, f, indent=2, ensure_ascii=False)
+    started = time.perf_counter()
+    pending, skipped = await asyncio.to_thread(_prepare_summary_run, repo_path)
+    semaphore = asyncio.Semaphore(concurrency or SUMMARY_CONCURRENCY)
+
+    async def summarize(repo_file: RepoFile, save_path: Path) -> bool:
+        async with semaphore:
+            print(f"[+] Summarizing: {repo_file.rel_path}")
+            summary = await summarize_file_with_llm_async(repo_file.path)
+        if not summary:
+            return False
+        await asyncio.to_thread(save_summary, save_path, summary)
+        return True
+
+    results = await asyncio.gather(*(summarize(repo_file, save_path) for repo_file, save_path in pending))
+    return _summary_stats(pending, skipped, results, started)
 
 # def summarize_files(repo_path: Path):
 #     print(f"[*] Summarizing Python files in: {repo_path}")
@@ -125,13 +185,19 @@ def summarize_files(repo_path: Path):
 #                     with open(save_path, "w", encoding="utf-8") as f:
 #                         json.dump(summary, f, indent=2, ensure_ascii=False)
 
-def load_summary(file_path: Path) -> dict:
+def get_summary_path(repo_name: str, file_path: Path) -> Path:
+    """
+    파일 요약 JSON의 저장 경로. 레포별 디렉토리 아래에 저장합니다.
+    예: ("whereami", "whereami/utils.py") -> summaries/whereami/whereami__utils.py.json
+    """
+    safe_name = str(file_path).replace("/", "__").replace("\\", "__")
+    return get_repo_data_dir(SUMMARY_DIR, repo_name) / (safe_name + ".json")
+
+def load_summary(repo_name: str, file_path: Path) -> dict:
     """
-    주어진 파일 경로에 해당하는 요약 JSON을 로드합니다.
-    예: file_path = Path("whereami/utils.py") -> whereami__utils.py.json
+    주어진 레포의 파일 경로에 해당하는 요약 JSON을 로드합니다.
     """
-    rel_path = str(file_path).replace("/", "__").replace("\\", "__") + ".json"
-    summary_path = SUMMARY_DIR / rel_path
+    summary_path = get_summary_path(repo_name, file_path)
 
     if not summary_path.exists():
         raise FileNotFoundError(f"No summary found for file: {file_path}")
@@ -0,0 +1,200 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from src.configs.config import LLM_CACHE_DB_PATH, LLM_CACHE_MAX_BYTES, LLM_CACHE_TTL
+
+# 캐시는 언제든 버려도 되는 데이터이므로 스키마가 바뀌면 버전을 올리고 테이블을 새로 만든다
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+-- key: provider, model, temperature, 메시지 목록 전체의 sha256. accessed 순서로 오래된 것부터 지운다.
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    purpose TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed);
+"""
+
+# 한도를 넘으면 한도의 이 비율까지 줄여서 저장할 때마다 지우지 않도록 한다
+EVICT_TARGET_RATIO = 0.9
+
+
+def make_cache_key(provider: str, model: str, temperature: float, messages: list[dict]) -> str:
+    """
+    같은 요청이면 같은 키가 나오도록 요청 내용 전체를 정렬된 JSON으로 만들어 해시합니다.
+    """
+    payload = json.dumps(
+        {"provider": provider, "model": model, "temperature": temperature, "messages": messages},
+        ensure_ascii=False, sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    LLM 응답을 요청 내용의 해시로 저장하는 디스크 캐시 (SQLite).
+
+    - ttl초가 지난 응답은 쓰지 않고, 저장된 응답 크기의 합이 max_bytes를 넘으면
+      가장 오래 쓰지 않은 응답부터 지웁니다 (LRU).
+    - 적중/실패 수는 호출 목적(purpose)별로 프로세스 안에서 집계합니다.
+    """
+
+    def __init__(self, db_path: Path = LLM_CACHE_DB_PATH, max_bytes: int = LLM_CACHE_MAX_BYTES, ttl: int = LLM_CACHE_TTL):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.enabled = max_bytes > 0
+        self._lock = threading.Lock()
+        self._schema_ready = False
+        self._total_bytes = None
+        self._counters = defaultdict(lambda: {"hits": 0, "misses": 0})
+        self._evictions = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        if not self._schema_ready:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS llm_cache")
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.executescript(SCHEMA)
+            conn.commit()
+            self._schema_ready = True
+        return conn
+
+    def get(self, key: str, purpose: str = "other") -> str | None:
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            try:
+                row = conn.execute("SELECT response, created FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None and self.ttl and now - row[1] > self.ttl:
+                    self._delete(conn, [key])
+                    row = None
+                if row is not None:
+                    conn.execute("UPDATE llm_cache SET accessed = ? WHERE key = ?", (now, key))
+                conn.commit()
+            finally:
+                conn.close()
+            self._counters[purpose]["hits" if row is not None else "misses"] += 1
+        return row[0] if row is not None else None
+
+    def put(self, key: str, response: str, purpose: str = "other"):
+        if not self.enabled:
+            return
+
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            try:
+                self._load_total(conn)
+                self._delete(conn, [key])
+                conn.execute(
+                    "INSERT INTO llm_cache (key, purpose, response, size, created, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, purpose, response, size, now, now)
+                )
+                self._total_bytes += size
+                if self._total_bytes > self.max_bytes:
+                    self._evict(conn, now)
+                conn.commit()
+            finally:
+                conn.close()
+
+    def invalidate(self, key: str):
+        """
+        해석할 수 없는 응답처럼 다시 쓰면 안 되는 항목을 지웁니다.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            conn = self._connect()
+            try:
+                self._load_total(conn)
+                self._delete(conn, [key])
+                conn.commit()
+            finally:
+                conn.close()
+
+    def _load_total(self, conn: sqlite3.Connection):
+        if self._total_bytes is None:
+            self._total_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+
+    def _delete(self, conn: sqlite3.Connection, keys: list[str]) -> int:
+        freed = 0
+        for key in keys:
+            row = conn.execute("SELECT size FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                freed += row[0]
+        if self._total_bytes is not None:
+            self._total_bytes -= freed
+        return freed
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        # 다른 프로세스도 같은 DB에 쓸 수 있으므로 지우기 전에 실제 크기를 다시 읽는다
+        self._total_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+
+        # 만료된 응답을 먼저 지우고, 그래도 크면 오래 쓰지 않은 응답부터 지운다
+        if self.ttl:
+            expired = conn.execute("SELECT key FROM llm_cache WHERE created < ?", (now - self.ttl,)).fetchall()
+            self._delete(conn, [row[0] for row in expired])
+            self._evictions += len(expired)
+
+        target = self.max_bytes * EVICT_TARGET_RATIO
+        if self._total_bytes <= target:
+            return
+        victims = []
+        excess = self._total_bytes - target
+        for key, size in conn.execute("SELECT key, size FROM llm_cache ORDER BY accessed"):
+            victims.append(key)
+            excess -= size
+            if excess <= 0:
+                break
+        self._delete(conn, victims)
+        self._evictions += len(victims)
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: {"enabled", "hits", "misses", "hit_rate", "entries", "bytes", "max_bytes", "ttl",
+                   "evictions", "by_purpose": {목적: {"hits", "misses"}}}
+        """
+        with self._lock:
+            entries, size = 0, 0
+            if self.enabled:
+                conn = self._connect()
+                try:
+                    entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+                finally:
+                    conn.close()
+            by_purpose = {purpose: dict(counter) for purpose, counter in self._counters.items()}
+            hits = sum(counter["hits"] for counter in by_purpose.values())
+            misses = sum(counter["misses"] for counter in by_purpose.values())
+            return {
+                "enabled": self.enabled,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "evictions": self._evictions,
+                "by_purpose": by_purpose
+            }
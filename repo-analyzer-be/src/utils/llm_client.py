@@ -0,0 +1,254 @@
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable
+
+import httpx
+from openai import OpenAI, AsyncOpenAI
+from src.configs.config import LLM_TIMEOUT, LLM_MAX_IN_FLIGHT, LLM_MAX_CONNECTIONS
+from src.utils.secrets_loader import load_llm_config
+from src.utils.llm_cache import LLMCache, make_cache_key
+
+
+class LLMGateway:
+    """
+    모든 모듈이 함께 쓰는 LLM 호출 창구.
+
+    - secrets.yml은 처음 호출할 때 한 번만 읽습니다 (import 시점에는 읽지 않음).
+    - OpenAI는 SDK 클라이언트를, llama 등 OpenAI 호환 엔드포인트는 keep-alive 연결 풀을 가진
+      httpx 클라이언트를 동기/비동기 각각 하나씩 만들어 재사용합니다.
+    - 타임아웃(LLM_TIMEOUT)과 동시에 보낼 수 있는 요청 수(LLM_MAX_IN_FLIGHT)를 여기서만 정합니다.
+      동기 요청과 비동기 요청은 각각 따로 이 한도를 적용받습니다.
+    - 호출 목적(purpose)별 요청 수, 오류 수, 지연 시간을 집계합니다 (get_stats).
+    - 같은 요청(provider, model, temperature, 메시지 전체)의 응답은 디스크 캐시(LLMCache)에서 돌려줍니다.
+    """
+
+    def __init__(self, cache: LLMCache | None = None):
+        self.cache = cache if cache is not None else LLMCache()
+        self._lock = threading.Lock()
+        self._config = None
+        self._sync_client = None
+        self._sync_slots = threading.BoundedSemaphore(LLM_MAX_IN_FLIGHT)
+        # 비동기 클라이언트와 세마포어는 이벤트 루프에 묶이므로 루프가 바뀌면 새로 만든다
+        self._async_loop = None
+        self._async_client = None
+        self._async_slots = None
+        self._stats = defaultdict(lambda: {"requests": 0, "errors": 0, "total_latency": 0.0, "max_latency": 0.0})
+        self._in_flight = 0
+
+    # ====== 설정 / 클라이언트 ======
+    def _get_config(self) -> dict:
+        if self._config is None:
+            with self._lock:
+                if self._config is None:
+                    provider, api_key, api_url, model = load_llm_config()
+                    self._config = {
+                        "provider": provider.lower(),
+                        "use_openai": provider.lower() == "openai",
+                        "api_key": api_key,
+                        "api_url": api_url,
+                        "model": model or "gpt-3.5-turbo"
+                    }
+        return self._config
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(max_connections=LLM_MAX_CONNECTIONS, max_keepalive_connections=LLM_MAX_CONNECTIONS)
+
+    def _get_sync_client(self):
+        config = self._get_config()
+        with self._lock:
+            if self._sync_client is None:
+                if config["use_openai"]:
+                    self._sync_client = OpenAI(api_key=config["api_key"], timeout=LLM_TIMEOUT)
+                else:
+                    self._sync_client = httpx.Client(timeout=LLM_TIMEOUT, limits=self._limits())
+            return self._sync_client
+
+    def _get_async_client(self):
+        config = self._get_config()
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            if config["use_openai"]:
+                self._async_client = AsyncOpenAI(api_key=config["api_key"], timeout=LLM_TIMEOUT)
+            else:
+                self._async_client = httpx.AsyncClient(timeout=LLM_TIMEOUT, limits=self._limits())
+            self._async_slots = asyncio.Semaphore(LLM_MAX_IN_FLIGHT)
+            self._async_loop = loop
+        return self._async_client
+
+    def _request_parts(self, system_prompt: str, user_prompt: str, temperature: float) -> tuple[dict, dict]:
+        config = self._get_config()
+        headers = {
+            "Authorization": f"Bearer {config['api_key']}",
+            "Content-Type": "application/json",
+        }
+        payload = {
+            "model": config["model"],
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            "temperature": temperature
+        }
+        return headers, payload
+
+    def _cache_key(self, payload: dict) -> str:
+        config = self._get_config()
+        return make_cache_key(config["provider"], payload["model"], payload["temperature"], payload["messages"])
+
+    def _from_cache(self, key: str, purpose: str, parse: Callable[[str], Any] | None) -> tuple[bool, Any]:
+        content = self.cache.get(key, purpose)
+        if content is None:
+            return False, None
+        try:
+            return True, parse(content) if parse else content
+        except Exception:
+            # 해석할 수 없는 응답은 버리고 다시 요청한다
+            self.cache.invalidate(key)
+            return False, None
+
+    # ====== 호출 ======
+    def chat_completion(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        purpose: str = "other",
+        parse: Callable[[str], Any] | None = None
+    ) -> Any:
+        """
+        채팅 요청을 보내고 응답 내용(앞뒤 공백 제거)을 반환합니다. 오류는 예외로 전달됩니다.
+        parse를 주면 응답을 해석한 결과를 반환하고, 해석에 성공한 응답만 캐시합니다.
+        """
+        headers, payload = self._request_parts(system_prompt, user_prompt, temperature)
+        key = self._cache_key(payload)
+        found, result = self._from_cache(key, purpose, parse)
+        if found:
+            return result
+
+        content = self._send(headers, payload, purpose)
+        result = parse(content) if parse else content
+        self.cache.put(key, content, purpose)
+        return result
+
+    async def async_chat_completion(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        purpose: str = "other",
+        parse: Callable[[str], Any] | None = None
+    ) -> Any:
+        """
+        chat_completion의 비동기 버전. 응답을 기다리는 동안 이벤트 루프를 막지 않으며,
+        캐시 조회/저장(SQLite)은 스레드에서 합니다.
+        """
+        headers, payload = self._request_parts(system_prompt, user_prompt, temperature)
+        key = self._cache_key(payload)
+        found, result = await asyncio.to_thread(self._from_cache, key, purpose, parse)
+        if found:
+            return result
+
+        content = await self._send_async(headers, payload, purpose)
+        result = parse(content) if parse else content
+        await asyncio.to_thread(self.cache.put, key, content, purpose)
+        return result
+
+    def _send(self, headers: dict, payload: dict, purpose: str) -> str:
+        client = self._get_sync_client()
+        with self._sync_slots:
+            started = self._begin()
+            try:
+                if self._get_config()["use_openai"]:
+                    response = client.chat.completions.create(**payload)
+                    content = response.choices[0].message.content
+                else:
+                    response = client.post(self._get_config()["api_url"], headers=headers, json=payload)
+                    response.raise_for_status()
+                    content = response.json()["choices"][0]["message"]["content"]
+            except BaseException:
+                self._end(purpose, started, failed=True)
+                raise
+            self._end(purpose, started)
+        return content.strip()
+
+    async def _send_async(self, headers: dict, payload: dict, purpose: str) -> str:
+        client = self._get_async_client()
+        async with self._async_slots:
+            started = self._begin()
+            try:
+                if self._get_config()["use_openai"]:
+                    response = await client.chat.completions.create(**payload)
+                    content = response.choices[0].message.content
+                else:
+                    response = await client.post(self._get_config()["api_url"], headers=headers, json=payload)
+                    response.raise_for_status()
+                    content = response.json()["choices"][0]["message"]["content"]
+            except BaseException:
+                self._end(purpose, started, failed=True)
+                raise
+            self._end(purpose, started)
+        return content.strip()
+
+    # ====== 집계 ======
+    def _begin(self) -> float:
+        with self._lock:
+            self._in_flight += 1
+        return time.perf_counter()
+
+    def _end(self, purpose: str, started: float, failed: bool = False):
+        latency = time.perf_counter() - started
+        with self._lock:
+            self._in_flight -= 1
+            stats = self._stats[purpose]
+            stats["requests"] += 1
+            stats["errors"] += int(failed)
+            stats["total_latency"] += latency
+            stats["max_latency"] = max(stats["max_latency"], latency)
+
+    def get_stats(self) -> dict:
+        """
+        Returns:
+            dict: {"in_flight", "requests", "errors",
+                   "by_purpose": {목적: {"requests", "errors", "avg_latency", "max_latency"}},
+                   "cache": LLMCache.stats()}
+            requests는 캐시에서 돌려준 응답을 빼고 실제로 보낸 요청만 셉니다.
+        """
+        cache_stats = self.cache.stats()
+        with self._lock:
+            by_purpose = {
+                purpose: {
+                    "requests": stats["requests"],
+                    "errors": stats["errors"],
+                    "avg_latency": round(stats["total_latency"] / stats["requests"], 3) if stats["requests"] else 0.0,
+                    "max_latency": round(stats["max_latency"], 3)
+                }
+                for purpose, stats in self._stats.items()
+            }
+            return {
+                "in_flight": self._in_flight,
+                "requests": sum(stats["requests"] for stats in by_purpose.values()),
+                "errors": sum(stats["errors"] for stats in by_purpose.values()),
+                "by_purpose": by_purpose,
+                "cache": cache_stats
+            }
+
+
+_gateway = LLMGateway()
+
+
+def chat_completion(
+    system_prompt: str, user_prompt: str, temperature: float, purpose: str = "other", parse: Callable[[str], Any] | None = None
+) -> Any:
+    return _gateway.chat_completion(system_prompt, user_prompt, temperature, purpose, parse)
+
+
+async def async_chat_completion(
+    system_prompt: str, user_prompt: str, temperature: float, purpose: str = "other", parse: Callable[[str], Any] | None = None
+) -> Any:
+    return await _gateway.async_chat_completion(system_prompt, user_prompt, temperature, purpose, parse)
+
+
+def get_llm_stats() -> dict:
+    return _gateway.get_stats()
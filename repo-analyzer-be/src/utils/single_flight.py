@@ -0,0 +1,46 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    같은 키의 작업이 이미 진행 중이면 새로 시작하지 않고 진행 중인 작업의 결과를 함께 기다리게 합니다.
+    (같은 함수를 여러 사용자가 동시에 열 때 git/LLM 작업을 한 번만 수행하기 위함)
+
+    - 작업이 끝나면 키를 지우므로 결과를 캐시하지는 않습니다. 결과 저장은 각 모듈의 저장 파일이 담당합니다.
+    - 예외도 기다리던 요청 모두에게 그대로 전달됩니다.
+    - 기다리는 요청이 모두 취소되면(클라이언트가 끊기면) 작업도 취소합니다. 스레드에서 도는 작업처럼
+      취소해도 멈추지 않는 작업은 cancel_abandoned=False로 두어 끝날 때까지 키를 유지합니다.
+    - 한 프로세스의 이벤트 루프 안에서만 공유됩니다.
+    """
+
+    def __init__(self, cancel_abandoned: bool = True):
+        self.cancel_abandoned = cancel_abandoned
+        self._flights: dict[Hashable, list] = {}   # 키 → [작업, 기다리는 요청 수]
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = [asyncio.ensure_future(func()), 0]
+            flight[0].add_done_callback(lambda _: self._forget(key, flight))
+        else:
+            print(f"[-] Joining in-flight job: {key}")
+
+        flight[1] += 1
+        try:
+            # 먼저 온 요청이 취소되어도 함께 기다리는 다른 요청의 작업은 계속 진행되도록 shield로 감싼다
+            return await asyncio.shield(flight[0])
+        finally:
+            flight[1] -= 1
+            if flight[1] == 0 and self.cancel_abandoned and not flight[0].done():
+                self._forget(key, flight)
+                flight[0].cancel()
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    def _forget(self, key: Hashable, flight: list):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
@@ -0,0 +1,190 @@
+from src.commit.commit_rules import pre_classify_commit
+
+
+def _commit(*hunk: str, start: int = 10, message: str = "update") -> dict:
+    # git log -L 형식: 함수 전체를 담은 hunk 하나
+    old_count = sum(not line.startswith("+") for line in hunk)
+    new_count = sum(not line.startswith("-") for line in hunk)
+    diff = "\n".join([
+        "diff --git a/pkg/a.py b/pkg/a.py",
+        "--- a/pkg/a.py",
+        "+++ b/pkg/a.py",
+        f"@@ -{start},{old_count} +{start},{new_count} @@",
+        *hunk,
+    ])
+    return {"hash": "0" * 40, "message": message, "diff": diff}
+
+
+def _rule(commit: dict):
+    result = pre_classify_commit(commit)
+    return result and result["rule"]
+
+
+# 공백
+
+def test_inline_spacing_is_code_style():
+    assert _rule(_commit(
+        " def f(a, b):",
+        "-    return a+b",
+        "+    return a + b",
+    )) == "whitespace"
+
+
+def test_indentation_change_is_not_whitespace():
+    assert _rule(_commit(
+        " def f(items):",
+        "     for item in items:",
+        "         total = item",
+        "-        return total",
+        "+    return total",
+    )) is None
+
+
+def test_spacing_inside_string_is_not_whitespace():
+    assert _rule(_commit(
+        " def f():",
+        '-    return "a b"',
+        '+    return "a  b"',
+    )) is None
+
+
+# 주석/docstring
+
+def test_docstring_change_is_documentation():
+    assert _rule(_commit(
+        " def f(a):",
+        '     """',
+        "-    Old summary.",
+        "+    New summary.",
+        '     """',
+        "     return a",
+    )) == "comment_docstring"
+
+
+def test_one_line_docstring_and_comment_change_is_documentation():
+    assert _rule(_commit(
+        " def f(a):",
+        '-    """Old summary."""',
+        '+    """New summary."""  # why',
+        "-    # old note",
+        "+    # new note",
+        "     return a",
+    )) == "comment_docstring"
+
+
+def test_module_docstring_change_is_documentation():
+    assert _rule(_commit(
+        '-"""Old module doc."""',
+        '+"""New module doc."""',
+        " import os",
+        start=1,
+    )) == "comment_docstring"
+
+
+def test_code_after_closing_quotes_is_not_documentation():
+    assert _rule(_commit(
+        " def f():",
+        '-    """d"""; a = 1',
+        '+    """d"""; a = 2',
+        "     return a",
+    )) is None
+
+
+def test_triple_quoted_argument_is_not_documentation():
+    assert _rule(_commit(
+        " def load(cursor):",
+        "     cursor.execute(",
+        '-        """SELECT a FROM t"""',
+        '+        """SELECT b FROM t"""',
+        "     )",
+    )) is None
+
+
+def test_multiline_string_body_is_not_documentation():
+    assert _rule(_commit(
+        " def load(cursor):",
+        '     query = """',
+        "-    SELECT a FROM t",
+        "+    SELECT b FROM t",
+        '     """',
+        "     return cursor.execute(query)",
+    )) is None
+
+
+def test_triple_quoted_string_after_first_statement_is_not_documentation():
+    assert _rule(_commit(
+        " def f():",
+        "     x = 1",
+        '-    """old"""',
+        '+    """new"""',
+        "     return x",
+    )) is None
+
+
+# 이름 변경
+
+def test_local_rename_is_refactor():
+    assert _rule(_commit(
+        " def f(items):",
+        "-    tmp = len(items)",
+        "-    return tmp * 2",
+        "+    count = len(items)",
+        "+    return count * 2",
+    )) == "identifier_rename"
+
+
+def test_parameter_rename_is_refactor():
+    assert _rule(_commit(
+        "-def f(xs):",
+        "-    return sorted(xs)",
+        "+def f(values):",
+        "+    return sorted(values)",
+    )) == "identifier_rename"
+
+
+def test_builtin_swap_is_not_rename():
+    assert _rule(_commit(
+        " def f(xs):",
+        "-    return min(xs)",
+        "+    return max(xs)",
+    )) is None
+
+
+def test_attribute_change_is_not_rename():
+    assert _rule(_commit(
+        " def f(obj):",
+        "-    return obj.start",
+        "+    return obj.end",
+    )) is None
+
+
+def test_string_change_is_not_rename():
+    assert _rule(_commit(
+        " def f(session, url):",
+        '-    return session.request("GET", url)',
+        '+    return session.request("POST", url)',
+    )) is None
+
+
+def test_merging_variables_is_not_rename():
+    assert _rule(_commit(
+        " def f(a):",
+        "-    x = a",
+        "-    y = a",
+        "-    return x + y",
+        "+    x = a",
+        "+    x = a",
+        "+    return x + x",
+    )) is None
+
+
+# 커밋 메시지
+
+def test_conventional_prefix_used_when_diff_is_ambiguous():
+    commit = _commit(
+        " def f(xs):",
+        "-    return min(xs)",
+        "+    return max(xs)",
+        message="fix(stats): use the upper bound",
+    )
+    assert pre_classify_commit(commit) == {"commit_type": "Bug&Error", "rule": "conventional_prefix", "confidence": 0.8}
@@ -60,36 +60,25 @@ export default function AnalysisPage() {
   useEffect(() => {
     if (!selectedFunction || !selectedFile) return;
 
+    // 설명 / 커밋 요약 / 리스크를 한 번에 요청 (컨텍스트와 커밋 이력은 서버에서 한 번만 계산)
     axios
-      .post(`${import.meta.env.VITE_API_BASE_URL}/function/explain`, {
+      .post(`${import.meta.env.VITE_API_BASE_URL}/function/overview`, {
+        repo_name: repoName,
+        file_path: selectedFile,
         function_name: selectedFunction,
       })
-        .then((res) => {
-        setFunctionDesc(res.data.analysis.description);
-        setRelatedFunctions(res.data.analysis.related_functions || []);
+      .then((res) => {
+        setFunctionDesc(res.data.analysis?.description || null);
+        setRelatedFunctions(res.data.analysis?.related_functions || []);
+        setFunctionCommits(res.data.commit_summary);
+        setFunctionRisk(res.data.risk_report);
       })
       .catch(() => {
         setFunctionDesc(null);
         setRelatedFunctions([]);
+        setFunctionCommits(null);
+        setFunctionRisk(null);
       });
-
-    axios
-      .post(`${import.meta.env.VITE_API_BASE_URL}/function/commits`, {
-        repo_name: repoName,
-        file_path: selectedFile,
-        function_name: selectedFunction,
-      })
-      .then((res) => setFunctionCommits(res.data.summary))
-      .catch(() => setFunctionCommits(null));
-
-
-    axios
-      .post(`${import.meta.env.VITE_API_BASE_URL}/function/risk`, {
-        repo_name: repoName,
-        file_path: selectedFile,
-        function_name: selectedFunction,
-      })
-      .then((res) => setFunctionRisk(res.data.risk_report));
   }, [selectedFunction]);
 
   const renderTree = (node) => {